@@ -1,7 +1,16 @@
 # conversation_engine.py
+# Imported as ToGood2Go.conversation_engine from the Morton folder (the app package lives there)
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
-from questions import QUESTIONS
+from typing import Dict, List, Optional, Tuple
+from ToGood2Go.questions import QUESTIONS
+from app.domain.models import Question
+from app.domain.question_graph import FlowCursor, QuestionGraph
+
+# Compiled once: conditions ("when") become predicates, required questions a bitset
+GRAPH = QuestionGraph([Question(id=q["id"], text=q["text"], required=q["required"], when=q.get("when"))
+                       for q in QUESTIONS])
+SLOT_OF = {q["id"]: q["slot"] for q in QUESTIONS}
+QUESTION_OF = {q["slot"]: q["id"] for q in QUESTIONS}
 
 
 @dataclass
@@ -10,52 +19,71 @@ class ConversationState:
     slots: Dict[str, Optional[str]] = field(default_factory=dict)
     # chat history (useful for debugging / later model calls)
     history: List[Dict[str, str]] = field(default_factory=list)
+    # position in GRAPH and the required questions whose slot is still empty
+    cursor: FlowCursor = field(default_factory=GRAPH.start)
 
     def __post_init__(self):
         # initialize all slots to None
         for q in QUESTIONS:
             self.slots.setdefault(q["slot"], None)
+        for slot, value in self.slots.items():
+            if value and slot in QUESTION_OF:
+                GRAPH.answered(self.cursor, QUESTION_OF[slot])
 
     @property
     def unanswered_required_slots(self) -> List[str]:
-        """Return list of slot names that are required and still None."""
-        missing = []
-        for q in QUESTIONS:
-            if q["required"] and not self.slots.get(q["slot"]):
-                missing.append(q["slot"])
-        return missing
+        """Return list of slot names that are required and still None (skipped questions are not required)."""
+        return [SLOT_OF[qid] for qid in GRAPH.missing_ids(self.cursor)]
 
 
 class ConversationEngine:
     def __init__(self):
         self.state = ConversationState()
-        self.current_question_index = 0
+        # (question, answer) pairs not yet sent to the slot extractor (see llm_helpers.extract_slot_deltas)
+        self.pending_answers: List[Tuple[dict, str]] = []
+
+    @property
+    def current_question_index(self) -> int:
+        return self.state.cursor.position
+
+    def _slot_value(self, question_id: str) -> Optional[str]:
+        return self.state.slots.get(SLOT_OF[question_id])
 
     def next_question(self) -> Optional[str]:
         """
         Decide which question to ask next.
-        - Follows the fixed order in QUESTIONS
-        - Skips questions whose slot is already filled
+        - Follows the order in QUESTIONS; the cursor only moves forward
+        - Skips questions whose slot is already filled, and questions whose "when" condition is false
+        """
+        q = GRAPH.settle(self.state.cursor, self._slot_value, done=lambda qid: bool(self._slot_value(qid)))
+        # None: no more questions that need asking
+        return q.text if q is not None else None
+
+    def record_answer(self, user_text: str):
+        """
+        Queue the answer to the current question for batched extraction and move on,
+        so the next question can be asked before the LLM has looked at this one.
         """
-        for i in range(self.current_question_index, len(QUESTIONS)):
-            q = QUESTIONS[i]
-            slot = q["slot"]
-            if not self.state.slots.get(slot):
-                self.current_question_index = i
-                return q["text"]
+        if self.current_question_index < len(QUESTIONS):
+            self.pending_answers.append((QUESTIONS[self.current_question_index], user_text))
+            self.state.cursor.position += 1
 
-        # No more questions that need asking
-        return None
+    def take_pending_answers(self) -> List[Tuple[dict, str]]:
+        pending, self.pending_answers = self.pending_answers, []
+        return pending
 
     def mark_slots_from_llm(self, slot_updates: Dict[str, Optional[str]]):
         """
         Update state.slots using extracted info from the model.
+        Works for a full slot dict or a sparse patch (extract_slot_deltas): slots the patch
+        leaves out are untouched, unknown slots are ignored.
         Only overwrite if model gives a non-empty value.
         """
         for slot, value in slot_updates.items():
-            if value:
+            if value and slot in self.state.slots:
                 self.state.slots[slot] = value
+                GRAPH.answered(self.state.cursor, QUESTION_OF[slot])
 
     def is_complete(self) -> bool:
-        """Check if all required slots are filled."""
-        return len(self.state.unanswered_required_slots) == 0
+        """Check if all required slots are filled (one bitset compare)."""
+        return GRAPH.is_complete(self.state.cursor)
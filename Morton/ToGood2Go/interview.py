@@ -2,10 +2,18 @@ import json
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-import ollama
+# Run from the Morton folder (the app package lives there):  python -m ToGood2Go.interview
+
+from app.adapters.ollama_http import get_client
+from ToGood2Go.llm_helpers import OLLAMA_BASE_URL, ROUTER
+from ToGood2Go.utils.event_log import close_jsonl, log_event  # buffered; close_jsonl at session end
+from ToGood2Go.utils.events import AnswerGiven, ChatMessage, CommandUsed, QuestionShown, SessionEnded, SessionStarted
+
+_HERE = Path(__file__).resolve().parent
 
 def chat(transcript_path: Path, session_id:str):
-    model = 'jobautomation/OpenEuroLLM-Danish:latest' # "llama3.1"
+    # The Danish model is the "language" task in data/models.json; the router falls back if it is not pulled
+    client = ROUTER.client("language", get_client(OLLAMA_BASE_URL))
     history = []
 
     while True:
@@ -17,26 +25,13 @@ def chat(transcript_path: Path, session_id:str):
         user_msg = {"role": "user", "content": prompt}
         history.append(user_msg)
 
-        append_jsonl(transcript_path, {
-            "ts": now_iso(),
-            "type": "chat",
-            "sessionId": session_id,
-            "questionId": "chat",
-            "text": user_msg
-        })
+        log_event(transcript_path, ChatMessage(session_id, "patient", user_msg["content"]))
 
         print("Bot: ", end="", flush=True)
         bot_message_content = ""
 
-        response = ollama.chat(model=model, messages=history, stream=True)
-
-        for chunk in response:
-            # Handle both styles: object chunks vs dict chunks
-            if hasattr(chunk, "message"):
-                token = chunk.message.content or ""
-            else:
-                token = chunk.get("message", {}).get("content", "") or chunk.get("response", "")
-
+        for chunk in client.chat_stream({"messages": history}):
+            token = chunk.get("message", {}).get("content", "")
             bot_message_content += token
             print(token, end="", flush=True)
 
@@ -47,11 +42,6 @@ def chat(transcript_path: Path, session_id:str):
 def now_iso() -> int:
     return int(datetime.now(timezone.utc).timestamp())
 
-# Append info to the json log
-def append_jsonl(path: Path, obj: dict) -> None:
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
-
 # Load questions from Json and return a list of dictionary objects
 def load_questions(path: Path) -> list[dict]:
     data = json.loads(path.read_text(encoding="utf-8"))
@@ -60,10 +50,10 @@ def load_questions(path: Path) -> list[dict]:
 def main():
 
     # Path to json with questions
-    questions_path = Path("../data/questions.json")
+    questions_path = _HERE.parent / "data" / "questions.json"
 
     # Directory where json log and summary are placed
-    out_dir = Path("runs")
+    out_dir = _HERE / "runs"
     out_dir.mkdir(exist_ok=True)
 
     # Compute a unique session ID
@@ -74,12 +64,7 @@ def main():
     questions = load_questions(questions_path)
 
     # Start-event
-    append_jsonl(transcript_path, {
-        "ts": now_iso(),
-        "type": "session_started",
-        "sessionId": session_id,
-        "meta": {"questionsFile": str(questions_path)}
-    })
+    log_event(transcript_path, SessionStarted(session_id, {"questionsFile": str(questions_path)}))
 
     # Dictionary to hold the answers
     answers = {}
@@ -93,13 +78,7 @@ def main():
         qtext = q["text"]
 
         # Log at spørgsmålet blev vist
-        append_jsonl(transcript_path, {
-            "ts": now_iso(),
-            "type": "standard_question_shown",
-            "sessionId": session_id,
-            "questionId": qid,
-            "text": qtext
-        })
+        log_event(transcript_path, QuestionShown(session_id, qid, qtext))
 
         print(f"SPØRGSMÅL ({qid}): {qtext}")
         answer = input("SVAR: ").strip()
@@ -107,47 +86,28 @@ def main():
         # command handling
         while answer.lower() in ("/chat",):
             # go to chat, then come back to same question
-            append_jsonl(transcript_path, {
-                "ts": now_iso(),
-                "type": "command_used",
-                "sessionId": session_id,
-                "command": "/chat",
-                "context": {"questionId": qid}
-            })
+            log_event(transcript_path, CommandUsed(session_id, "/chat", {"questionId": qid}))
             chat(transcript_path, session_id)
             print(f"SPØRGSMÅL ({qid}): {qtext}")
             print("Svar eller skriv /chat, /next, /quit")
             answer = input("SVAR: ").strip()
 
         if answer.lower() == "/quit":
-            append_jsonl(transcript_path, {
-                "ts": now_iso(),
-                "type": "session_aborted",
-                "sessionId": session_id,
-                "reason": "user_quit"
-            })
+            log_event(transcript_path, SessionEnded(session_id, "user_quit"))
+            close_jsonl(transcript_path)
             print("\nAfsluttet.")
             return
 
         answers[qid] = answer
 
         # Log svaret
-        append_jsonl(transcript_path, {
-            "ts": now_iso(),
-            "type": "standard_answer_given",
-            "sessionId": session_id,
-            "questionId": qid,
-            "text": answer
-        })
+        log_event(transcript_path, AnswerGiven(session_id, qid, answer))
 
         print()  # luft
 
     # Slut-event
-    append_jsonl(transcript_path, {
-        "ts": now_iso(),
-        "type": "session_finished",
-        "sessionId": session_id
-    })
+    log_event(transcript_path, SessionEnded(session_id))
+    close_jsonl(transcript_path)
 
     # Gem en samlet “pakke” (nem at bruge til opsummering senere)
     output = {
@@ -5,22 +5,26 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 import ollama
 import requests
+from utils.event_log import close_jsonl, log_event  # buffered; close_jsonl at session end
+from utils.events import (AnswerGiven, AnswerSkipped, ChatMessage, CommandUsed, QuestionShown, SessionEnded,
+                          SessionStarted)
 
 
 # ---- Config ----
 OLLAMA_URL = "http://localhost:11434/api/chat"
-OLLAMA_MODEL = "jobautomation/OpenEuroLLM-Danish"  # ændr til din model, fx "mistral", "llama3.2", osv.
+# Paths relative to this file, so the script runs from any working directory
+_HERE = Path(__file__).resolve().parent
+DATA_DIR = _HERE.parent / "data"
+# The Danish conversation model is the "language" task in data/models.json (change it there)
+_LANGUAGE = json.loads((DATA_DIR / "models.json").read_text(encoding="utf-8"))["tasks"]["language"]
+OLLAMA_MODEL = _LANGUAGE["model"]
+OLLAMA_KEEP_ALIVE = _LANGUAGE.get("keep_alive", "30m")  # keep it loaded between chat turns
 
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def append_jsonl(path: Path, obj: dict) -> None:
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
-
-
 def load_questions(path: Path) -> list[dict]:
     data = json.loads(path.read_text(encoding="utf-8"))
     return data["questions"]
@@ -30,7 +34,8 @@ def ollama_chat(messages):
     payload = {
         "model": OLLAMA_MODEL,
         "messages": messages,
-        "stream": False
+        "stream": False,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
     }
 
     r = requests.post(OLLAMA_URL, json=payload, timeout=120)
@@ -40,7 +45,7 @@ def ollama_chat(messages):
         raise RuntimeError(f"Ollama HTTP {r.status_code}: {r.text}")
 
     data = r.json()
-    return data.message.content
+    return data["message"]["content"]
 
 
 
@@ -54,8 +59,8 @@ def build_chat_system_prompt() -> str:
 
 
 def main():
-    questions_path = Path("../data/questions.json")
-    out_dir = Path("runs")
+    questions_path = DATA_DIR / "questions.json"
+    out_dir = _HERE / "runs"
     out_dir.mkdir(exist_ok=True)
 
     session_id = str(uuid.uuid4())
@@ -68,16 +73,11 @@ def main():
     answers: Dict[str, str] = {}
     chat_messages: List[Dict[str, str]] = [{"role": "system", "content": build_chat_system_prompt()}]
 
-    append_jsonl(transcript_path, {
-        "ts": now_iso(),
-        "type": "session_started",
-        "sessionId": session_id,
-        "meta": {
-            "questionsFile": str(questions_path),
-            "ollamaModel": OLLAMA_MODEL,
-            "ollamaUrl": OLLAMA_URL
-        }
-    })
+    log_event(transcript_path, SessionStarted(session_id, {
+        "questionsFile": str(questions_path),
+        "ollamaModel": OLLAMA_MODEL,
+        "ollamaUrl": OLLAMA_URL
+    }))
 
     print("\n--- Interview start ---")
     print(f"Session: {session_id}")
@@ -97,12 +97,7 @@ def main():
                 raise SystemExit
 
             # Log patient spørgsmål
-            append_jsonl(transcript_path, {
-                "ts": now_iso(),
-                "type": "patient_chat_question",
-                "sessionId": session_id,
-                "text": user_q
-            })
+            log_event(transcript_path, ChatMessage(session_id, "patient", user_q))
 
             chat_messages.append({"role": "user", "content": user_q})
 
@@ -112,12 +107,7 @@ def main():
                 bot_a = f"[Fejl ved kald til Ollama: {e}]"
 
             # Log bot svar
-            append_jsonl(transcript_path, {
-                "ts": now_iso(),
-                "type": "bot_chat_answer",
-                "sessionId": session_id,
-                "text": bot_a
-            })
+            log_event(transcript_path, ChatMessage(session_id, "assistant", bot_a))
 
             chat_messages.append({"role": "assistant", "content": bot_a})
 
@@ -128,13 +118,7 @@ def main():
         qid = q["id"]
         qtext = q["text"]
 
-        append_jsonl(transcript_path, {
-            "ts": now_iso(),
-            "type": "standard_question_shown",
-            "sessionId": session_id,
-            "questionId": qid,
-            "text": qtext
-        })
+        log_event(transcript_path, QuestionShown(session_id, qid, qtext))
 
         print(f"SPØRGSMÅL ({qid}): {qtext}")
         print("Svar eller skriv /chat, /next, /quit")
@@ -143,48 +127,26 @@ def main():
         # command handling
         while user_input.lower() in ("/chat",):
             # go to chat, then come back to same question
-            append_jsonl(transcript_path, {
-                "ts": now_iso(),
-                "type": "command_used",
-                "sessionId": session_id,
-                "command": "/chat",
-                "context": {"questionId": qid}
-            })
+            log_event(transcript_path, CommandUsed(session_id, "/chat", {"questionId": qid}))
             do_chat()
             print(f"SPØRGSMÅL ({qid}): {qtext}")
             print("Svar eller skriv /chat, /next, /quit")
             user_input = input("SVAR: ").strip()
 
         if user_input.lower() == "/quit":
-            append_jsonl(transcript_path, {
-                "ts": now_iso(),
-                "type": "session_aborted",
-                "sessionId": session_id,
-                "reason": "user_quit"
-            })
+            log_event(transcript_path, SessionEnded(session_id, "user_quit"))
+            close_jsonl(transcript_path)
             print("\nAfsluttet.")
             return
 
         if user_input.lower() == "/next":
-            append_jsonl(transcript_path, {
-                "ts": now_iso(),
-                "type": "standard_answer_skipped",
-                "sessionId": session_id,
-                "questionId": qid,
-                "text": ""
-            })
+            log_event(transcript_path, AnswerSkipped(session_id, qid))
             print("(Sprunget over)\n")
             continue
 
         # normal answer
         answers[qid] = user_input
-        append_jsonl(transcript_path, {
-            "ts": now_iso(),
-            "type": "standard_answer_given",
-            "sessionId": session_id,
-            "questionId": qid,
-            "text": user_input
-        })
+        log_event(transcript_path, AnswerGiven(session_id, qid, user_input))
         print()
 
     # After standard questions: allow final chat
@@ -192,30 +154,17 @@ def main():
     print("Vil du stille flere spørgsmål til chatbotten? Skriv /chat eller tryk Enter for at afslutte.")
     final = input("> ").strip()
     if final.lower() == "/chat":
-        append_jsonl(transcript_path, {
-            "ts": now_iso(),
-            "type": "command_used",
-            "sessionId": session_id,
-            "command": "/chat",
-            "context": {"phase": "after_questions"}
-        })
+        log_event(transcript_path, CommandUsed(session_id, "/chat", {"phase": "after_questions"}))
         try:
             do_chat()
         except SystemExit:
-            append_jsonl(transcript_path, {
-                "ts": now_iso(),
-                "type": "session_aborted",
-                "sessionId": session_id,
-                "reason": "user_quit_in_chat"
-            })
+            log_event(transcript_path, SessionEnded(session_id, "user_quit_in_chat"))
+            close_jsonl(transcript_path)
             print("\nAfsluttet.")
             return
 
-    append_jsonl(transcript_path, {
-        "ts": now_iso(),
-        "type": "session_finished",
-        "sessionId": session_id
-    })
+    log_event(transcript_path, SessionEnded(session_id))
+    close_jsonl(transcript_path)
 
     # Save a combined output snapshot
     output = {
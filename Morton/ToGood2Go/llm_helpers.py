@@ -1,24 +1,26 @@
 # llm_helpers.py
+# Imported as ToGood2Go.llm_helpers from the Morton folder (the app package lives there)
 
 import json
-import requests
+import os
 
-OLLAMA_URL = "http://localhost:11434/api/chat"
-MODEL_NAME = "llama3.1"  # or your favourite "thinking" model
+from app.adapters.model_router import ModelRouter
+from app.adapters.ollama_http import get_client
 
+OLLAMA_BASE_URL = "http://localhost:11434"
+# Models per task (slot_extraction, summarization, ...) come from Morton/data/models.json
+ROUTER = ModelRouter.from_file(os.path.join(os.path.dirname(__file__), "..", "data", "models.json"))
+MODEL_NAME = ROUTER.model("slot_extraction")
 
-def call_ollama(messages):
-    resp = requests.post(
-        OLLAMA_URL,
-        json={
-            "model": MODEL_NAME,
-            "messages": messages,
-            "stream": False,
-        },
-        timeout=60,
-    )
-    resp.raise_for_status()
-    data = resp.json()
+
+def call_ollama(messages, format=None, task="slot_extraction"):
+    payload = {
+        "model": ROUTER.model(task),
+        "messages": messages,
+    }
+    if format is not None:
+        payload["format"] = format  # JSON schema (or "json") the reply must follow
+    data = ROUTER.client(task, get_client(OLLAMA_BASE_URL)).chat(payload, timeout=60)
     # Ollama's /api/chat returns {"message": {"content": "..."} , ...}
     return data["message"]["content"]
 
@@ -68,6 +70,85 @@ def extract_slot_values(user_text: str, current_slots: dict) -> dict:
     # ensure only known keys
     return {k: data.get(k) for k in current_slots.keys()}
 
+# ------------------------------------------------------------
+# Delta extraction: only the relevant slots go in, only changes come out
+# ------------------------------------------------------------
+
+def patch_schema(slot_names) -> dict:
+    """Every slot optional: the model returns just the slots the answer says something about."""
+    return {
+        "type": "object",
+        "properties": {name: {"type": "string"} for name in slot_names},
+        "additionalProperties": False,
+    }
+
+
+def _clean_patch(data: dict, slot_names) -> dict:
+    # known slots with a real value only; "null"/"" mean "nothing new"
+    return {
+        k: v for k, v in data.items()
+        if k in slot_names and v not in (None, "", "null", "None")
+    }
+
+
+def extract_slot_deltas(pending: list, current_slots: dict) -> dict:
+    """
+    Sparse patch for one or more answers in a single LLM call.
+
+    pending: [(question, answer_text), ...] where question is an entry from QUESTIONS.
+    Only the slots of these questions are sent with their current values, plus the names of the
+    still-empty slots so information the patient volunteers for them is not lost. Filled slots
+    are left out of both the prompt and the format schema (their questions are skipped anyway).
+    """
+    if not pending:
+        return {}
+
+    asked = list(dict.fromkeys(q["slot"] for q, _ in pending))
+    slot_names = asked + [k for k, v in current_slots.items() if not v and k not in asked]
+    known = {slot: current_slots.get(slot) for slot in asked if current_slots.get(slot)}
+
+    system_msg = {
+        "role": "system",
+        "content": (
+            "You are an assistant that extracts structured medical anamnesis "
+            "information from free text.\n"
+            "Return a JSON object with ONLY the slots that the patient's answers add to or change. "
+            "Leave out every other slot.\n"
+            "Allowed slots: " + ", ".join(slot_names) + "."
+        ),
+    }
+
+    answers = "\n".join(
+        f"{i}. Question ({q['slot']}): {q['text']}\n   Answer: {text}"
+        for i, (q, text) in enumerate(pending, 1)
+    )
+    user_msg = {
+        "role": "user",
+        "content": (
+            (f"Already known for these slots (JSON):\n{json.dumps(known, ensure_ascii=False)}\n\n" if known else "")
+            + "New patient answers:\n"
+            + answers
+            + "\n\nOnly respond with JSON, no explanation."
+        ),
+    }
+
+    raw = call_ollama([system_msg, user_msg], format=patch_schema(slot_names))
+
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError:
+        print("WARNING: LLM did not return valid JSON:", raw)
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return _clean_patch(data, slot_names)
+
+
+def extract_slot_delta(question: dict, user_text: str, current_slots: dict) -> dict:
+    """Sparse patch for one answer (see extract_slot_deltas)."""
+    return extract_slot_deltas([(question, user_text)], current_slots)
+
+
 def summarize_anamnesis(slots: dict) -> str:
     system_msg = {
         "role": "system",
@@ -87,4 +168,4 @@ def summarize_anamnesis(slots: dict) -> str:
         ),
     }
 
-    return call_ollama([system_msg, user_msg])
+    return call_ollama([system_msg, user_msg], task="summarization")
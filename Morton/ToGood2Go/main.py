@@ -11,10 +11,14 @@
 #     return {"response": response["message"]["content"]}
 
 # main.py
+# Run from the Morton folder (the app package lives there):  uvicorn ToGood2Go.main:app
 
 from fastapi import FastAPI
 from pydantic import BaseModel
-import requests
+
+from app.adapters.ollama_http import get_client
+from app.adapters.prompt_budget import RollingSummary, TokenCounter, fill_newest_first
+from ToGood2Go.llm_helpers import OLLAMA_BASE_URL, ROUTER
 
 app = FastAPI()
 
@@ -33,6 +37,8 @@ class ConversationState:
         self.messages = []
         self.completed = set()   # fx {"basic_info", "medication"}
         self.answers = {}        # parsed information from user answers
+        self.summary = RollingSummary()  # resumé af de beskeder, der ikke længere er med i prompten
+        self.window_start = 0            # index i messages på den første besked i prompten
 
 
 # ------------------------------------------------------------
@@ -133,15 +139,29 @@ def update_state_from_user_input(state: ConversationState, text: str, next_topic
 # ------------------------------------------------------------
 
 def ask_ollama(messages):
-    url = "http://localhost:11434/v1/chat/completions"
-    payload = {
-        "model": "gpt-oss:20b",   # Skift til din model i Ollama
-        "messages": messages,
-        "stream": False
-    }
-    r = requests.post(url, json=payload, timeout=60)
-    r.raise_for_status()
-    return r.json()["choices"][0]["message"]["content"]
+    # Modellen er "chat"-opgaven i data/models.json (skift den dér); routeren sætter model og fallback
+    data = ROUTER.client("chat", get_client(OLLAMA_BASE_URL)).chat({"messages": messages}, timeout=60)
+    return data["message"]["content"]
+
+
+HISTORY_TOKENS = 2048  # token-budget (anslået) for samtalehistorikken i prompten
+TOKENS = TokenCounter()
+
+
+def history_for_prompt(conv: ConversationState):
+    """
+    De nyeste beskeder inden for HISTORY_TOKENS; de ældre foldes ind i conv.summary.
+    Starten flyttes kun, når budgettet er overskredet (og så ned til det halve budget),
+    så prompten mellem flytningerne kun vokser i enden og Ollama kan genbruge sit prompt-cache.
+    """
+    contents = [m["content"] for m in conv.messages]
+    if fill_newest_first(contents, HISTORY_TOKENS, TOKENS) > conv.window_start:
+        start = min(fill_newest_first(contents, HISTORY_TOKENS // 2, TOKENS), len(contents) - 1)
+        while start < len(contents) - 1 and conv.messages[start]["role"] != "user":
+            start += 1
+        conv.summary.fold((m["role"], m["content"]) for m in conv.messages[conv.window_start:start])
+        conv.window_start = start
+    return conv.messages[conv.window_start:]
 
 
 # ------------------------------------------------------------
@@ -173,10 +193,10 @@ def chat(req: ChatRequest):
     system_prompt = build_system_prompt(next_topic_id, next_topic_label, conv.answers)
 
     # Forbered Ollama-kald
-    ollama_messages = [
-        {"role": "system", "content": system_prompt},
-        *conv.messages
-    ]
+    ollama_messages = [{"role": "system", "content": system_prompt}]
+    if conv.summary.text:
+        ollama_messages.append({"role": "system", "content": conv.summary.text})
+    ollama_messages.extend(history_for_prompt(conv))
 
     # Få svar fra modellen
     reply = ask_ollama(ollama_messages)
@@ -1,6 +1,7 @@
-import requests
+# Imported as ToGood2Go.services.llm from the Morton folder (the app package lives there)
+from app.adapters.ollama_http import get_client
 
-OLLAMA_URL = "http://localhost:11434/api/chat"
+OLLAMA_BASE_URL = "http://localhost:11434"
 
 def call_ollama(system_prompt: str, user_message: str, model: str = "llama3.1"):
     payload = {
@@ -11,8 +12,5 @@ def call_ollama(system_prompt: str, user_message: str, model: str = "llama3.1"):
         ]
     }
 
-    response = requests.post(OLLAMA_URL, json=payload)
-    response.raise_for_status()
-
-    data = response.json()
+    data = get_client(OLLAMA_BASE_URL).chat(payload, timeout=120)
     return data["message"]["content"]
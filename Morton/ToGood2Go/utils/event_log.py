@@ -0,0 +1,178 @@
+'''What: A buffered JSONL event writer for the interview logs (runs/<session>.jsonl), and a segmented variant
+for many sessions writing into one rotating set of files.
+Why: append_jsonl used to open, write and close the file for every event, and how durable each line was
+depended on the OS. This keeps the handle open, writes events in batches and lets us pick the durability:
+
+    none   lines reach the file when the batch is written; a crash can lose the open batch
+    flush  each batch is flushed to the OS (survives the process dying)            <- default
+    fsync  each batch is also fsync'ed (survives power loss), one fsync per batch, not per event
+
+A batch is written when it reaches batch_events or batch_bytes, when its oldest event is max_delay_s old
+(a background thread checks), and on flush()/close() - call close_jsonl(path) at session end.
+
+Usage (from the ToGood2Go folder):
+    from utils.event_log import close_jsonl, log_event
+    log_event(transcript_path, AnswerGiven(session_id, qid, text))   # utils/events.py
+    close_jsonl(transcript_path)                                     # session end'''
+
+from __future__ import annotations
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, IO, List, Optional, Union
+
+DURABILITY = ("none", "flush", "fsync")
+
+
+class EventLogWriter:
+    """
+    - path: the .jsonl file, or with segment_bytes a directory of <prefix>-000001.jsonl, <prefix>-000002.jsonl, ...
+      starting a new segment once the current one would exceed segment_bytes
+    - thread-safe: many sessions may share one writer; events are encoded outside the lock
+    """
+
+    def __init__(self, path: Union[str, Path], batch_events: int = 64, batch_bytes: int = 256 * 1024,
+                 max_delay_s: Optional[float] = 1.0, durability: str = "flush",
+                 segment_bytes: Optional[int] = None, prefix: str = "events"):
+        if durability not in DURABILITY:
+            raise ValueError(f"durability must be one of {DURABILITY}")
+        self.path = Path(path)
+        self.batch_events = batch_events
+        self.batch_bytes = batch_bytes
+        self.max_delay_s = max_delay_s
+        self.durability = durability
+        self.segment_bytes = segment_bytes
+        self.prefix = prefix
+        self.events = self.batches = 0
+
+        self._lock = threading.Lock()
+        self._buf: List[str] = []
+        self._buf_bytes = 0
+        self._oldest = 0.0
+        self._file: Optional[IO[str]] = None
+        self._segment = 0
+        self._segment_size = 0
+        self._closed = threading.Event()
+        self._flusher = None
+        if max_delay_s:
+            self._flusher = threading.Thread(target=self._run, name="event-log-flusher", daemon=True)
+            self._flusher.start()
+
+    # --- writing ---
+
+    def write(self, event: dict) -> None:
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._closed.is_set():
+                raise ValueError("event log is closed")
+            if not self._buf:
+                self._oldest = time.monotonic()
+            self._buf.append(line)
+            self._buf_bytes += len(line)
+            self.events += 1
+            if len(self._buf) >= self.batch_events or self._buf_bytes >= self.batch_bytes:
+                self._write_batch()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write_batch()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self._write_batch()
+            self._closed.set()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self._flusher is not None:
+            self._flusher.join()
+
+    def __enter__(self) -> "EventLogWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- internals (called with the lock held) ---
+
+    def _write_batch(self) -> None:
+        if not self._buf:
+            return
+        data = "".join(self._buf)
+        size = len(data.encode("utf-8")) if self.segment_bytes else 0
+        if self._file is None or (self.segment_bytes and self._segment_size
+                                  and self._segment_size + size > self.segment_bytes):
+            self._open_next()
+        self._file.write(data)
+        self._segment_size += size
+        if self.durability != "none":
+            self._file.flush()
+            if self.durability == "fsync":
+                os.fsync(self._file.fileno())
+        self._buf.clear()
+        self._buf_bytes = 0
+        self.batches += 1
+
+    def _open_next(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        if not self.segment_bytes:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        if not self._segment:
+            # Continue after the segments a previous process left behind
+            existing = sorted(self.path.glob(f"{self.prefix}-*.jsonl"))
+            self._segment = int(existing[-1].stem.rsplit("-", 1)[1]) if existing else 0
+        self._segment += 1
+        self._file = (self.path / f"{self.prefix}-{self._segment:06d}.jsonl").open("a", encoding="utf-8")
+        self._segment_size = 0
+
+    def _run(self) -> None:
+        while not self._closed.wait(self.max_delay_s / 2):
+            with self._lock:
+                if self._buf and time.monotonic() - self._oldest >= self.max_delay_s and not self._closed.is_set():
+                    self._write_batch()
+
+
+# --- drop-in replacement for the scripts' append_jsonl: one open writer per log file ---
+
+_writers: Dict[Path, EventLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def append_jsonl(path: Path, obj: dict) -> None:
+    key = Path(path).resolve()
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = EventLogWriter(key)
+    writer.write(obj)
+
+
+def log_event(path: Path, event) -> None:
+    """Append one utils/events.py event as a schema-versioned line."""
+    append_jsonl(path, event.to_record())
+
+
+def close_jsonl(path: Path) -> None:
+    """Session end: write what is buffered and release the file handle."""
+    with _writers_lock:
+        writer = _writers.pop(Path(path).resolve(), None)
+    if writer is not None:
+        writer.close()
+
+
+@atexit.register
+def _close_all() -> None:
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
@@ -0,0 +1,191 @@
+'''What: One versioned schema for the interview event logs (runs/*.jsonl), as small slotted event classes,
+plus a streaming loader that also reads the older lines.
+Why: interview.py wrote integer epoch "ts" and chat "text" as a {"role", "content"} dict, while
+interview_with_chat.py wrote ISO timestamps and separate patient_chat_question / bot_chat_answer events.
+Readers had to guess per line; now every line is converted once into one of the classes below.
+
+Schema version 1, one JSON object per line:
+    {"v": 1, "ts": <epoch seconds, float>, "type": <event type>, "sessionId": ..., <camelCase fields>}
+
+Loading: iter_events(path) parses one file lazily (orjson if installed, else json);
+load_runs(directory, workers=N) parses many files in N processes. utils/replay.py turns the events of a
+session back into a Conversation + Message transcript for the app/ orchestrator.'''
+
+from __future__ import annotations
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # optional speed-up
+    orjson = None
+    _loads = json.loads
+
+SCHEMA_VERSION = 1
+
+
+@dataclass(slots=True)
+class Event:
+    session_id: str
+    ts: float = field(default_factory=time.time, kw_only=True)
+
+    type = "event"
+
+    def to_record(self) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"v": SCHEMA_VERSION, "ts": round(self.ts, 3), "type": self.type}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if f.name != "ts" and value is not None:
+                record[_CAMEL.get(f.name, f.name)] = value
+        return record
+
+
+@dataclass(slots=True)
+class SessionStarted(Event):
+    meta: Optional[Dict[str, Any]] = None
+    type = "session_started"
+
+
+@dataclass(slots=True)
+class QuestionShown(Event):
+    question_id: str
+    text: str
+    type = "question_shown"
+
+
+@dataclass(slots=True)
+class AnswerGiven(Event):
+    question_id: str
+    text: str
+    type = "answer_given"
+
+
+@dataclass(slots=True)
+class AnswerSkipped(Event):
+    question_id: str
+    type = "answer_skipped"
+
+
+@dataclass(slots=True)
+class ChatMessage(Event):
+    role: str                          # "patient" | "assistant"
+    text: str
+    question_id: Optional[str] = None  # the standardized question the chat interrupted, if known
+    type = "chat_message"
+
+
+@dataclass(slots=True)
+class CommandUsed(Event):
+    command: str
+    context: Optional[Dict[str, Any]] = None
+    type = "command_used"
+
+
+@dataclass(slots=True)
+class SessionEnded(Event):
+    reason: str = "finished"           # "finished" | "user_quit" | "user_quit_in_chat" | ...
+    type = "session_ended"
+
+
+@dataclass(slots=True)
+class UnknownEvent(Event):
+    """A line of a type this version does not know; kept so nothing is silently dropped."""
+    raw_type: str = ""
+    data: Optional[Dict[str, Any]] = None
+    type = "unknown"
+
+
+EVENT_TYPES: Dict[str, Type[Event]] = {cls.type: cls for cls in (
+    SessionStarted, QuestionShown, AnswerGiven, AnswerSkipped, ChatMessage, CommandUsed, SessionEnded)}
+_CAMEL = {"session_id": "sessionId", "question_id": "questionId", "raw_type": "rawType"}
+_SNAKE = {v: k for k, v in _CAMEL.items()}
+
+
+def _ts(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return 0.0
+
+
+def from_record(obj: Dict[str, Any]) -> Event:
+    """One parsed JSON line (version 1 or a legacy line) -> Event."""
+    if obj.get("v") == SCHEMA_VERSION:
+        cls = EVENT_TYPES.get(obj.get("type"))
+        if cls is not None:
+            kwargs = {_SNAKE.get(k, k): v for k, v in obj.items() if k not in ("v", "type")}
+            return cls(**kwargs)
+    return _from_legacy(obj)
+
+
+def _from_legacy(obj: Dict[str, Any]) -> Event:
+    kind = obj.get("type")
+    sid = obj.get("sessionId", "")
+    ts = _ts(obj.get("ts"))
+    text = obj.get("text")
+    qid = obj.get("questionId")
+    if kind == "session_started":
+        return SessionStarted(sid, obj.get("meta"), ts=ts)
+    if kind == "standard_question_shown":
+        return QuestionShown(sid, qid, text or "", ts=ts)
+    if kind == "standard_answer_given":
+        return AnswerGiven(sid, qid, text or "", ts=ts)
+    if kind == "standard_answer_skipped":
+        return AnswerSkipped(sid, qid, ts=ts)
+    if kind == "chat":  # interview.py: {"role": "user"|"assistant", "content": ...}, questionId "chat"
+        message = text if isinstance(text, dict) else {"role": "user", "content": text or ""}
+        role = "patient" if message.get("role") == "user" else "assistant"
+        return ChatMessage(sid, role, message.get("content", ""), None if qid == "chat" else qid, ts=ts)
+    if kind in ("patient_chat_question", "bot_chat_answer"):  # interview_with_chat.py
+        return ChatMessage(sid, "patient" if kind == "patient_chat_question" else "assistant", text or "", qid, ts=ts)
+    if kind == "command_used":
+        return CommandUsed(sid, obj.get("command", ""), obj.get("context"), ts=ts)
+    if kind == "session_finished":
+        return SessionEnded(sid, ts=ts)
+    if kind == "session_aborted":
+        return SessionEnded(sid, obj.get("reason", "aborted"), ts=ts)
+    data = {k: v for k, v in obj.items() if k not in ("ts", "type", "sessionId")}
+    return UnknownEvent(sid, str(kind), data, ts=ts)
+
+
+def iter_events(path: str) -> Iterator[Event]:
+    """Events of one JSONL file, parsed line by line."""
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield from_record(_loads(line))
+
+
+def _load_file(path: str) -> Tuple[str, List[Event]]:
+    return path, list(iter_events(path))
+
+
+def load_runs(directory: str, pattern: str = "*.jsonl", workers: Optional[int] = None) -> Iterator[Tuple[str, List[Event]]]:
+    """
+    (path, events) per log file in `directory`, in file name order.
+    workers > 1 parses files in that many processes (worth it for many or large files); 1 parses them
+    one at a time in this process, so only one file is in memory at a time.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, pattern)))
+    workers = workers if workers is not None else min(len(paths), os.cpu_count() or 1)
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield _load_file(path)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_load_file, paths, chunksize=max(1, len(paths) // (workers * 4)))
+
+
+def dumps(event: Event) -> str:
+    """One version-1 JSON line (without the newline)."""
+    if orjson is not None:
+        return orjson.dumps(event.to_record()).decode("utf-8")
+    return json.dumps(event.to_record(), ensure_ascii=False)
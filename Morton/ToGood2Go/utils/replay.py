@@ -0,0 +1,58 @@
+'''What: Turn the events of one interview log (utils/events.py) back into an app/ Conversation and its
+Message transcript, in the same shape the orchestrator stores.
+Why: Recorded sessions can then be replayed into ConversationOrchestrator, summarized again, or loaded into a
+transcript store for benchmarks, without each tool re-reading the raw log formats.
+
+Usage (from the Morton folder):
+    for conv, messages in load_sessions("ToGood2Go/runs"):
+        ...'''
+
+from __future__ import annotations
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from app.domain.models import Conversation, ConversationState, Message, Role
+from ToGood2Go.utils.events import (AnswerGiven, AnswerSkipped, ChatMessage, Event, QuestionShown, SessionEnded,
+                                    load_runs)
+
+
+def rebuild(events: Iterable[Event]) -> Tuple[Conversation, List[Message]]:
+    conv: Optional[Conversation] = None
+    messages: List[Message] = []
+    shown = set()
+    for e in events:
+        if conv is None:
+            conv = Conversation(conversation_id=e.session_id)
+        ts = int(e.ts)
+        if isinstance(e, QuestionShown):
+            meta = {"question_id": e.question_id, "channel": "questionnaire"}
+            if e.question_id in shown:
+                meta = {"question_id": e.question_id, "reask": True}
+            shown.add(e.question_id)
+            conv.active_question_id = e.question_id
+            conv.state = ConversationState.FLOW_WAITING_ANSWER
+            messages.append(Message(role=Role.SYSTEM, content=e.text, ts=ts, meta=meta))
+        elif isinstance(e, AnswerGiven):
+            conv.answers[e.question_id] = e.text
+            conv.question_index += 1
+            conv.active_question_id = None
+            messages.append(Message(role=Role.PATIENT, content=e.text, ts=ts, meta={"mode": "answer"}))
+        elif isinstance(e, AnswerSkipped):
+            conv.question_index += 1
+            conv.active_question_id = None
+        elif isinstance(e, ChatMessage):
+            conv.state = ConversationState.CHAT_MODE
+            role = Role.PATIENT if e.role == "patient" else Role.ASSISTANT
+            messages.append(Message(role=role, content=e.text, ts=ts, meta={"mode": "chat"}))
+        elif isinstance(e, SessionEnded):
+            conv.state = ConversationState.DONE
+            conv.active_question_id = None
+    if conv is None:
+        raise ValueError("no events")
+    return conv, messages
+
+
+def load_sessions(directory: str, pattern: str = "*.jsonl", workers: Optional[int] = None) -> Iterator[Tuple[Conversation, List[Message]]]:
+    """(Conversation, transcript) for every non-empty log in directory."""
+    for _, events in load_runs(directory, pattern, workers):
+        if events:
+            yield rebuild(events)
@@ -1 +1,7 @@
-# https://www.youtube.com/watch?v=E4l91XKQSgw
\ No newline at end of file
+# https://www.youtube.com/watch?v=E4l91XKQSgw
+'''What: The FAQ embedding index under its old name; it lives in app/adapters/faq_index.py.
+Imported as ToGood2Go.vector from the Morton folder.'''
+
+from app.adapters.faq_index import FaqIndex, OllamaEmbedder, load_corpus
+
+__all__ = ["FaqIndex", "OllamaEmbedder", "load_corpus"]
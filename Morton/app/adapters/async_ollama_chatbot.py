@@ -0,0 +1,79 @@
+'''What: Async version of OllamaChatbot (same prompt, non-blocking HTTP).
+Why: Used by AsyncConversationOrchestrator so chat turns don't hold a worker while the model generates.'''
+
+from __future__ import annotations
+import asyncio
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+from app.interfaces.chatbot import IAsyncStreamingChatbot
+from app.interfaces.retriever import IRetriever, RetrievedPassage
+from app.adapters.ollama_chatbot import (DEFAULT_SYSTEM_PROMPT, HistoryWindow, build_chat_messages, chat_history,
+                                         split_hits)
+from app.adapters.ollama_http_async import AsyncOllamaClient
+from app.adapters.prompt_budget import TokenCounter
+from app.domain.models import Message
+
+
+class AsyncOllamaChatbot(IAsyncStreamingChatbot):
+    def __init__(
+        self,
+        model: str = "llama3.1",
+        base_url: str = "http://localhost:11434",
+        system_prompt: Optional[str] = None,
+        timeout_s: int = 60,
+        client: Optional[AsyncOllamaClient] = None,
+        faq_index: Optional[IRetriever] = None,
+        faq_answer_threshold: float = 0.9,
+        rag_k: int = 3,
+        rag_min_score: float = 0.5,
+        max_history: Optional[int] = None,
+        history_tokens: Optional[int] = 1024,
+        summary_tokens: int = 128,
+        stable_history: bool = True,
+        token_counter: Optional[TokenCounter] = None,
+    ):
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.client = client or AsyncOllamaClient(self.base_url)
+        self.system_prompt = system_prompt or DEFAULT_SYSTEM_PROMPT
+        self.timeout_s = timeout_s
+        # FAQ retrieval as in OllamaChatbot; search embeds the question over sync HTTP, so it runs in a thread
+        self.faq_index = faq_index
+        self.faq_answer_threshold = faq_answer_threshold
+        self.rag_k = rag_k
+        self.rag_min_score = rag_min_score
+        self.history = HistoryWindow(max_history, history_tokens, stable=stable_history,
+                                     summary_tokens=summary_tokens, counter=token_counter)
+
+    async def _retrieve(self, user_text: str) -> Tuple[Optional[str], List[RetrievedPassage]]:
+        """(vetted answer or None, passages for the prompt)."""
+        if self.faq_index is None:
+            return None, []
+        hits = await asyncio.to_thread(self.faq_index.search, user_text, self.rag_k)
+        return split_hits(hits, self.faq_answer_threshold, self.rag_min_score)
+
+    def _build_messages(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None,
+                        passages: Sequence[RetrievedPassage] = ()) -> List[dict]:
+        cid = getattr(context, "conversation_id", None)
+        history = self.history.select(cid, chat_history(user_text, transcript))
+        return build_chat_messages(self.system_prompt, user_text, transcript, context, passages, history,
+                                   self.history.summary(cid))
+
+    async def answer(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None) -> str:
+        vetted, passages = await self._retrieve(user_text)
+        if vetted is not None:
+            return vetted
+        payload = {"model": self.model, "messages": self._build_messages(user_text, transcript, context, passages)}
+        data = await self.client.chat(payload, timeout=self.timeout_s)
+        return data["message"]["content"]
+
+    async def answer_stream(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None) -> AsyncIterator[str]:
+        vetted, passages = await self._retrieve(user_text)
+        if vetted is not None:
+            yield vetted
+            return
+        payload = {"model": self.model, "messages": self._build_messages(user_text, transcript, context, passages)}
+        async for chunk in self.client.chat_stream(payload, timeout=self.timeout_s):
+            token = (chunk.get("message") or {}).get("content", "")
+            if token:
+                yield token
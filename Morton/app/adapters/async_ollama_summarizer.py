@@ -0,0 +1,59 @@
+'''What: Async version of the structured-output OllamaSummarizer (improved_ollama_summarizer).
+Why: Finalizing one interview should not block every other session on the same event loop.'''
+
+from __future__ import annotations
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.interfaces.summarizer import IAsyncSummarizer
+from app.adapters.improved_ollama_summarizer import (
+    build_partial_messages, build_reduce_messages, build_summary_messages, chunk_transcript, parse_summary, partial_schema,
+)
+from app.adapters.ollama_http_async import AsyncOllamaClient
+from app.domain.models import Message
+
+
+class AsyncOllamaSummarizer(IAsyncSummarizer):
+    def __init__(
+            self,
+            model: str = "llama3.1",
+            base_url: str = "http://localhost:11434",
+            timeout_s: int = 120,
+            client: Optional[AsyncOllamaClient] = None,
+            chunk_tokens: Optional[int] = None,
+            max_parallel: int = 1,
+    ):
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.client = client or AsyncOllamaClient(self.base_url)
+        self.timeout_s = timeout_s
+        self.chunk_tokens = chunk_tokens
+        self.max_parallel = max_parallel
+
+    async def _chat(self, messages: List[Dict[str, str]], schema: Dict[str, Any]) -> Dict[str, Any]:
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "format": schema,  # Native structured output support
+        }
+        data = await self.client.chat(payload, timeout=self.timeout_s)
+        return parse_summary(data["message"]["content"])
+
+    async def summarize(self, transcript: Sequence[Message], schema: Dict[str, Any]) -> Dict[str, Any]:
+        if self.chunk_tokens:
+            chunks = chunk_transcript(transcript, self.chunk_tokens)
+            if len(chunks) > 1:
+                return await self._summarize_chunked(chunks, schema)
+        return await self._chat(build_summary_messages(transcript), schema)
+
+    async def _summarize_chunked(self, chunks: List[List[Message]], schema: Dict[str, Any]) -> Dict[str, Any]:
+        # Same map-reduce as the sync summarizer; max_parallel bounds the concurrent extractions
+        part_schema = partial_schema(schema)
+        gate = asyncio.Semaphore(max(1, self.max_parallel))
+
+        async def extract(i: int) -> Dict[str, Any]:
+            async with gate:
+                return await self._chat(build_partial_messages(chunks[i], i + 1, len(chunks)), part_schema)
+
+        partials = await asyncio.gather(*(extract(i) for i in range(len(chunks))))
+        return await self._chat(build_reduce_messages(partials), schema)
@@ -0,0 +1,152 @@
+'''What: An IChatbot wrapper that answers repeated patient questions from a cache.
+Why: "What does fasting mean?" gets asked in every other interview; regenerating the reply each time
+costs seconds of GPU time for the same text.
+
+Safety: a question is only answered from the shared cache when the reply cannot depend on the patient.
+Those questions are sent to the model with the non-personal context (the current question only) and no chat
+history, so the cached text is the same for everyone. Any question that refers to the patient ("I", "me", "my",
+"jeg", "mig", "min"), follow-ups to a chat reply and questions about the patient's own answers get the full
+context and history, and their cache key is scoped to the conversation. "Can I eat before surgery?" is thereby
+personal too: a missed shared hit costs one model call, a wrong one gives a patient another patient's advice.
+A reply from a routed client's fallback model (app/adapters/model_router.py) is not cached: the key names the
+primary model, and a fallback reply kept under it would be served long after the primary is back.'''
+
+from __future__ import annotations
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Iterator, Optional, Sequence
+
+from app.interfaces.chatbot import ChatContext, IChatbot, IStreamingChatbot
+from app.adapters.model_router import answered_by
+from app.adapters.response_cache import MemoryResponseCache
+from app.domain.models import Message, Role
+
+# Questions about what the patient said/answered before (English and Danish)
+_PERSONAL = re.compile(
+    r"\b(what did i|did i (say|answer|tell)|i (said|answered|told|wrote)|my answers?|so far|earlier|before that|"
+    r"hvad (svarede|sagde|skrev) jeg|mine svar|mit svar|jeg (svarede|sagde|skrev)|indtil videre|tidligere)\b"
+)
+# Questions that refer to the patient themselves ("is it risky for me with my allergy?"); matched after
+# normalize_question, so "I'm" is "i m"
+_FIRST_PERSON = re.compile(
+    r"\b(i|me|my|mine|myself|i m|i ve|i d|i ll|jeg|mig|min|mit|mine|selv)\b"
+)
+# Questions that only make sense after the previous chat reply ("and after that?", "hvorfor?", "what do you mean")
+_FOLLOW_UP = re.compile(
+    r"^(and|but|also|so|then|what about|what do you mean|og|men|også|så|hvad med|hvad mener du)\b"
+    r"|^(why|how|when|really|hvorfor|hvordan|hvornår|virkelig)$"
+)
+
+
+def normalize_question(text: str) -> str:
+    """Case, accents-as-composed, punctuation and spacing do not change the question."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def needs_personal_context(user_text: str, transcript: Sequence[Message]) -> bool:
+    """
+    True when the reply may depend on this patient: a question that mentions them, asks about their answers,
+    or follows up on a chat reply.
+    """
+    question = normalize_question(user_text)
+    if _PERSONAL.search(question) or _FIRST_PERSON.search(question):
+        return True
+    return _FOLLOW_UP.search(question) is not None and any(m.role == Role.ASSISTANT for m in transcript)
+
+
+class CachedChatbot(IStreamingChatbot):
+    """
+    - inner: the real chatbot (streaming or not)
+    - cache: MemoryResponseCache (default) or SqliteResponseCache, anything with get/put
+    - model / system_prompt: part of the key; read from inner (OllamaChatbot has both) unless given
+    hits / misses count cache lookups; personal_lookups counts the ones that used a conversation-scoped key;
+    fallback_skips counts replies not cached because another model than `model` wrote them.
+    """
+
+    def __init__(self, inner: IChatbot, cache=None, model: Optional[str] = None, system_prompt: Optional[str] = None):
+        self.inner = inner
+        self.cache = cache if cache is not None else MemoryResponseCache()
+        self.model = model or getattr(inner, "model", "")
+        prompt = system_prompt or getattr(inner, "system_prompt", "") or ""
+        self.system_prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+        self.hits = 0
+        self.misses = 0
+        self.personal_lookups = 0
+        self.fallback_skips = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def cache_key(self, user_text: str, question_id: Optional[str], personal: bool,
+                  conversation_id: Optional[str] = None) -> str:
+        parts = [normalize_question(user_text), question_id, self.model, self.system_prompt_hash,
+                 "personal" if personal else "shared", conversation_id if personal else None]
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _plan(self, user_text: str, transcript: Sequence[Message], context: Optional[str]):
+        """(key or None, transcript, context) to send to the inner chatbot."""
+        if not isinstance(context, ChatContext):
+            # Without the orchestrator's metadata we cannot tell what the reply depends on
+            return None, transcript, context
+        if context.shared is not None and not needs_personal_context(user_text, transcript):
+            return self.cache_key(user_text, context.question_id, False), [], context.shared
+        if context.conversation_id is None:
+            return None, transcript, context
+        self.personal_lookups += 1
+        return self.cache_key(user_text, context.question_id, True, context.conversation_id), transcript, context
+
+    def _lookup(self, key: Optional[str]) -> Optional[str]:
+        if key is None:
+            return None
+        cached = self.cache.get(key)
+        if cached is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return cached
+
+    def _store(self, key: Optional[str], answer: str) -> None:
+        if key is None or not answer:
+            return
+        model = answered_by.get()
+        if model is not None and model != self.model:
+            self.fallback_skips += 1
+            return
+        self.cache.put(key, answer)
+
+    def answer(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None) -> str:
+        key, transcript, context = self._plan(user_text, transcript, context)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        answered_by.set(None)
+        answer = self.inner.answer(user_text=user_text, transcript=transcript, context=context)
+        self._store(key, answer)
+        return answer
+
+    def answer_stream(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None) -> Iterator[str]:
+        key, transcript, context = self._plan(user_text, transcript, context)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+        answered_by.set(None)  # set again by a routed client (see _store)
+        if not isinstance(self.inner, IStreamingChatbot):
+            answer = self.inner.answer(user_text=user_text, transcript=transcript, context=context)
+            self._store(key, answer)
+            yield answer
+            return
+
+        parts = []
+        for token in self.inner.answer_stream(user_text=user_text, transcript=transcript, context=context):
+            parts.append(token)
+            yield token
+        # Only a stream that ran to the end is cached
+        answer = "".join(parts)
+        self._store(key, answer)
@@ -0,0 +1,148 @@
+'''What: A local embedding index over the clinic's FAQ and past clinician-approved chatbot answers.
+Why: Most patient questions have a vetted answer already; finding it by meaning takes milliseconds, while
+generating a new reply takes seconds. OllamaChatbot(faq_index=...) uses it for exact answers and for RAG.
+
+Embeddings come from Ollama's /api/embed in batches and are stored as a float32 file that is memory-mapped
+on startup, so a restart only embeds entries whose text changed. Search is brute force (one matrix-vector
+product over unit vectors): for a few thousand FAQ entries that is well under a millisecond, so an
+approximate structure such as HNSW would add build time and recall loss without a visible gain.
+
+Usage (from the Morton folder):
+    index = FaqIndex.open("data/faq_index", load_corpus("data/faq.json", "data/approved_answers.jsonl"))
+    chatbot = OllamaChatbot(model=model, faq_index=index)'''
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.adapters.ollama_http import DEFAULT_BASE_URL, OllamaClient, get_client
+from app.interfaces.retriever import IRetriever, RetrievedPassage
+
+
+def load_corpus(faq_path: str, approved_path: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    FAQ entries ({"question", "answer"} list under "faq" in a JSON file) plus, if the file exists,
+    approved chatbot answers (one {"question", "answer"} object per line).
+    """
+    with open(faq_path, "r", encoding="utf-8") as f:
+        entries = [{**e, "source": "faq"} for e in json.load(f)["faq"]]
+    if approved_path and os.path.exists(approved_path):
+        with open(approved_path, "r", encoding="utf-8") as f:
+            entries.extend({**json.loads(line), "source": "approved"} for line in f if line.strip())
+    return entries
+
+
+class OllamaEmbedder:
+    """Batched calls to Ollama's /api/embed; returns unit-length float32 rows."""
+
+    def __init__(self, model: str = "nomic-embed-text", base_url: str = DEFAULT_BASE_URL,
+                 batch_size: int = 64, client: Optional[OllamaClient] = None):
+        self.model = model
+        self.batch_size = batch_size
+        self.client = client or get_client(base_url)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = list(texts[start:start + self.batch_size])
+            data = self.client.post_json("/api/embed", {"model": self.model, "input": batch}, timeout=60)
+            rows.extend(data["embeddings"])
+        vectors = np.asarray(rows, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _temp_path(directory: str, name: str) -> str:
+    """A new, empty file in directory for the next version of name."""
+    fd, path = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+    os.close(fd)
+    return path
+
+
+class FaqIndex(IRetriever):
+    """
+    - entries: {"question", "answer", "source"} dicts; the question text is what gets embedded
+    - vectors: (len(entries), dim) float32 unit rows, usually a read-only np.memmap
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]], vectors: np.ndarray, embedder: OllamaEmbedder):
+        self.entries = entries
+        self.vectors = vectors
+        self.embedder = embedder
+
+    @classmethod
+    def open(cls, index_dir: str, entries: List[Dict[str, Any]], embedder: Optional[OllamaEmbedder] = None) -> "FaqIndex":
+        """
+        Load the persisted index, embedding only the entries that are new or changed since it was written.
+        Files: <index_dir>/vectors.f32 (raw rows) and <index_dir>/index.json (model, dim, per-row text hash).
+        """
+        embedder = embedder or OllamaEmbedder()
+        os.makedirs(index_dir, exist_ok=True)
+        meta_path = os.path.join(index_dir, "index.json")
+        data_path = os.path.join(index_dir, "vectors.f32")
+
+        if not entries:
+            return cls([], np.zeros((0, 1), dtype=np.float32), embedder)
+        hashes = [_text_hash(e["question"]) for e in entries]
+        old: Dict[str, int] = {}
+        stored = None
+        if os.path.exists(meta_path) and os.path.exists(data_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            # A size mismatch means a crash between the two renames below: rebuild instead of trusting it
+            if (meta.get("model") == embedder.model and meta["rows"]
+                    and os.path.getsize(data_path) == meta["rows"] * meta["dim"] * 4):
+                stored = np.memmap(data_path, dtype=np.float32, mode="r", shape=(meta["rows"], meta["dim"]))
+                old = {h: i for i, h in enumerate(meta["hashes"])}
+                if hashes == meta["hashes"]:
+                    return cls(entries, stored, embedder)  # unchanged corpus: no embedding calls at all
+
+        missing = [i for i, h in enumerate(hashes) if h not in old]
+        fresh = embedder.embed([entries[i]["question"] for i in missing]) if missing else None
+        dim = stored.shape[1] if stored is not None else fresh.shape[1]
+        vectors = np.empty((len(entries), dim), dtype=np.float32)
+        for i, h in enumerate(hashes):
+            if h in old:
+                vectors[i] = stored[old[h]]
+        if missing:
+            vectors[missing] = fresh
+        del stored
+
+        # Write next to the old files and swap, so a crash never leaves a half-written index; the temporary
+        # names are unique, so two processes opening the same index never write into each other's files
+        data_tmp = _temp_path(index_dir, "vectors.f32")
+        meta_tmp = _temp_path(index_dir, "index.json")
+        try:
+            vectors.tofile(data_tmp)
+            with open(meta_tmp, "w", encoding="utf-8") as f:
+                json.dump({"model": embedder.model, "dim": dim, "rows": len(entries), "hashes": hashes}, f)
+            os.replace(data_tmp, data_path)
+            os.replace(meta_tmp, meta_path)
+        finally:
+            for path in (data_tmp, meta_tmp):
+                if os.path.exists(path):
+                    os.remove(path)
+        return cls(entries, np.memmap(data_path, dtype=np.float32, mode="r", shape=vectors.shape), embedder)
+
+    def search_vector(self, query: np.ndarray, k: int = 3) -> List[RetrievedPassage]:
+        if not len(self.entries):
+            return []
+        scores = self.vectors @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [RetrievedPassage(question=self.entries[i]["question"], answer=self.entries[i]["answer"],
+                                 score=float(scores[i]), source=self.entries[i].get("source", "faq"))
+                for i in top]
+
+    def search(self, query: str, k: int = 3) -> List[RetrievedPassage]:
+        return self.search_vector(self.embedder.embed([query])[0], k)
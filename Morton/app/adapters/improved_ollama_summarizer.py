@@ -1,17 +1,200 @@
 from __future__ import annotations
 import json
-import requests
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
 
-from app.interfaces.summarizer import ISummarizer
+from app.interfaces.summarizer import IIncrementalSummarizer
 from app.domain.models import Message, Role
+from app.adapters.ollama_http import OllamaClient, get_client
+from app.adapters.prompt_budget import estimate_tokens
 
-class OllamaSummarizer(ISummarizer):
+
+def fmt_message(m: Message) -> str:
+    return f"{m.role.value.upper()}: {m.content}"
+
+
+def build_summary_messages(transcript: Sequence[Message]) -> List[Dict[str, str]]:
+    """Prompt for one structured-output summary call (shared by the sync and async summarizers)."""
+
+    # Convert transcript to compact text
+    transcript_text = "\n".join(fmt_message(m) for m in transcript)
+
+    # System prompt - simpler now since Ollama enforces structure
+    system_prompt = (
+        "You are a clinical summarization assistant. "
+        "Extract and summarize the relevant medical information from the transcript. "
+        "The output will automatically be formatted as valid JSON matching the required schema."
+    )
+
+    user_prompt = (
+        "Summarize the following medical questionnaire transcript.\n\n"
+        "Transcript:\n"
+        f"{transcript_text}\n"
+    )
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def split_on_questions(transcript: Sequence[Message]) -> List[List[Message]]:
+    """
+    Cut the transcript where a new standardized question is asked, so each block holds one question,
+    its answer and any chat detour in between. Re-asks of the same question stay in the current block.
+    """
+    blocks: List[List[Message]] = []
+    current: List[Message] = []
+    current_qid = None
+    for m in transcript:
+        qid = (m.meta or {}).get("question_id")
+        if qid is not None and qid != current_qid and current:
+            blocks.append(current)
+            current = []
+        if qid is not None:
+            current_qid = qid
+        current.append(m)
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def chunk_transcript(transcript: Sequence[Message], max_tokens: int) -> List[List[Message]]:
+    """
+    Pack whole question blocks into chunks of at most max_tokens (estimated).
+    A single block over the budget is split between messages.
+    """
+    chunks: List[List[Message]] = []
+    current: List[Message] = []
+    used = 0
+
+    def add(m: Message, cost: int) -> None:
+        nonlocal current, used
+        if current and used + cost > max_tokens:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(m)
+        used += cost
+
+    for block in split_on_questions(transcript):
+        costs = [estimate_tokens(fmt_message(m)) + 1 for m in block]
+        total = sum(costs)
+        if current and used + total > max_tokens:
+            chunks.append(current)
+            current, used = [], 0
+        for m, cost in zip(block, costs):
+            add(m, cost)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def partial_schema(schema: Any) -> Any:
+    """The summary schema with every "required" dropped: a chunk only reports what it actually contains."""
+    if isinstance(schema, dict):
+        return {k: partial_schema(v) for k, v in schema.items() if k != "required"}
+    if isinstance(schema, list):
+        return [partial_schema(v) for v in schema]
+    return schema
+
+
+def build_partial_messages(chunk: Sequence[Message], part: int, parts: int) -> List[Dict[str, str]]:
+    """Map step: extract the facts from one part of the interview."""
+    transcript_text = "\n".join(fmt_message(m) for m in chunk)
+    system_prompt = (
+        "You are a clinical summarization assistant. "
+        "You are given one part of a longer medical questionnaire transcript. "
+        "Extract only the medical information stated in this part; leave out anything it does not mention. "
+        "The output will automatically be formatted as valid JSON matching the required schema."
+    )
+    user_prompt = (
+        f"Transcript part {part} of {parts}:\n"
+        f"{transcript_text}\n"
+    )
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def build_reduce_messages(partials: Sequence[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Reduce step: merge the partial extractions (in transcript order) into one summary."""
+    parts_text = "\n".join(f"Part {i}: {json.dumps(p, ensure_ascii=False)}" for i, p in enumerate(partials, 1))
+    system_prompt = (
+        "You are a clinical summarization assistant. "
+        "Merge partial summaries of consecutive parts of one medical questionnaire into a single summary. "
+        "Combine lists without duplicates; when parts disagree, prefer the later part. "
+        "The output will automatically be formatted as valid JSON matching the required schema."
+    )
+    user_prompt = (
+        "Partial summaries, in transcript order:\n"
+        f"{parts_text}\n"
+    )
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def build_update_messages(summary: Optional[Dict[str, Any]], new_messages: Sequence[Message]) -> List[Dict[str, str]]:
+    """Incremental step: ask only for what the latest exchange adds to or changes in the running summary."""
+    transcript_text = "\n".join(fmt_message(m) for m in new_messages)
+    system_prompt = (
+        "You are a clinical summarization assistant keeping a running summary of a medical questionnaire. "
+        "Given the current summary and new transcript lines, return ONLY the fields the new lines add or change; "
+        "leave out everything else. List fields contain only new items. "
+        "The output will automatically be formatted as valid JSON matching the required schema."
+    )
+    user_prompt = (
+        f"Current summary:\n{json.dumps(summary or {}, ensure_ascii=False)}\n\n"
+        "New transcript lines:\n"
+        f"{transcript_text}\n"
+    )
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def merge_patch(summary: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply an update: objects merge key by key, lists gain the items they do not have yet, values are replaced."""
+    out = dict(summary)
+    for key, value in patch.items():
+        old = out.get(key)
+        if isinstance(old, dict) and isinstance(value, dict):
+            out[key] = merge_patch(old, value)
+        elif isinstance(old, list) and isinstance(value, list):
+            out[key] = old + [v for v in value if v not in old]
+        elif value is not None and value != "":
+            out[key] = value
+    return out
+
+
+def parse_summary(raw: str) -> Dict[str, Any]:
+    # Ollama guarantees valid JSON matching the schema
+    try:
+        data = json.loads(raw)
+        return data
+    except json.JSONDecodeError as e:
+        # This should rarely happen with native structured outputs
+        # but keep as safeguard
+        raise ValueError(
+            f"Ollama returned invalid JSON despite schema constraint. "
+            f"Error: {e}\nOutput: {raw}"
+        )
+
+
+class OllamaSummarizer(IIncrementalSummarizer):
     """
     Simplified summarizer using Ollama's native structured output support.
 
     Ollama's 'format' parameter constrains the model to output valid JSON
     matching the schema, eliminating most retry logic.
+
+    Chunked (map-reduce) mode, for interviews too long for one prompt:
+    - chunk_tokens: estimated prompt budget per chunk; None = always one call.
+      Transcripts that fit in one chunk still use the single call.
+    - max_parallel: how many chunk extractions may run at once (match OLLAMA_NUM_PARALLEL).
     """
 
     def __init__(
@@ -19,10 +202,16 @@ class OllamaSummarizer(ISummarizer):
             model: str = "llama3.1",
             base_url: str = "http://localhost:11434",
             timeout_s: int = 120,
+            client: Optional[OllamaClient] = None,
+            chunk_tokens: Optional[int] = None,
+            max_parallel: int = 1,
     ):
         self.model = model
         self.base_url = base_url.rstrip("/")
+        self.client = client or get_client(self.base_url)
         self.timeout_s = timeout_s
+        self.chunk_tokens = chunk_tokens
+        self.max_parallel = max_parallel
 
     def _ollama_chat(self, messages: List[Dict[str, str]], schema: Dict[str, Any]) -> str:
         """
@@ -34,58 +223,46 @@ class OllamaSummarizer(ISummarizer):
         payload = {
             "model": self.model,
             "messages": messages,
-            "stream": False,
             "format": schema  # Native structured output support
         }
 
-        r = requests.post(
-            f"{self.base_url}/api/chat",
-            json=payload,
-            timeout=self.timeout_s
-        )
-        r.raise_for_status()
-        return r.json()["message"]["content"]
+        return self.client.chat(payload, timeout=self.timeout_s)["message"]["content"]
 
-    def summarize(self, transcript: List[Message], schema: Dict[str, Any]) -> Dict[str, Any]:
+    def summarize(self, transcript: Sequence[Message], schema: Dict[str, Any]) -> Dict[str, Any]:
+        if self.chunk_tokens:
+            chunks = chunk_transcript(transcript, self.chunk_tokens)
+            if len(chunks) > 1:
+                return self._summarize_chunked(chunks, schema)
 
-        # Convert transcript to compact text
-        def fmt(m: Message) -> str:
-            return f"{m.role.value.upper()}: {m.content}"
+        messages = build_summary_messages(transcript)
 
-        transcript_text = "\n".join(fmt(m) for m in transcript)
+        # Single call - no retry loop needed!
+        raw = self._ollama_chat(messages, schema)
 
-        # System prompt - simpler now since Ollama enforces structure
-        system_prompt = (
-            "You are a clinical summarization assistant. "
-            "Extract and summarize the relevant medical information from the transcript. "
-            "The output will automatically be formatted as valid JSON matching the required schema."
-        )
+        return parse_summary(raw)
 
-        user_prompt = (
-            "Summarize the following medical questionnaire transcript.\n\n"
-            "Transcript:\n"
-            f"{transcript_text}\n"
-        )
+    def _summarize_chunked(self, chunks: List[List[Message]], schema: Dict[str, Any]) -> Dict[str, Any]:
+        part_schema = partial_schema(schema)
 
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ]
+        def extract(i: int) -> Dict[str, Any]:
+            messages = build_partial_messages(chunks[i], i + 1, len(chunks))
+            return parse_summary(self._ollama_chat(messages, part_schema))
 
-        # Single call - no retry loop needed!
-        raw = self._ollama_chat(messages, schema)
+        if self.max_parallel > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_parallel, len(chunks))) as pool:
+                partials = list(pool.map(extract, range(len(chunks))))
+        else:
+            partials = [extract(i) for i in range(len(chunks))]
+
+        return parse_summary(self._ollama_chat(build_reduce_messages(partials), schema))
 
-        # Ollama guarantees valid JSON matching the schema
-        try:
-            data = json.loads(raw)
-            return data
-        except json.JSONDecodeError as e:
-            # This should rarely happen with native structured outputs
-            # but keep as safeguard
-            raise ValueError(
-                f"Ollama returned invalid JSON despite schema constraint. "
-                f"Error: {e}\nOutput: {raw}"
-            )
+    def update(self, summary: Optional[Dict[str, Any]], new_messages: Sequence[Message], schema: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        One small call per turn (used by app/application/running_summary.py): the model writes a sparse
+        patch against the schema with nothing required, so output stays short however long the summary gets.
+        """
+        patch = parse_summary(self._ollama_chat(build_update_messages(summary, new_messages), partial_schema(schema)))
+        return merge_patch(summary or {}, patch)
 
 
 # COMPARISON: Old approach with manual retries
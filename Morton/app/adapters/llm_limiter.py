@@ -0,0 +1,70 @@
+'''What: Cap how many LLM calls are in flight at once, and queue the rest.
+Why: A traffic burst should wait its turn instead of piling hundreds of parallel generations onto one Ollama server.'''
+
+from __future__ import annotations
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+
+from app.domain.models import Message
+from app.interfaces.chatbot import IAsyncChatbot, IAsyncStreamingChatbot
+from app.interfaces.summarizer import IAsyncSummarizer
+
+
+class LlmBusyError(RuntimeError):
+    """Raised when the wait queue is full (only if max_waiting is set)."""
+
+
+class LlmLimiter:
+    def __init__(self, max_concurrent: int = 4, max_waiting: Optional[int] = None):
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self._sem = asyncio.Semaphore(max_concurrent)
+        self.waiting = 0
+        self.running = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self.max_waiting is not None and self._sem.locked() and self.waiting >= self.max_waiting:
+            raise LlmBusyError("Too many LLM requests queued; try again shortly.")
+        self.waiting += 1
+        try:
+            await self._sem.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._sem.release()
+
+
+class LimitedChatbot(IAsyncStreamingChatbot):
+    """Wraps an async chatbot so every call (including a whole stream) holds one limiter slot."""
+
+    def __init__(self, chatbot: IAsyncChatbot, limiter: LlmLimiter):
+        self.chatbot = chatbot
+        self.limiter = limiter
+
+    async def answer(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None) -> str:
+        async with self.limiter.slot():
+            return await self.chatbot.answer(user_text=user_text, transcript=transcript, context=context)
+
+    async def answer_stream(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None) -> AsyncIterator[str]:
+        async with self.limiter.slot():
+            if isinstance(self.chatbot, IAsyncStreamingChatbot):
+                async for token in self.chatbot.answer_stream(user_text=user_text, transcript=transcript, context=context):
+                    yield token
+            else:
+                yield await self.chatbot.answer(user_text=user_text, transcript=transcript, context=context)
+
+
+class LimitedSummarizer(IAsyncSummarizer):
+    def __init__(self, summarizer: IAsyncSummarizer, limiter: LlmLimiter):
+        self.summarizer = summarizer
+        self.limiter = limiter
+
+    async def summarize(self, transcript: Sequence[Message], schema: Dict[str, Any]) -> Dict[str, Any]:
+        async with self.limiter.slot():
+            return await self.summarizer.summarize(transcript=transcript, schema=schema)
@@ -0,0 +1,248 @@
+'''What: Pick the Ollama model per task (chat, slot extraction, summarization, language) from data/models.json,
+keep those models loaded (Ollama keep_alive), load them before the first patient needs them, and send a request
+to a fallback model when the primary cannot take it (Ollama unreachable, or the model missing or failing to load).
+Why: Every adapter hard-coded llama3.1 (and the ToGood2Go scripts other models), so a quick chat reply paid
+for the big summarization model, and a cold model load (seconds to tens of seconds) landed on whichever turn
+came first after startup or after Ollama unloaded an idle model (5 minutes by default).
+
+There is no fallback on a timeout: a primary that timed out may still be generating (Ollama does not stop
+when the client goes away), so a second request would double the work on the server that is already behind.
+
+Adapters keep their own payloads; they get a routed client instead of the shared one:
+    router = ModelRouter.from_file("data/models.json")
+    chatbot = OllamaChatbot(model=router.model("chat"), client=router.client("chat", client))
+    threading.Thread(target=router.prewarm, args=(client,), daemon=True).start()'''
+
+from __future__ import annotations
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import aiohttp
+import requests
+
+from app.adapters.ollama_http import OllamaClient, Timeout, not_connected
+from app.adapters.ollama_http_async import OllamaHTTPError
+
+TASKS = ("chat", "slot_extraction", "summarization", "language")
+DEFAULT_KEEP_ALIVE = "30m"
+
+KeepAlive = Union[str, int, float]
+
+# The model a routed client last sent a chat to in this thread / asyncio task, primary or fallback.
+# Callers that keep replies per model (CachedChatbot) set it to None before a call and read it after.
+answered_by: ContextVar[Optional[str]] = ContextVar("answered_by", default=None)
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    model: str
+    fallback: Optional[str] = None      # used when the primary cannot take the request (see _primary_refused)
+    timeout_s: Optional[float] = None   # read timeout for the primary (first byte when streaming); None = caller's
+    keep_alive: Optional[KeepAlive] = DEFAULT_KEEP_ALIVE  # Ollama duration ("30m", seconds, -1 = forever)
+
+
+class ModelRouter:
+    def __init__(self, routes: Dict[str, ModelRoute], prewarm_tasks: Sequence[str] = ()):
+        unknown = [t for t in list(routes) + list(prewarm_tasks) if t not in TASKS]
+        if unknown:
+            raise ValueError(f"Unknown task(s) {unknown}; expected one of {TASKS}")
+        self.routes = dict(routes)
+        self.prewarm_tasks = tuple(prewarm_tasks)
+
+    @classmethod
+    def from_file(cls, path: str = "data/models.json") -> "ModelRouter":
+        """
+        {"keep_alive": "30m", "prewarm": ["chat", ...],
+         "tasks": {"chat": {"model": ..., "fallback": ..., "timeout_s": ..., "keep_alive": ...}, ...}}
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        keep_alive = raw.get("keep_alive", DEFAULT_KEEP_ALIVE)
+        routes = {task: ModelRoute(**{"keep_alive": keep_alive, **spec}) for task, spec in raw["tasks"].items()}
+        return cls(routes, raw.get("prewarm", ()))
+
+    @classmethod
+    def single(cls, model: str, keep_alive: Optional[KeepAlive] = DEFAULT_KEEP_ALIVE) -> "ModelRouter":
+        """Every task on one model (what the adapters did before routing)."""
+        route = ModelRoute(model, keep_alive=keep_alive)
+        return cls({task: route for task in TASKS}, ("chat",))
+
+    def route(self, task: str) -> ModelRoute:
+        try:
+            return self.routes[task]
+        except KeyError:
+            raise ValueError(f"No model configured for task {task!r}") from None
+
+    def model(self, task: str) -> str:
+        return self.route(task).model
+
+    def models(self, tasks: Optional[Iterable[str]] = None) -> List[str]:
+        """Distinct primary models of these tasks (default: the configured prewarm tasks), in order."""
+        out: List[str] = []
+        for task in (self.prewarm_tasks if tasks is None else tasks):
+            model = self.route(task).model
+            if model not in out:
+                out.append(model)
+        return out
+
+    def client(self, task: str, client: OllamaClient) -> "RoutedClient":
+        return RoutedClient(client, self.route(task))
+
+    def async_client(self, task: str, client) -> "AsyncRoutedClient":
+        return AsyncRoutedClient(client, self.route(task))
+
+    # --- prewarming: an empty /api/chat loads the model and returns, nothing is generated ---
+
+    def _load_payload(self, model: str) -> Dict[str, Any]:
+        keep_alive = next((r.keep_alive for r in self.routes.values() if r.model == model), DEFAULT_KEEP_ALIVE)
+        payload: Dict[str, Any] = {"model": model, "messages": []}
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        return payload
+
+    def prewarm(self, client: OllamaClient, tasks: Optional[Iterable[str]] = None,
+                timeout_s: float = 300) -> Dict[str, float]:
+        """Load the models in parallel (Ollama queues what does not fit); returns seconds per model, -1 on error."""
+        def load(model: str) -> float:
+            t0 = time.perf_counter()
+            try:
+                client.chat(self._load_payload(model), timeout=timeout_s)
+            except (requests.RequestException, RuntimeError):
+                return -1.0
+            return time.perf_counter() - t0
+
+        models = self.models(tasks)
+        if not models:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(models)) as pool:
+            return dict(zip(models, pool.map(load, models)))
+
+    async def aprewarm(self, client, tasks: Optional[Iterable[str]] = None, timeout_s: float = 300) -> Dict[str, float]:
+        """prewarm() for AsyncOllamaClient."""
+        async def load(model: str) -> float:
+            t0 = time.perf_counter()
+            try:
+                await client.chat(self._load_payload(model), timeout=timeout_s)
+            except (OSError, asyncio.TimeoutError, RuntimeError):
+                return -1.0
+            return time.perf_counter() - t0
+
+        models = self.models(tasks)
+        return dict(zip(models, await asyncio.gather(*(load(m) for m in models))))
+
+
+def _with_model(payload: Dict[str, Any], model: str, keep_alive: Optional[KeepAlive]) -> Dict[str, Any]:
+    out = {**payload, "model": model}
+    if keep_alive is not None:
+        out["keep_alive"] = keep_alive
+    return out
+
+
+def _primary_refused(exc: Exception) -> bool:
+    """True when the primary never started on the request: no connection was made (after OllamaClient's own
+    retries) or Ollama answered with an error status, e.g. the model is not pulled or does not fit in memory."""
+    if isinstance(exc, requests.HTTPError):
+        return True
+    return isinstance(exc, requests.ConnectionError) and not_connected(exc)
+
+
+class RoutedClient:
+    """
+    OllamaClient look-alike for one task: sets the route's model and keep_alive on every call (whatever model
+    the adapter put in the payload), and when the primary cannot take the request (_primary_refused), sends it
+    to the fallback model instead. A stream only falls back before its first chunk.
+    """
+
+    def __init__(self, client: OllamaClient, route: ModelRoute):
+        self.client = client
+        self.route = route
+        self.fallbacks = 0
+
+    def _primary_timeout(self, timeout: Optional[Timeout]) -> Optional[Timeout]:
+        return self.route.timeout_s if self.route.timeout_s is not None else timeout
+
+    def chat(self, payload: Dict[str, Any], timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        route = self.route
+        answered_by.set(route.model)
+        try:
+            return self.client.chat(_with_model(payload, route.model, route.keep_alive), self._primary_timeout(timeout))
+        except (requests.ConnectionError, requests.HTTPError) as e:
+            if route.fallback is None or not _primary_refused(e):
+                raise
+        self.fallbacks += 1
+        answered_by.set(route.fallback)
+        return self.client.chat(_with_model(payload, route.fallback, route.keep_alive), timeout)
+
+    def chat_stream(self, payload: Dict[str, Any], timeout: Optional[Timeout] = None) -> Iterator[Dict[str, Any]]:
+        route = self.route
+        answered_by.set(route.model)
+        started = False
+        try:
+            for chunk in self.client.chat_stream(_with_model(payload, route.model, route.keep_alive),
+                                                 self._primary_timeout(timeout)):
+                started = True
+                yield chunk
+            return
+        except (requests.ConnectionError, requests.HTTPError) as e:
+            if started or route.fallback is None or not _primary_refused(e):
+                raise
+        self.fallbacks += 1
+        answered_by.set(route.fallback)
+        yield from self.client.chat_stream(_with_model(payload, route.fallback, route.keep_alive), timeout)
+
+    def post_json(self, path: str, payload: Dict[str, Any], timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        return self.client.post_json(path, _with_model(payload, self.route.model, self.route.keep_alive), timeout)
+
+
+# What AsyncOllamaClient raises when the primary never started on the request (as _primary_refused)
+_ASYNC_REFUSED = (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError, OllamaHTTPError)
+
+
+class AsyncRoutedClient:
+    """RoutedClient for AsyncOllamaClient: falls back on a failed connect (after its retries) or an Ollama error status."""
+
+    def __init__(self, client, route: ModelRoute):
+        self.client = client
+        self.route = route
+        self.fallbacks = 0
+
+    def _primary_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        return self.route.timeout_s if self.route.timeout_s is not None else timeout
+
+    async def chat(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        route = self.route
+        answered_by.set(route.model)
+        try:
+            return await self.client.chat(_with_model(payload, route.model, route.keep_alive), self._primary_timeout(timeout))
+        except _ASYNC_REFUSED:
+            if route.fallback is None:
+                raise
+        self.fallbacks += 1
+        answered_by.set(route.fallback)
+        return await self.client.chat(_with_model(payload, route.fallback, route.keep_alive), timeout)
+
+    async def chat_stream(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        route = self.route
+        answered_by.set(route.model)
+        started = False
+        try:
+            async for chunk in self.client.chat_stream(_with_model(payload, route.model, route.keep_alive),
+                                                       self._primary_timeout(timeout)):
+                started = True
+                yield chunk
+            return
+        except _ASYNC_REFUSED:
+            if started or route.fallback is None:
+                raise
+        self.fallbacks += 1
+        answered_by.set(route.fallback)
+        async for chunk in self.client.chat_stream(_with_model(payload, route.fallback, route.keep_alive), timeout):
+            yield chunk
+
+    async def post_json(self, path: str, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        return await self.client.post_json(path, _with_model(payload, self.route.model, self.route.keep_alive), timeout)
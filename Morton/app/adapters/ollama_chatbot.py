@@ -2,14 +2,186 @@
 Why: Keeps your chatbot independent; later you can swap to RAG or another model without touching the orchestrator.'''
 
 from __future__ import annotations
-from typing import List, Optional
-import requests
+import threading
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Sequence, Tuple
 
-from app.interfaces.chatbot import IChatbot
+from app.interfaces.chatbot import IStreamingChatbot
+from app.interfaces.retriever import IRetriever, RetrievedPassage
+from app.adapters.ollama_http import OllamaClient, get_client
+from app.adapters.prompt_budget import RollingSummary, TokenCounter, fill_newest_first
 from app.domain.models import Message, Role
+from app.domain.transcript_view import as_view
 
+DEFAULT_SYSTEM_PROMPT = (
+    "You are a helpful clinical assistant answering a patient's free-form questions during a pre-anesthesia questionnaire. "
+    "Important rules:\n"
+    "1) Only answer the patient's current free-form question.\n"
+    "2) Do NOT repeat, re-ask, or answer the standardized questionnaire questions unless the patient explicitly asks about them.\n"
+    "3) Keep answers short, clear, and non-alarming.\n"
+    "4) If asked for personalized medical advice or urgent symptoms, advise contacting the clinic.\n"
+)
 
-class OllamaChatbot(IChatbot):
+
+HISTORY_SCAN = 64  # transcript messages searched for chat history; the token budget decides what is sent
+
+
+def chat_history(user_text: str, transcript: Sequence[Message], scan: int = HISTORY_SCAN) -> List[Message]:
+    """Chat-mode patient/assistant messages of the recent transcript, minus repeats of the current question."""
+    history = []
+    for m in as_view(transcript).tail(scan):
+        mode = (m.meta or {}).get("mode")
+        if mode != "chat" or m.role not in (Role.PATIENT, Role.ASSISTANT):
+            continue
+        if m.role == Role.PATIENT and m.content.strip() == user_text.strip():
+            continue
+        history.append(m)
+    return history
+
+
+def _ollama_role(m: Message) -> str:
+    return "user" if m.role == Role.PATIENT else "assistant"
+
+
+class _WindowState:
+    __slots__ = ("anchor", "summary")
+
+    def __init__(self, summary: RollingSummary):
+        self.anchor: Optional[Message] = None  # first message in the window
+        self.summary = summary
+
+
+def _anchor_index(history: Sequence[Message], anchor: Message) -> Optional[int]:
+    # The same object when the caller keeps its messages (the orchestrator's chat window). Messages compare by
+    # value, so a reloaded transcript matches by value, but only when that is unambiguous: "ok" twice in the
+    # same second would otherwise put the window start on the wrong one.
+    for i, m in enumerate(history):
+        if m is anchor:
+            return i
+    equal = [i for i, m in enumerate(history) if m == anchor]
+    return equal[0] if len(equal) == 1 else None
+
+
+class HistoryWindow:
+    """
+    Which chat messages go into the prompt: the newest that fit max_tokens (estimated prompt tokens,
+    counted once per message) and max_messages; None = no limit of that kind.
+    A window that slides every turn changes everything after its start, so Ollama can never reuse its
+    cached prompt prefix and re-evaluates the whole history each turn. With stable=True the window start is
+    remembered per conversation and only moves once the window is over budget, then at once down to
+    max_tokens - token_step / max_messages - step (to a patient message): between moves every prompt extends
+    the previous one. The messages a move drops are folded into a rolling summary of at most summary_tokens
+    (summary(); summary_tokens=0 turns it off), which therefore changes only with the window start.
+    """
+
+    def __init__(self, max_messages: Optional[int] = None, max_tokens: Optional[int] = 1024, stable: bool = True,
+                 step: Optional[int] = None, token_step: Optional[int] = None, summary_tokens: int = 128,
+                 counter: Optional[TokenCounter] = None, max_conversations: int = 4096):
+        self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.stable = stable
+        self.step = step if step is not None else max(2, (max_messages or 0) // 2)
+        self.token_step = token_step if token_step is not None else (max_tokens or 0) // 2
+        self.summary_tokens = summary_tokens
+        self.counter = counter or TokenCounter()
+        self.max_conversations = max_conversations
+        self._states: "OrderedDict[str, _WindowState]" = OrderedDict()  # conversation_id -> window start, summary
+        self._lock = threading.Lock()
+
+    def _fill(self, history: Sequence[Message], shrink: bool = False) -> int:
+        max_messages, max_tokens = self.max_messages, self.max_tokens
+        if shrink:
+            max_messages = max(1, max_messages - self.step) if max_messages is not None else None
+            max_tokens = max_tokens - self.token_step if max_tokens is not None else None
+        return fill_newest_first([m.content for m in history], max_tokens, self.counter, max_messages)
+
+    def select(self, conversation_id: Optional[str], history: Sequence[Message]) -> Sequence[Message]:
+        if not self.stable or conversation_id is None:
+            return history[self._fill(history):]
+        with self._lock:
+            state = self._states.get(conversation_id)
+            if state is None:
+                state = self._states[conversation_id] = _WindowState(RollingSummary(self.summary_tokens, self.counter))
+            self._states.move_to_end(conversation_id)
+            while len(self._states) > self.max_conversations:
+                self._states.popitem(last=False)
+
+            fits = self._fill(history)
+            anchor = state.anchor
+            start = _anchor_index(history, anchor) if anchor is not None else None
+            if start is None:  # first turn in this process, or the anchor left the transcript window (or is ambiguous)
+                start, dropped = fits, history[:fits]
+            elif start < fits:
+                new_start = self._fill(history, shrink=True)
+                while new_start < len(history) - 1 and history[new_start].role != Role.PATIENT:
+                    new_start += 1
+                start, dropped = new_start, history[start:new_start]
+            else:
+                dropped = ()
+            if dropped and self.summary_tokens > 0:
+                state.summary.fold((_ollama_role(m), m.content) for m in dropped)
+            if start < len(history):
+                state.anchor = history[start]
+            return history[start:]
+
+    def summary(self, conversation_id: Optional[str]) -> Optional[str]:
+        """Rolling summary of the chat before the window (None without one)."""
+        if conversation_id is None:
+            return None
+        with self._lock:
+            state = self._states.get(conversation_id)
+            return state.summary.text if state is not None else None
+
+    def forget(self, conversation_id: str) -> None:
+        with self._lock:
+            self._states.pop(conversation_id, None)
+
+
+def build_chat_messages(system_prompt: str, user_text: str, transcript: Sequence[Message], context: Optional[str] = None,
+                        passages: Sequence[RetrievedPassage] = (), history: Optional[Sequence[Message]] = None,
+                        summary: Optional[str] = None) -> List[dict]:
+    """
+    Ollama message list for one chat turn (shared by the sync and async chatbots).
+    Ordered by how often each part changes, so consecutive turns of a conversation share a prompt prefix that
+    Ollama does not evaluate again: system prompt (never), questionnaire context (on answers, not on chat
+    turns), summary of the earlier chat and chat history (append-only between HistoryWindow steps), then what
+    changes every turn - retrieved passages and the new question.
+    - history: the chat messages to include (HistoryWindow.select); default the last 10 of the transcript
+    - summary: what came before them (HistoryWindow.summary)
+    """
+    if history is None:
+        history = chat_history(user_text, transcript)[-10:]
+
+    messages = [{"role": "system", "content": system_prompt}]
+
+    # Add questionnaire context (NOT dialogue)
+    if context:
+        messages.append({"role": "system", "content": f"Questionnaire context: {context}"})
+
+    if summary:
+        messages.append({"role": "system", "content": summary})
+
+    for m in history:
+        messages.append({"role": _ollama_role(m), "content": m.content})
+
+    # Retrieved clinic-approved material (RAG); the model should prefer it over its own knowledge
+    if passages:
+        faq = "\n".join(f"- Q: {p.question}\n  A: {p.answer}" for p in passages)
+        messages.append({"role": "system", "content": f"Clinic-approved information (use it when relevant):\n{faq}"})
+
+    messages.append({"role": "user", "content": user_text})
+    return messages
+
+
+def split_hits(hits: Sequence[RetrievedPassage], answer_threshold: float,
+               min_score: float) -> Tuple[Optional[str], List[RetrievedPassage]]:
+    """(vetted answer if the best hit reaches answer_threshold, else None; passages for the prompt)."""
+    if hits and hits[0].score >= answer_threshold:
+        return hits[0].answer, []
+    return None, [h for h in hits if h.score >= min_score]
+
+
+class OllamaChatbot(IStreamingChatbot):
     """
     Minimal Ollama chat adapter using HTTP.
     Assumes Ollama is running locally: http://localhost:11434
@@ -20,50 +192,69 @@ class OllamaChatbot(IChatbot):
         base_url: str = "http://localhost:11434",
         system_prompt: Optional[str] = None,
         timeout_s: int = 60,
+        client: Optional[OllamaClient] = None,
+        faq_index: Optional[IRetriever] = None,
+        faq_answer_threshold: float = 0.9,
+        rag_k: int = 3,
+        rag_min_score: float = 0.5,
+        max_history: Optional[int] = None,
+        history_tokens: Optional[int] = 1024,
+        summary_tokens: int = 128,
+        stable_history: bool = True,
+        token_counter: Optional[TokenCounter] = None,
     ):
         self.model = model
         self.base_url = base_url.rstrip("/")
-        self.system_prompt = system_prompt or (
-            "You are a helpful clinical assistant answering a patient's free-form questions during a pre-anesthesia questionnaire. "
-            "Important rules:\n"
-            "1) Only answer the patient's current free-form question.\n"
-            "2) Do NOT repeat, re-ask, or answer the standardized questionnaire questions unless the patient explicitly asks about them.\n"
-            "3) Keep answers short, clear, and non-alarming.\n"
-            "4) If asked for personalized medical advice or urgent symptoms, advise contacting the clinic.\n"
-        )
+        self.client = client or get_client(self.base_url)
+        self.system_prompt = system_prompt or DEFAULT_SYSTEM_PROMPT
         self.timeout_s = timeout_s
+        # Optional FAQ retrieval (app/adapters/faq_index.py): a match above faq_answer_threshold is returned as is,
+        # otherwise up to rag_k passages scoring at least rag_min_score go into the prompt
+        self.faq_index = faq_index
+        self.faq_answer_threshold = faq_answer_threshold
+        self.rag_k = rag_k
+        self.rag_min_score = rag_min_score
+        # Chat history in the prompt: the newest messages within history_tokens (and max_history), older ones
+        # as a summary of at most summary_tokens; stable_history keeps the prompt prefix cacheable (HistoryWindow)
+        self.history = HistoryWindow(max_history, history_tokens, stable=stable_history,
+                                     summary_tokens=summary_tokens, counter=token_counter)
 
-    def answer(self, user_text: str, transcript: List[Message], context: Optional[str] = None) -> str:
-        chat_context = []
-
-        for m in transcript[-30:]:
-            mode = (m.meta or {}).get("mode")
-            if m.role == Role.PATIENT and mode == "chat":
-                if m.content.strip() == user_text.strip():
-                    continue
-                chat_context.append(("user", m.content))
-            elif m.role == Role.ASSISTANT and mode == "chat":
-                chat_context.append(("assistant", m.content))
-
-        # Build messages
-        messages = [{"role": "system", "content": self.system_prompt}]
-
-        # Add questionnaire context (NOT dialogue)
-        if context:
-            messages.append({"role": "system", "content": f"Questionnaire context: {context}"})
+    def _retrieve(self, user_text: str) -> Tuple[Optional[str], List[RetrievedPassage]]:
+        """(vetted answer or None, passages for the prompt)."""
+        if self.faq_index is None:
+            return None, []
+        return split_hits(self.faq_index.search(user_text, k=self.rag_k), self.faq_answer_threshold, self.rag_min_score)
 
-        for role, content in chat_context[-10:]:
-            messages.append({"role": role, "content": content})
+    def _build_messages(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None,
+                        passages: Sequence[RetrievedPassage] = ()) -> List[dict]:
+        cid = getattr(context, "conversation_id", None)
+        history = self.history.select(cid, chat_history(user_text, transcript))
+        return build_chat_messages(self.system_prompt, user_text, transcript, context, passages, history,
+                                   self.history.summary(cid))
 
-        messages.append({"role": "user", "content": user_text})
+    def answer(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None) -> str:
+        vetted, passages = self._retrieve(user_text)
+        if vetted is not None:
+            return vetted
+        messages = self._build_messages(user_text, transcript, context, passages)
+        payload = {"model": self.model, "messages": messages}
+        return self.client.chat(payload, timeout=self.timeout_s)["message"]["content"]
 
-        payload = {"model": self.model, "messages": messages, "stream": False}
-        r = requests.post(f"{self.base_url}/api/chat", json=payload, timeout=self.timeout_s)
-        r.raise_for_status()
-        return r.json()["message"]["content"]
+    def answer_stream(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None) -> Iterator[str]:
+        vetted, passages = self._retrieve(user_text)
+        if vetted is not None:
+            yield vetted
+            return
+        messages = self._build_messages(user_text, transcript, context, passages)
+        payload = {"model": self.model, "messages": messages}
+        # Ollama streams newline-delimited JSON objects; the last one has "done": true
+        for chunk in self.client.chat_stream(payload, timeout=self.timeout_s):
+            token = (chunk.get("message") or {}).get("content", "")
+            if token:
+                yield token
 
     #  --------------------OLD VERSION OF answer function -------------------------------
-    # def answer(self, user_text: str, transcript: List[Message]) -> str:
+    # def answer(self, user_text: str, transcript: Sequence[Message]) -> str:
     #     # Convert transcript (optional) into Ollama messages
     #     messages = [{"role": "system", "content": self.system_prompt}]
     #
@@ -0,0 +1,121 @@
+'''What: One shared HTTP transport for every Ollama call (pooled keep-alive session, timeouts, retries).
+Why: A bare requests.post opens a new TCP connection per turn; reusing connections cuts latency and keeps timeouts consistent.'''
+
+from __future__ import annotations
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+DEFAULT_BASE_URL = "http://localhost:11434"
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+def not_connected(exc: requests.ConnectionError) -> bool:
+    """True when the request failed before a connection was made, so the server never saw it."""
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    reason = exc.args[0] if exc.args else None
+    # requests wraps urllib3's MaxRetryError, whose reason is NewConnectionError (a ConnectTimeoutError)
+    return isinstance(getattr(reason, "reason", reason), ConnectTimeoutError)
+
+
+class OllamaClient:
+    """
+    Thin wrapper around a pooled requests.Session.
+
+    - pool_size: max keep-alive connections kept open to the Ollama server
+    - connect_timeout_s / read_timeout_s: default per-call timeouts
+    - max_retries / backoff_s: retries when no connection could be made (refused, DNS, connect timeout),
+      with exponential backoff. A request that may have been sent - the connection dropped afterwards,
+      or the reply timed out - is never retried (generation is not idempotent).
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        pool_size: int = 10,
+        connect_timeout_s: float = 3.05,
+        read_timeout_s: float = 120,
+        max_retries: int = 3,
+        backoff_s: float = 0.25,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.connect_timeout_s = connect_timeout_s
+        self.read_timeout_s = read_timeout_s
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _timeout(self, timeout: Optional[Timeout]) -> Tuple[float, float]:
+        if timeout is None:
+            return (self.connect_timeout_s, self.read_timeout_s)
+        if isinstance(timeout, tuple):
+            return timeout
+        return (self.connect_timeout_s, float(timeout))
+
+    def _post(self, path: str, payload: Dict[str, Any], timeout: Optional[Timeout], stream: bool) -> requests.Response:
+        url = f"{self.base_url}{path}"
+        attempt = 0
+        while True:
+            try:
+                r = self.session.post(url, json=payload, timeout=self._timeout(timeout), stream=stream)
+                r.raise_for_status()
+                return r
+            except requests.ConnectionError as e:
+                if attempt >= self.max_retries or not not_connected(e):
+                    raise
+                time.sleep(self.backoff_s * (2 ** attempt))
+                attempt += 1
+
+    def post_json(self, path: str, payload: Dict[str, Any], timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        """POST a JSON payload and return the decoded JSON response."""
+        r = self._post(path, payload, timeout, stream=False)
+        return r.json()
+
+    def chat(self, payload: Dict[str, Any], timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        """Non-streaming /api/chat call; returns Ollama's full response object."""
+        return self.post_json("/api/chat", {**payload, "stream": False}, timeout=timeout)
+
+    def chat_stream(self, payload: Dict[str, Any], timeout: Optional[Timeout] = None) -> Iterator[Dict[str, Any]]:
+        """Streaming /api/chat call; yields each NDJSON chunk, ending with the one where done is true."""
+        with self._post("/api/chat", {**payload, "stream": True}, timeout, stream=True) as r:
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(f"Ollama stream error: {chunk['error']}")
+                yield chunk
+                if chunk.get("done"):
+                    break
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_clients: Dict[str, OllamaClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(base_url: str = DEFAULT_BASE_URL, **kwargs: Any) -> OllamaClient:
+    """
+    Return the process-wide client for base_url, creating it on first use.
+    kwargs (pool_size, timeouts, retries) only apply when the client is created.
+    """
+    key = base_url.rstrip("/")
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = OllamaClient(base_url=key, **kwargs)
+            _clients[key] = client
+        return client
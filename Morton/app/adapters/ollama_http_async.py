@@ -0,0 +1,104 @@
+'''What: The asyncio counterpart of ollama_http.OllamaClient, built on aiohttp.
+Why: Lets one event loop keep hundreds of Ollama calls in flight instead of one blocked thread per call.
+(aiohttp rather than httpx: httpx's connection pool slows down sharply with hundreds of open connections.)'''
+
+from __future__ import annotations
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+
+from app.adapters.ollama_http import DEFAULT_BASE_URL
+
+
+class OllamaHTTPError(RuntimeError):
+    """Ollama answered with an error status (unknown model, model failed to load, bad request)."""
+
+    def __init__(self, status: int, body: str):
+        super().__init__(f"Ollama HTTP {status}: {body}")
+        self.status = status
+
+
+class AsyncOllamaClient:
+    """
+    Pooled keep-alive aiohttp session with the same timeout/retry policy as OllamaClient.
+    The session is created lazily inside the running event loop; share one client between adapters.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        pool_size: int = 100,
+        connect_timeout_s: float = 3.05,
+        read_timeout_s: float = 120,
+        max_retries: int = 3,
+        backoff_s: float = 0.25,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.connect_timeout_s = connect_timeout_s
+        self.read_timeout_s = read_timeout_s
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60),
+            )
+        return self._session
+
+    def _timeout(self, timeout: Optional[float]) -> aiohttp.ClientTimeout:
+        # sock_read bounds the gap between bytes, so long streamed answers are fine
+        read = timeout if timeout is not None else self.read_timeout_s
+        return aiohttp.ClientTimeout(total=None, sock_connect=self.connect_timeout_s, sock_read=read)
+
+    async def _request(self, path: str, payload: Dict[str, Any], timeout: Optional[float]) -> aiohttp.ClientResponse:
+        url = f"{self.base_url}{path}"
+        attempt = 0
+        while True:
+            try:
+                r = await self.session.post(url, json=payload, timeout=self._timeout(timeout))
+                if r.status >= 400:
+                    body = await r.text()
+                    r.release()
+                    raise OllamaHTTPError(r.status, body)
+                return r
+            except (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError):
+                # Connect-phase failures only: the request never reached the model
+                if attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(self.backoff_s * (2 ** attempt))
+                attempt += 1
+
+    async def post_json(self, path: str, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """POST a JSON payload and return the decoded JSON response."""
+        r = await self._request(path, payload, timeout)
+        async with r:
+            return await r.json(content_type=None)
+
+    async def chat(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Non-streaming /api/chat call; returns Ollama's full response object."""
+        return await self.post_json("/api/chat", {**payload, "stream": False}, timeout=timeout)
+
+    async def chat_stream(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming /api/chat call; yields each NDJSON chunk, ending with the one where done is true."""
+        r = await self._request("/api/chat", {**payload, "stream": True}, timeout)
+        async with r:
+            async for line in r.content:
+                line = line.strip()
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(f"Ollama stream error: {chunk['error']}")
+                yield chunk
+                if chunk.get("done"):
+                    break
+
+    async def aclose(self) -> None:
+        if self._session is not None:
+            await self._session.close()
@@ -1,13 +1,13 @@
 from __future__ import annotations
 import json
-import requests
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 
 from app.interfaces.summarizer import ISummarizer
 from app.domain.models import Message, Role
-from app.adapters.template_schema import template_to_json_schema
+from app.adapters.schema_registry import SchemaRegistry, default_registry
+from app.adapters.ollama_http import OllamaClient, get_client
 
 
 def _extract_json(text: str) -> str:
@@ -33,20 +33,23 @@ class OllamaSummarizer(ISummarizer):
         base_url: str = "http://localhost:11434",
         timeout_s: int = 120,
         max_retries: int = 2,
+        client: Optional[OllamaClient] = None,
+        schema_registry: Optional[SchemaRegistry] = None,
     ):
         self.model = model
         self.base_url = base_url.rstrip("/")
+        self.client = client or get_client(self.base_url)
         self.timeout_s = timeout_s
         self.max_retries = max_retries
+        self.schemas = schema_registry or default_registry
 
     def _ollama_chat(self, messages: List[Dict[str, str]]) -> str:
-        payload = {"model": self.model, "messages": messages, "stream": False}
-        r = requests.post(f"{self.base_url}/api/chat", json=payload, timeout=self.timeout_s)
-        r.raise_for_status()
-        return r.json()["message"]["content"]
+        payload = {"model": self.model, "messages": messages}
+        return self.client.chat(payload, timeout=self.timeout_s)["message"]["content"]
 
-    def summarize(self, transcript: List[Message], template: Dict[str, Any]) -> Dict[str, Any]:
-        schema = template_to_json_schema(template)
+    def summarize(self, transcript: Sequence[Message], template: Dict[str, Any]) -> Dict[str, Any]:
+        # Derived schema + compiled validator are cached per template document
+        schema, validator = self.schemas.for_template(template)
 
         # Convert transcript to compact text (you can refine this later)
         def fmt(m: Message) -> str:
@@ -80,7 +83,7 @@ class OllamaSummarizer(ISummarizer):
 
             try:
                 data = json.loads(candidate)
-                validate(instance=data, schema=schema)
+                validator.validate(data)
                 return data
             except (json.JSONDecodeError, ValidationError) as e:
                 last_error = str(e)
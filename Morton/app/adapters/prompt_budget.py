@@ -0,0 +1,112 @@
+'''What: Token counts for prompt messages (cached per text), a newest-first fill of a token budget, and a short
+rolling summary of the chat exchanges that no longer fit.
+Why: The chat prompts kept a fixed number of messages (the last 10, ToGood2Go/main.py all of them) whatever
+their length: long answers pushed the prompt past the model's context window, where Ollama silently cuts
+the start of the prompt (system prompt included), and short ones left most of the window unused.'''
+
+from __future__ import annotations
+import re
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+MESSAGE_OVERHEAD = 4  # role header and end-of-turn tokens the chat template adds around every message
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token); close enough to size chunks without a tokenizer."""
+    return len(text) // 4 + 1
+
+
+class TokenCounter:
+    """
+    Tokens per text, cached: a conversation's messages are counted once, not on every turn.
+    - count: text -> tokens; the default estimates. For exact counts pass the model's tokenizer, e.g.
+      TokenCounter(lambda text: len(tokenizer.encode(text))) with a Hugging Face tokenizer of the same model.
+    - max_entries: cached texts kept (least recently used go first)
+    """
+
+    def __init__(self, count: Callable[[str], int] = estimate_tokens, max_entries: int = 100_000):
+        self.count = count
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, text: str) -> int:
+        n = self._cache.get(text)
+        if n is not None:
+            self.hits += 1
+            self._cache.move_to_end(text)
+            return n
+        self.misses += 1
+        n = self._cache[text] = self.count(text)
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return n
+
+    def message(self, content: str) -> int:
+        """Prompt tokens of one chat message with this content."""
+        return self(content) + MESSAGE_OVERHEAD
+
+
+def fill_newest_first(contents: Sequence[str], max_tokens: Optional[int], counter: TokenCounter,
+                      max_messages: Optional[int] = None) -> int:
+    """
+    Index of the oldest message that still fits: contents[start:] holds at most max_tokens (None = no limit)
+    and at most max_messages messages, taken newest first. len(contents) when not even the newest fits.
+    """
+    start, used = len(contents), 0
+    while start > 0:
+        if max_messages is not None and len(contents) - start >= max_messages:
+            break
+        cost = counter.message(contents[start - 1])
+        if max_tokens is not None and used + cost > max_tokens:
+            break
+        used += cost
+        start -= 1
+    return start
+
+
+def _gist(text: str, max_chars: int) -> str:
+    """First sentence of the text, at most max_chars."""
+    text = " ".join(text.split())
+    first = re.split(r"(?<=[.!?])\s", text, maxsplit=1)[0]
+    return first if len(first) <= max_chars else first[:max_chars - 1].rstrip() + "…"
+
+
+class RollingSummary:
+    """
+    Compressed chat exchanges that fell out of the prompt: one line per exchange with the gist (first
+    sentence) of the patient's message and of the reply. The oldest lines go once the summary passes
+    max_tokens. Extractive, so folding costs no LLM call on the chat path.
+    """
+
+    HEADER = "Earlier in this chat (summary, oldest first):"
+
+    def __init__(self, max_tokens: int = 128, counter: Optional[TokenCounter] = None, gist_chars: int = 120):
+        self.max_tokens = max_tokens
+        self.counter = counter or TokenCounter()
+        self.gist_chars = gist_chars
+        self.lines: List[str] = []
+        self._text: Optional[str] = None
+
+    def fold(self, messages: Iterable[Tuple[str, str]]) -> None:
+        """Add (role, content) messages; role is "user" or "assistant", as in an Ollama message list."""
+        for role, content in messages:
+            gist = _gist(content, self.gist_chars)
+            if role == "user" or not self.lines:
+                self.lines.append(f"- Patient: {gist}" if role == "user" else f"- You: {gist}")
+            else:
+                self.lines[-1] += f" / You: {gist}"
+        used = self.counter(self.HEADER) + sum(self.counter(line) for line in self.lines)
+        while len(self.lines) > 1 and used > self.max_tokens:
+            used -= self.counter(self.lines.pop(0))
+        self._text = None
+
+    @property
+    def text(self) -> Optional[str]:
+        if not self.lines:
+            return None
+        if self._text is None:
+            self._text = "\n".join([self.HEADER, *self.lines])
+        return self._text
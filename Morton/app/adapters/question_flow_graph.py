@@ -0,0 +1,91 @@
+'''What: A question flow that follows conditions between questions ("only ask about complications if q4 == yes").
+Why: JsonQuestionFlow asks every question in order. Here questions.json is compiled once into a QuestionGraph
+(app/domain/question_graph.py), so picking the next question and checking completeness stay O(1) per turn
+however long the questionnaire gets. Without any "when" it asks exactly what JsonQuestionFlow asks.
+
+Example question: { "id": "q4a", "text": "Did you have any complications?", "type": "free_text",
+                    "required": true, "when": { "q4": "yes" } }'''
+
+from __future__ import annotations
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+from app.domain.models import Conversation, Question
+from app.domain.question_graph import FlowCursor, QuestionGraph
+from app.interfaces.question_flow import IQuestionFlow
+
+
+class GraphQuestionFlow(IQuestionFlow):
+    """
+    - max_cursors: conversations whose cursor is kept in memory (least recently used go first; an evicted
+      one is rebuilt from conv.question_index and conv.answers on its next turn)
+    """
+
+    def __init__(self, questions_path: str, max_cursors: int = 10_000):
+        with open(questions_path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        q_list = raw["questions"] if isinstance(raw, dict) and "questions" in raw else raw
+        self.graph = QuestionGraph([Question(**q) for q in q_list])
+        self.max_cursors = max_cursors
+        # conversation_id -> (conv.question_index the cursor was built or last advanced from, cursor).
+        # conv.question_index is the durable progress and only advance_with_answer writes it; a restored
+        # cursor may already sit past questions whose condition fails, which restoring again reproduces.
+        self._cursors: "OrderedDict[str, Tuple[int, FlowCursor]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cursor(self, conv: Conversation) -> FlowCursor:
+        with self._lock:
+            hit = self._cursors.get(conv.conversation_id)
+            if hit is not None and hit[0] == conv.question_index:
+                self._cursors.move_to_end(conv.conversation_id)
+                return hit[1]
+        # First sight of this conversation in this process (or progress changed elsewhere)
+        cursor = self.graph.restore(conv.question_index, conv.answers.__contains__)
+        self.graph.settle(cursor, self._value_of(conv))
+        self._keep(conv.conversation_id, conv.question_index, cursor)
+        return cursor
+
+    def _keep(self, conversation_id: str, question_index: int, cursor: FlowCursor) -> None:
+        with self._lock:
+            self._cursors[conversation_id] = (question_index, cursor)
+            self._cursors.move_to_end(conversation_id)
+            while len(self._cursors) > self.max_cursors:
+                self._cursors.popitem(last=False)
+
+    @staticmethod
+    def _value_of(conv: Conversation):
+        # Conditions compare against the parsed value of typed answers ("Ja" -> "yes"), else the raw text
+        def value_of(question_id: str):
+            parsed = conv.parsed_answers.get(question_id)
+            return parsed.value if parsed is not None else conv.answers.get(question_id)
+        return value_of
+
+    def get_question(self, conv: Conversation) -> Optional[Question]:
+        return self.graph.current(self._cursor(conv))
+
+    def questions(self) -> Sequence[Question]:
+        return self.graph.questions
+
+    def question_by_id(self, question_id: str) -> Optional[Question]:
+        i = self.graph.index.get(question_id)
+        return self.graph.questions[i] if i is not None else None
+
+    def advance_with_answer(self, conv: Conversation, answer_text: str) -> Conversation:
+        cursor = self._cursor(conv)
+        q = self.graph.current(cursor)
+        if q is not None:
+            self.graph.answered(cursor, q.id)
+            cursor.position += 1
+            self.graph.settle(cursor, self._value_of(conv))
+        conv.question_index = cursor.position
+        conv.active_question_id = None
+        self._keep(conv.conversation_id, conv.question_index, cursor)
+        return conv
+
+    def is_complete(self, conv: Conversation) -> bool:
+        return self.graph.is_complete(self._cursor(conv))
+
+    def forget(self, conversation_id: str) -> None:
+        with self._lock:
+            self._cursors.pop(conversation_id, None)
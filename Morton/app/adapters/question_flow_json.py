@@ -3,7 +3,7 @@ Why: This is the first of your “three big parts” (standardized questions), a
 
 from __future__ import annotations
 import json
-from typing import Optional
+from typing import Dict, Optional, Sequence, Tuple
 from app.domain.models import Conversation, Question
 from app.interfaces.question_flow import IQuestionFlow
 
@@ -12,13 +12,21 @@ class JsonQuestionFlow(IQuestionFlow):
         with open(questions_path, "r", encoding="utf-8") as f:
             raw = json.load(f)
         q_list = raw["questions"] if isinstance(raw, dict) and "questions" in raw else raw
-        self._questions = [Question(**q) for q in q_list]
+        self._questions: Tuple[Question, ...] = tuple(Question(**q) for q in q_list)
+        # Built once at load time; the questionnaire never changes while running
+        self._by_id: Dict[str, Question] = {q.id: q for q in self._questions}
 
     def get_question(self, conv: Conversation) -> Optional[Question]:
         if conv.question_index < 0 or conv.question_index >= len(self._questions):
             return None
         return self._questions[conv.question_index]
 
+    def questions(self) -> Sequence[Question]:
+        return self._questions
+
+    def question_by_id(self, question_id: str) -> Optional[Question]:
+        return self._by_id.get(question_id)
+
     def advance_with_answer(self, conv: Conversation, answer_text: str) -> Conversation:
         # Step 1: always move forward; validation comes later.
         conv.question_index += 1
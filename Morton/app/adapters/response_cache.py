@@ -0,0 +1,110 @@
+'''What: Key -> text caches with LRU and TTL eviction: in memory, or in a SQLite file that survives restarts.
+Why: Backends for CachedChatbot; patients ask the same questions over and over and a cached answer costs nothing.'''
+
+from __future__ import annotations
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class MemoryResponseCache:
+    """
+    - max_entries: least recently used entries are dropped beyond this
+    - ttl_s: entries older than this are treated as missing (None = keep until evicted)
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_s: Optional[float] = 24 * 3600):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None
+            created, value = hit
+            if self.ttl_s is not None and time.time() - created > self.ttl_s:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key       TEXT PRIMARY KEY,
+    value     TEXT NOT NULL,
+    created   REAL NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+class SqliteResponseCache:
+    """
+    Same policy as MemoryResponseCache, kept in a SQLite file so warm answers survive restarts
+    and can be shared by several worker processes. LRU eviction runs every evict_every puts,
+    so the table may briefly hold a few entries more than max_entries.
+    """
+
+    def __init__(self, path: str = "data/response_cache.sqlite3", max_entries: int = 10000,
+                 ttl_s: Optional[float] = 7 * 24 * 3600, evict_every: int = 64):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.evict_every = evict_every
+        self._puts = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self.ttl_s is not None and now - row[1] > self.ttl_s:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO responses (key, value, created, last_used) VALUES (?, ?, ?, ?)",
+                               (key, value, now, now))
+            self._puts += 1
+            if self._puts % self.evict_every:
+                return
+            # Evict least recently used rows beyond the limit
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,123 @@
+'''What: Load each summary template/schema file once and hand out the parsed document, its JSON Schema
+and a precompiled Draft 2020-12 validator.
+Why: finalize used to re-read and re-parse the file, and the summarizer re-derived the schema and rebuilt a
+validator on every call. Entries are reloaded only when the file's mtime (or size) changes.'''
+
+from __future__ import annotations
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Tuple
+
+from jsonschema import Draft202012Validator
+
+from app.adapters.template_schema import (FieldPath, drop_paths, project_for_llm, question_fields,
+                                          template_to_json_schema)
+
+
+def is_json_schema(doc: Any) -> bool:
+    """True for a real JSON Schema (data/summary_schema.json), False for an example template (summary_template.json)."""
+    return isinstance(doc, dict) and ("$schema" in doc or (doc.get("type") == "object" and "properties" in doc))
+
+
+@dataclass(frozen=True)
+class LoadedSchema:
+    path: str
+    stamp: Tuple[int, int]              # (mtime_ns, size) of the file this was parsed from
+    document: Dict[str, Any]            # the file as written (template or schema) - treat as read-only
+    json_schema: Dict[str, Any]         # the document itself, or the schema inferred from the template
+    validator: Draft202012Validator
+    llm_document: Dict[str, Any]        # what the summarizer is given: json_schema minus "x-deterministic" fields
+    deterministic_fields: Tuple[str, ...] = ()  # top-level fields the orchestrator fills in afterwards
+    # question_id -> (property path, value map) for fields filled from parsed typed answers ("x-from-question")
+    question_fields: Dict[str, Tuple[FieldPath, Dict[str, Any]]] = field(default_factory=dict)
+
+
+class SchemaRegistry:
+    def __init__(self, max_derived: int = 32):
+        self._files: Dict[str, LoadedSchema] = {}
+        # For callers that hold a template dict rather than a path: id(template) -> (template, schema, validator)
+        self._derived: "OrderedDict[int, Tuple[Dict[str, Any], Dict[str, Any], Draft202012Validator]]" = OrderedDict()
+        self._max_derived = max_derived
+        # (path, stamp, dropped paths) -> llm_document without the fields answered by parsed typed answers
+        self._answered: "OrderedDict[Tuple[str, Tuple[int, int], Tuple[FieldPath, ...]], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, path: str) -> LoadedSchema:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None and entry.stamp == stamp:
+                return entry
+
+        with open(path, "r", encoding="utf-8") as f:
+            document = json.load(f)
+        json_schema = document if is_json_schema(document) else template_to_json_schema(document)
+        Draft202012Validator.check_schema(json_schema)
+        llm_document, fields = project_for_llm(json_schema) if json_schema is document else (document, ())
+        entry = LoadedSchema(path=key, stamp=stamp, document=document, json_schema=json_schema,
+                             validator=Draft202012Validator(json_schema),
+                             llm_document=llm_document, deterministic_fields=fields,
+                             question_fields=question_fields(json_schema))
+        with self._lock:
+            self._files[key] = entry
+            self._derived[id(document)] = (document, json_schema, entry.validator)
+            if llm_document is not document:
+                self._derived[id(llm_document)] = (llm_document, llm_document, Draft202012Validator(llm_document))
+            self._trim()
+        return entry
+
+    def _trim(self) -> None:
+        while len(self._derived) > self._max_derived:
+            self._derived.popitem(last=False)
+        while len(self._answered) > self._max_derived:
+            self._answered.popitem(last=False)
+
+    def without_answered(self, entry: LoadedSchema, question_ids: Iterable[str]) -> Dict[str, Any]:
+        """
+        entry.llm_document minus the fields filled from these parsed answers. Cached per combination (a
+        questionnaire has only a few typed questions), so the summarizer's validator lookup hits too.
+        """
+        paths = tuple(entry.question_fields[q][0] for q in sorted(question_ids) if q in entry.question_fields)
+        if not paths:
+            return entry.llm_document
+        key = (entry.path, entry.stamp, paths)
+        with self._lock:
+            hit = self._answered.get(key)
+            if hit is not None:
+                self._answered.move_to_end(key)
+                return hit
+
+        document = drop_paths(entry.llm_document, paths)
+        validator = Draft202012Validator(document)
+        with self._lock:
+            self._answered[key] = document
+            self._derived[id(document)] = (document, document, validator)
+            self._trim()
+        return document
+
+    def for_template(self, template: Dict[str, Any]) -> Tuple[Dict[str, Any], Draft202012Validator]:
+        """
+        JSON Schema + validator for a template dict. Cached by object identity, which hits every time
+        for documents handed out by load(); other dicts are simply derived again.
+        """
+        key = id(template)
+        with self._lock:
+            hit = self._derived.get(key)
+            if hit is not None and hit[0] is template:
+                self._derived.move_to_end(key)
+                return hit[1], hit[2]
+
+        schema = template if is_json_schema(template) else template_to_json_schema(template)
+        validator = Draft202012Validator(schema)
+        with self._lock:
+            self._derived[key] = (template, schema, validator)
+            self._trim()
+        return schema, validator
+
+
+default_registry = SchemaRegistry()
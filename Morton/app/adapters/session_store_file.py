@@ -0,0 +1,50 @@
+'''What: Keep Conversation snapshots as one small JSON file per conversation.
+Why: No database needed for a single machine or a shared volume; each save is an atomic replace, so a crash
+mid-write leaves the previous snapshot, never half a file.'''
+
+from __future__ import annotations
+import json
+import os
+import tempfile
+from typing import Optional
+from urllib.parse import quote
+from app.domain.models import Conversation
+from app.interfaces.session_store import ISessionStore
+
+
+class FileSessionStore(ISessionStore):
+    def __init__(self, directory: str = "data/sessions", fsync: bool = False):
+        self.directory = directory
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, conversation_id: str) -> str:
+        return os.path.join(self.directory, quote(conversation_id, safe="") + ".json")
+
+    def save(self, conv: Conversation) -> None:
+        path = self._path(conv.conversation_id)
+        # A unique temporary name: two workers saving the same conversation never write into one file
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(conv.to_record(), f, ensure_ascii=False, separators=(",", ":"))
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def load(self, conversation_id: str) -> Optional[Conversation]:
+        try:
+            with open(self._path(conversation_id), "r", encoding="utf-8") as f:
+                return Conversation.from_record(json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def delete(self, conversation_id: str) -> None:
+        try:
+            os.remove(self._path(conversation_id))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,65 @@
+'''What: Keep Conversation snapshots in SQLite, one row per conversation.
+Why: Many workers can share one file (WAL: readers never wait for the writer), and it can live in the same
+database as SqliteTranscriptStore, so a session and its transcript move between workers together.'''
+
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional
+from app.domain.models import Conversation
+from app.interfaces.session_store import ISessionStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    conversation_id TEXT PRIMARY KEY,
+    record          TEXT NOT NULL,
+    updated_at      REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+_UPSERT = ("INSERT INTO sessions (conversation_id, record, updated_at) VALUES (?, ?, ?) "
+           "ON CONFLICT (conversation_id) DO UPDATE SET record = excluded.record, updated_at = excluded.updated_at")
+_SELECT = "SELECT record FROM sessions WHERE conversation_id = ?"
+_REVISION = "SELECT coalesce(json_extract(record, '$.revision'), 0) FROM sessions WHERE conversation_id = ?"
+_DELETE = "DELETE FROM sessions WHERE conversation_id = ?"
+
+
+class SqliteSessionStore(ISessionStore):
+    """
+    - path: database file (":memory:" works for tests); may be the transcript database
+    - every save is its own autocommit write; with synchronous=NORMAL that is no fsync per save
+    """
+
+    def __init__(self, path: str = "data/sessions.sqlite3"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, cached_statements=16)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def save(self, conv: Conversation) -> None:
+        record = json.dumps(conv.to_record(), ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(_UPSERT, (conv.conversation_id, record, time.time()))
+
+    def load(self, conversation_id: str) -> Optional[Conversation]:
+        with self._lock:
+            row = self._conn.execute(_SELECT, (conversation_id,)).fetchone()
+        return Conversation.from_record(json.loads(row[0])) if row else None
+
+    def revision(self, conversation_id: str) -> Optional[int]:
+        # Read inside SQLite: no record is sent to Python or parsed there
+        with self._lock:
+            row = self._conn.execute(_REVISION, (conversation_id,)).fetchone()
+        return row[0] if row else None
+
+    def delete(self, conversation_id: str) -> None:
+        with self._lock:
+            self._conn.execute(_DELETE, (conversation_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
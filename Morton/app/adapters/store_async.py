@@ -0,0 +1,31 @@
+'''What: Expose any ITranscriptStore through the IAsyncTranscriptStore interface.
+Why: The in-memory store never blocks, so it is called directly; a store that does disk/network I/O can be
+pushed to a worker thread with offload=True until it gets a native async implementation.'''
+
+from __future__ import annotations
+import asyncio
+from typing import List
+from app.domain.models import Message
+from app.domain.transcript_view import TranscriptView
+from app.interfaces.transcript_store import IAsyncTranscriptStore, ITranscriptStore
+
+class AsyncTranscriptStore(IAsyncTranscriptStore):
+    def __init__(self, store: ITranscriptStore, offload: bool = False):
+        self.store = store
+        self.offload = offload
+
+    async def append(self, conversation_id: str, message: Message) -> None:
+        if self.offload:
+            await asyncio.to_thread(self.store.append, conversation_id, message)
+        else:
+            self.store.append(conversation_id, message)
+
+    async def get(self, conversation_id: str) -> List[Message]:
+        if self.offload:
+            return await asyncio.to_thread(self.store.get, conversation_id)
+        return self.store.get(conversation_id)
+
+    async def view(self, conversation_id: str) -> TranscriptView:
+        if self.offload:
+            return await asyncio.to_thread(self.store.view, conversation_id)
+        return self.store.view(conversation_id)
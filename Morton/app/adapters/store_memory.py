@@ -4,6 +4,7 @@ Why: This makes it easy to test now; later we replace it with SQLite/Postgres wi
 from __future__ import annotations
 from typing import Dict, List
 from app.domain.models import Message
+from app.domain.transcript_view import TranscriptView
 from app.interfaces.transcript_store import ITranscriptStore
 
 class MemoryTranscriptStore(ITranscriptStore):
@@ -15,3 +16,13 @@ class MemoryTranscriptStore(ITranscriptStore):
 
     def get(self, conversation_id: str) -> List[Message]:
         return list(self._db.get(conversation_id, []))
+
+    def view(self, conversation_id: str) -> TranscriptView:
+        # Messages are only ever appended, so sharing the list is safe
+        return TranscriptView(self._db.get(conversation_id, []))
+
+    def get_since(self, conversation_id: str, seq: int) -> List[Message]:
+        return self._db.get(conversation_id, [])[seq:]
+
+    def get_tail(self, conversation_id: str, n: int) -> List[Message]:
+        return self._db.get(conversation_id, [])[-n:] if n > 0 else []
@@ -0,0 +1,178 @@
+'''What: Store conversation turns in SQLite (the durable replacement promised by store_memory).
+Why: Transcripts survive restarts; WAL lets readers run while a writer commits, and the
+(conversation_id, seq) key makes tail/since reads index range scans instead of full loads.'''
+
+from __future__ import annotations
+import json
+import logging
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+from app.domain.models import Message, Role
+from app.interfaces.transcript_store import ITranscriptStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    conversation_id TEXT    NOT NULL,
+    seq             INTEGER NOT NULL,
+    role            TEXT    NOT NULL,
+    content         TEXT    NOT NULL,
+    ts              INTEGER NOT NULL,
+    meta            TEXT,
+    PRIMARY KEY (conversation_id, seq)
+) WITHOUT ROWID
+"""
+
+logger = logging.getLogger(__name__)
+
+# Fixed SQL text, so sqlite3's statement cache keeps each one prepared
+_INSERT = "INSERT INTO messages (conversation_id, seq, role, content, ts, meta) VALUES (?, ?, ?, ?, ?, ?)"
+_SELECT_ALL = "SELECT role, content, ts, meta FROM messages WHERE conversation_id = ? ORDER BY seq"
+_SELECT_SINCE = "SELECT role, content, ts, meta FROM messages WHERE conversation_id = ? AND seq > ? ORDER BY seq"
+_SELECT_TAIL = ("SELECT role, content, ts, meta FROM "
+                "(SELECT seq, role, content, ts, meta FROM messages WHERE conversation_id = ? ORDER BY seq DESC LIMIT ?) "
+                "ORDER BY seq")
+_MAX_SEQ = "SELECT MAX(seq) FROM messages WHERE conversation_id = ?"
+
+Row = Tuple[str, int, str, str, int, Optional[str]]
+
+
+def _row(conversation_id: str, seq: int, message: Message) -> Row:
+    return (conversation_id, seq, message.role.value, message.content, message.ts,
+            json.dumps(message.meta, ensure_ascii=False) if message.meta else None)
+
+
+def _message(role: str, content: str, ts: int, meta: Optional[str]) -> Message:
+    return Message(role=Role(role), content=content, ts=ts, meta=json.loads(meta) if meta else {})
+
+
+class SqliteTranscriptStore(ITranscriptStore):
+    """
+    - path: database file (":memory:" works for tests)
+    - group_commit: buffer appends and write them from all sessions in one transaction,
+      every commit_interval_s or as soon as max_batch messages are pending.
+      Reads always see buffered messages. Call flush()/close() on shutdown.
+      A failed background commit is logged (errors, last_error) and retried; the messages stay buffered,
+      and flush() and reads, which flush first, raise the error until a write succeeds.
+
+    seq numbers come from a per-store counter. Another store on the same file (another worker, or one that
+    took over a session) may have used them meanwhile: the write then fails on the primary key, and the
+    batch is renumbered after the stored MAX(seq), under the write lock, and written again.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/transcripts.sqlite3",
+        group_commit: bool = False,
+        commit_interval_s: float = 0.05,
+        max_batch: int = 500,
+    ):
+        self.path = path
+        self.group_commit = group_commit
+        self.commit_interval_s = commit_interval_s
+        self.max_batch = max_batch
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, cached_statements=64)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+
+        self._lock = threading.RLock()
+        self._next_seq: Dict[str, int] = {}
+        self._pending: List[Row] = []
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+
+        self._closed = threading.Event()
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if group_commit:
+            self._flusher = threading.Thread(target=self._flush_loop, name="sqlite-group-commit", daemon=True)
+            self._flusher.start()
+
+    def _seq_for(self, conversation_id: str) -> int:
+        seq = self._next_seq.get(conversation_id)
+        if seq is None:
+            (last,) = self._conn.execute(_MAX_SEQ, (conversation_id,)).fetchone()
+            seq = (last or 0) + 1
+        self._next_seq[conversation_id] = seq + 1
+        return seq
+
+    def _renumber(self, rows: List[Row]) -> List[Row]:
+        """rows with seq continuing after what is stored now (call inside a write transaction)."""
+        self._next_seq.clear()  # every conversation this store cached may have moved on elsewhere
+        return [(cid, self._seq_for(cid), *rest) for cid, _, *rest in rows]
+
+    def _write(self, rows: List[Row]) -> None:
+        self._conn.execute("BEGIN")
+        try:
+            try:
+                self._conn.executemany(_INSERT, rows)
+            except sqlite3.IntegrityError:
+                # Another store wrote these seq numbers: take the write lock, so no one else can, and renumber
+                self._conn.execute("ROLLBACK")
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany(_INSERT, self._renumber(rows))
+            self._conn.execute("COMMIT")
+        except BaseException:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+
+    def append(self, conversation_id: str, message: Message) -> None:
+        with self._lock:
+            row = _row(conversation_id, self._seq_for(conversation_id), message)
+            if not self.group_commit:
+                self._write([row])
+                return
+            self._pending.append(row)
+            if len(self._pending) >= self.max_batch:
+                self._wake.set()
+
+    def flush(self) -> None:
+        """Write all buffered appends in a single transaction."""
+        with self._lock:
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+            try:
+                self._write(rows)
+            except BaseException:
+                self._pending = rows + self._pending
+                raise
+
+    def _flush_loop(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self.commit_interval_s)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:  # e.g. disk full or locked too long: keep the thread, retry next round
+                self.errors += 1
+                self.last_error = e
+                logger.exception("SQLite group commit failed; %d messages stay buffered", len(self._pending))
+
+    def _query(self, sql: str, params: tuple) -> List[Message]:
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_message(*r) for r in rows]
+
+    def get(self, conversation_id: str) -> List[Message]:
+        return self._query(_SELECT_ALL, (conversation_id,))
+
+    def get_since(self, conversation_id: str, seq: int) -> List[Message]:
+        return self._query(_SELECT_SINCE, (conversation_id, seq))
+
+    def get_tail(self, conversation_id: str, n: int) -> List[Message]:
+        if n <= 0:
+            return []
+        return self._query(_SELECT_TAIL, (conversation_id, n))
+
+    def close(self) -> None:
+        self._closed.set()
+        self._wake.set()
+        if self._flusher:
+            self._flusher.join()
+        self.flush()
+        self._conn.close()
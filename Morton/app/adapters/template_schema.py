@@ -2,7 +2,7 @@
 Why: LLMs will sometimes output invalid JSON or wrong keys; this gives you guardrails.'''
 
 from __future__ import annotations
-from typing import Any, Dict
+from typing import Any, Dict, List, Sequence, Tuple
 import copy
 
 def template_to_json_schema(template: Any) -> Dict[str, Any]:
@@ -56,3 +56,98 @@ def template_to_json_schema(template: Any) -> Dict[str, Any]:
         **base
     }
     return schema
+
+
+# Schema properties marked with this keyword are filled in by the orchestrator, not by the model
+DETERMINISTIC_MARKER = "x-deterministic"
+
+
+def project_for_llm(schema: Dict[str, Any]) -> Tuple[Dict[str, Any], Tuple[str, ...]]:
+    """
+    Split a summary JSON Schema into what the model must generate and what the orchestrator fills in.
+    Returns (schema without the top-level properties marked "x-deterministic": true, names of those properties).
+    The original schema is returned unchanged (same object) when nothing is marked.
+    """
+    props = schema.get("properties") or {}
+    fields = tuple(k for k, v in props.items() if isinstance(v, dict) and v.get(DETERMINISTIC_MARKER) is True)
+    if not fields:
+        return schema, ()
+
+    projected = dict(schema)
+    projected["properties"] = {k: v for k, v in props.items() if k not in fields}
+    if "required" in schema:
+        projected["required"] = [k for k in schema["required"] if k not in fields]
+    return projected, fields
+
+
+def fill_required(instance: Any, schema: Dict[str, Any]) -> Any:
+    """
+    Add the required properties an (incrementally built) instance is still missing:
+    objects and arrays empty, enums their "unknown"-style value if they have one, other values None.
+    """
+    if schema.get("type") != "object" or not isinstance(instance, dict):
+        return instance
+    props = schema.get("properties") or {}
+    out = {k: fill_required(v, props.get(k, {})) for k, v in instance.items()}
+    for key in schema.get("required", []):
+        if key in out:
+            continue
+        prop = props.get(key, {})
+        if prop.get("type") == "object":
+            out[key] = fill_required({}, prop)
+        elif prop.get("type") == "array":
+            out[key] = []
+        elif "enum" in prop:
+            out[key] = next((v for v in prop["enum"] if v in _UNKNOWN_VALUES), None)
+        else:
+            out[key] = None
+    return out
+
+
+_UNKNOWN_VALUES = ("unknown", "not_discussed", "not_assessed", "unclear")
+
+
+# A property marked {"x-from-question": "q4"} is filled from the parsed answer to that typed question;
+# an optional {"x-value-map": {"yes": "compliant", ...}} translates the parsed value into the field's values
+QUESTION_MARKER = "x-from-question"
+VALUE_MAP_MARKER = "x-value-map"
+
+FieldPath = Tuple[str, ...]
+
+
+def question_fields(schema: Dict[str, Any], path: FieldPath = ()) -> Dict[str, Tuple[FieldPath, Dict[str, Any]]]:
+    """question_id -> (property path, value map) for every object property marked "x-from-question"."""
+    out: Dict[str, Tuple[FieldPath, Dict[str, Any]]] = {}
+    for name, prop in (schema.get("properties") or {}).items():
+        if not isinstance(prop, dict):
+            continue
+        if QUESTION_MARKER in prop:
+            out[prop[QUESTION_MARKER]] = (path + (name,), prop.get(VALUE_MAP_MARKER) or {})
+        elif prop.get("type") == "object":
+            out.update(question_fields(prop, path + (name,)))
+    return out
+
+
+def drop_paths(schema: Dict[str, Any], paths: Sequence[FieldPath]) -> Dict[str, Any]:
+    """Copy of schema without the given property paths (and without them in "required"); schema is not modified."""
+    here = {p[0] for p in paths if len(p) == 1}
+    nested: Dict[str, List[FieldPath]] = {}
+    for p in paths:
+        if len(p) > 1:
+            nested.setdefault(p[0], []).append(p[1:])
+
+    props = schema.get("properties") or {}
+    out = dict(schema)
+    out["properties"] = {k: (drop_paths(v, nested[k]) if k in nested else v) for k, v in props.items() if k not in here}
+    if "required" in schema:
+        out["required"] = [k for k in schema["required"] if k not in here]
+    return out
+
+
+def set_path(instance: Dict[str, Any], path: FieldPath, value: Any) -> None:
+    for key in path[:-1]:
+        child = instance.get(key)
+        if not isinstance(child, dict):
+            child = instance[key] = {}
+        instance = child
+    instance[path[-1]] = value
@@ -0,0 +1,233 @@
+'''What: HTTP service (FastAPI) over AsyncConversationOrchestrator: start, answer, chat (SSE) and finalize.
+Why: Replaces the prototype in ToGood2Go/main.py with the real app/ flow; one lock per conversation,
+and a shared limiter so bursts queue up in front of Ollama instead of overloading it.
+
+Run from the Morton folder:  uvicorn app.api.service:app
+Relative paths in the MORTON_* variables are taken from the current directory; the defaults point into Morton/data.'''
+
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.domain.models import Conversation, ConversationState, Mode
+from app.adapters.question_flow_graph import GraphQuestionFlow
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.adapters.store_sqlite import SqliteTranscriptStore
+from app.adapters.store_async import AsyncTranscriptStore
+from app.adapters.session_store_file import FileSessionStore
+from app.adapters.session_store_sqlite import SqliteSessionStore
+from app.adapters.async_ollama_chatbot import AsyncOllamaChatbot
+from app.adapters.async_ollama_summarizer import AsyncOllamaSummarizer
+from app.adapters.ollama_http_async import AsyncOllamaClient
+from app.adapters.model_router import ModelRouter
+from app.adapters.llm_limiter import LimitedChatbot, LimitedSummarizer, LlmBusyError, LlmLimiter
+from app.application.async_orchestrator import AsyncConversationOrchestrator
+from app.application.orchestrator import OrchestratorResult
+from app.application.sessions import SessionRegistry, UnknownConversationError
+
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data")
+
+
+def _data(name: str) -> str:
+    return os.path.join(DATA_DIR, name)
+
+
+class StartRequest(BaseModel):
+    conversation_id: Optional[str] = None
+
+
+class TextRequest(BaseModel):
+    text: str
+
+
+class TurnResponse(BaseModel):
+    conversation_id: str
+    bot_text: Optional[str] = None
+    done: bool = False
+    question_id: Optional[str] = None
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _turn(conv: Conversation, res: OrchestratorResult) -> TurnResponse:
+    return TurnResponse(conversation_id=conv.conversation_id, bot_text=res.bot_text,
+                        done=res.done, question_id=conv.active_question_id if not res.done else None)
+
+
+def build_router() -> ModelRouter:
+    """OLLAMA_MODEL puts every task on one model; otherwise MORTON_MODELS (data/models.json) routes per task."""
+    model = os.getenv("OLLAMA_MODEL")
+    return ModelRouter.single(model) if model else ModelRouter.from_file(os.getenv("MORTON_MODELS", _data("models.json")))
+
+
+def build_orchestrator(limiter: LlmLimiter, client: AsyncOllamaClient, router: ModelRouter) -> AsyncConversationOrchestrator:
+    transcript_db = os.getenv("MORTON_TRANSCRIPT_DB")
+    store = (AsyncTranscriptStore(SqliteTranscriptStore(transcript_db, group_commit=True), offload=True)
+             if transcript_db else AsyncTranscriptStore(MemoryTranscriptStore()))
+    return AsyncConversationOrchestrator(
+        GraphQuestionFlow(os.getenv("MORTON_QUESTIONS", _data("questions.json"))),
+        store,
+        chatbot=LimitedChatbot(AsyncOllamaChatbot(model=router.model("chat"),
+                                                  client=router.async_client("chat", client)), limiter),
+        summarizer=LimitedSummarizer(AsyncOllamaSummarizer(model=router.model("summarization"),
+                                                           client=router.async_client("summarization", client)), limiter),
+        template_path=os.getenv("MORTON_TEMPLATE", _data("summary_schema.json")),
+    )
+
+
+def build_sessions() -> SessionRegistry:
+    """
+    MORTON_SESSION_STORE=file|sqlite (+ MORTON_SESSION_PATH) saves every turn, keeps at most
+    MORTON_MAX_HOT_SESSIONS in memory and drops sessions idle for MORTON_SESSION_IDLE_S.
+    Set MORTON_TRANSCRIPT_DB too, so another worker also finds the transcript.
+    """
+    kind = os.getenv("MORTON_SESSION_STORE")
+    if not kind:
+        return SessionRegistry()
+    if kind == "file":
+        store = FileSessionStore(os.getenv("MORTON_SESSION_PATH", _data("sessions")))
+    elif kind == "sqlite":
+        store = SqliteSessionStore(os.getenv("MORTON_SESSION_PATH", _data("sessions.sqlite3")))
+    else:
+        raise ValueError(f"MORTON_SESSION_STORE must be file or sqlite, not {kind!r}")
+    return SessionRegistry(store, max_hot=int(os.getenv("MORTON_MAX_HOT_SESSIONS", "1000")),
+                           idle_s=float(os.getenv("MORTON_SESSION_IDLE_S", "900")), offload=True)
+
+
+def create_app(orchestrator: Optional[AsyncConversationOrchestrator] = None,
+               sessions: Optional[SessionRegistry] = None,
+               max_concurrent_llm: int = 4,
+               max_waiting_llm: Optional[int] = None) -> FastAPI:
+    limiter = LlmLimiter(max_concurrent=max_concurrent_llm, max_waiting=max_waiting_llm)
+    prewarm = None
+    orch = orchestrator
+    if orch is None:
+        client = AsyncOllamaClient(base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+                                   pool_size=limiter.max_concurrent)
+        router = build_router()
+        orch = build_orchestrator(limiter, client, router)
+        prewarm = partial(router.aprewarm, client)
+    sessions = sessions if sessions is not None else build_sessions()
+    if sessions.on_evict is None:
+        sessions.on_evict = orch.forget  # an evicted conversation's caches go with it
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        # Load the models in the background: the server answers at once, and the first turns wait
+        # for a load that has already started instead of starting one
+        task = asyncio.create_task(prewarm()) if prewarm is not None else None
+        yield
+        if task is not None:
+            task.cancel()
+
+    api = FastAPI(title="Morton pre-anesthesia interview", lifespan=lifespan)
+    api.state.orchestrator = orch
+    api.state.sessions = sessions
+    api.state.limiter = limiter
+
+    @asynccontextmanager
+    async def _use(conversation_id: str) -> AsyncIterator[Conversation]:
+        """sessions.use with a 404 for an unknown conversation."""
+        entered = False
+        try:
+            async with sessions.use(conversation_id) as conv:
+                entered = True
+                yield conv
+        except UnknownConversationError:
+            if entered:
+                raise
+            raise HTTPException(status_code=404, detail="Unknown conversation.")
+
+    @api.post("/conversations", response_model=TurnResponse)
+    async def start(req: StartRequest) -> TurnResponse:
+        try:
+            conv = await sessions.create(req.conversation_id)
+        except KeyError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        async with sessions.use(conv.conversation_id) as conv:
+            res = await orch.start(conv)
+        return _turn(conv, res)
+
+    @api.post("/conversations/{conversation_id}/answer", response_model=TurnResponse)
+    async def answer(conversation_id: str, req: TextRequest) -> TurnResponse:
+        async with _use(conversation_id) as conv:
+            if conv.state == ConversationState.DONE:
+                raise HTTPException(status_code=409, detail="Questionnaire already complete.")
+            res = await orch.handle_user_message(conv, req.text, mode=Mode.ANSWER)
+        return _turn(conv, res)
+
+    @api.post("/conversations/{conversation_id}/chat")
+    async def chat(conversation_id: str, req: TextRequest) -> StreamingResponse:
+        '''Server-Sent Events: "token" events carry {"text": ...}; a final "done" event carries the flow state,
+        an "error" event {"detail": ...} ends a stream that failed.'''
+        # Status codes must be decided before the stream starts: a quick look without the lock (no store read
+        # for a hot conversation); the stream re-checks under the lock
+        conv = await sessions.get(conversation_id, verify=False)
+        if conv is None:
+            raise HTTPException(status_code=404, detail="Unknown conversation.")
+        if conv.state == ConversationState.DONE:
+            raise HTTPException(status_code=409, detail="Questionnaire already complete.")
+
+        async def events() -> AsyncIterator[str]:
+            # Held for the whole stream so a concurrent answer can't move the flow mid-reply
+            try:
+                async with sessions.use(conversation_id) as conv:
+                    if conv.state == ConversationState.DONE:  # completed while this request waited for the lock
+                        yield _sse("error", {"detail": "Questionnaire already complete."})
+                        return
+                    try:
+                        async for chunk in orch.handle_user_message_stream(conv, req.text, mode=Mode.CHAT):
+                            yield _sse("token", {"text": chunk})
+                    except LlmBusyError as e:
+                        yield _sse("error", {"detail": str(e)})
+                        return
+                    except Exception:  # Ollama down, HTTP error, dropped connection: the client still gets an answer
+                        logger.exception("Chat reply failed for conversation %s", conversation_id)
+                        yield _sse("error", {"detail": "The chatbot could not answer right now. Please try again."})
+                        return
+                    yield _sse("done", {"done": conv.state == ConversationState.DONE,
+                                        "question_id": conv.active_question_id})
+            except UnknownConversationError:  # removed while this request waited for the lock
+                yield _sse("error", {"detail": "Unknown conversation."})
+
+        return StreamingResponse(events(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @api.post("/conversations/{conversation_id}/finalize")
+    async def finalize(conversation_id: str) -> dict:
+        async with _use(conversation_id) as conv:
+            try:
+                return await orch.finalize(conv)
+            except LlmBusyError as e:
+                raise HTTPException(status_code=503, detail=str(e))
+
+    @api.delete("/conversations/{conversation_id}", status_code=204)
+    async def close(conversation_id: str) -> None:
+        if not await sessions.remove(conversation_id):
+            raise HTTPException(status_code=404, detail="Unknown conversation.")
+        orch.forget(conversation_id)
+
+    @api.get("/health")
+    async def health() -> dict:
+        return {"sessions": len(sessions), "restored": sessions.restores, "evicted": sessions.evictions,
+                "stale_reloads": sessions.stale_reloads,
+                "llm_running": limiter.running, "llm_waiting": limiter.waiting}
+
+    return api
+
+
+app = create_app(max_concurrent_llm=int(os.getenv("MORTON_MAX_CONCURRENT_LLM", "4")))
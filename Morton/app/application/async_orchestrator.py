@@ -0,0 +1,121 @@
+'''What: asyncio version of ConversationOrchestrator.
+Why: Nearly all of a turn is spent waiting for Ollama; with async adapters one event loop can drive hundreds of
+Conversations at once. The flow decisions themselves come from BaseOrchestrator, so both orchestrators behave the same.
+A running_summary (app/application/running_summary.py) folds turns on its own worker thread and reads the transcript
+through a sync store - give it the store inside AsyncTranscriptStore; finalize waits for it off the event loop.'''
+
+from __future__ import annotations
+import asyncio
+from typing import AsyncIterator, Optional
+from app.domain.models import Conversation, ConversationState, Message, Role, Mode
+from app.interfaces.chatbot import IAsyncChatbot, IAsyncStreamingChatbot
+from app.interfaces.question_flow import IQuestionFlow
+from app.interfaces.transcript_store import IAsyncTranscriptStore
+from app.interfaces.summarizer import IAsyncSummarizer
+from app.application.chat_context import ChatContextAccumulator
+from app.adapters.schema_registry import SchemaRegistry
+from app.application.orchestrator import BaseOrchestrator, OrchestratorResult
+from app.application.running_summary import RunningSummary
+
+
+class AsyncConversationOrchestrator(BaseOrchestrator):
+    def __init__(self, question_flow: IQuestionFlow, transcript_store: IAsyncTranscriptStore, chatbot: Optional[IAsyncChatbot] = None, summarizer: Optional[IAsyncSummarizer] = None, template_path: Optional[str] = None, schema_registry: Optional[SchemaRegistry] = None, running_summary: Optional[RunningSummary] = None):
+        super().__init__(question_flow, template_path, schema_registry, running_summary)
+        self.store = transcript_store
+        self.chatbot = chatbot
+        self.summarizer = summarizer
+
+    async def _append(self, conv: Conversation, msg: Message) -> None:
+        await self.store.append(conv.conversation_id, msg)
+        self._observe(conv, msg)
+
+    async def _chat_context(self, conv: Conversation) -> ChatContextAccumulator:
+        acc = self._cached_chat_context(conv)
+        if acc is None:
+            acc = self._new_chat_context(conv, await self.store.view(conv.conversation_id))
+        return acc
+
+    async def _ask_current_question(self, conv: Conversation) -> OrchestratorResult:
+        msg, res = self._current_question_step(conv)
+        await self._append(conv, msg)
+        return res
+
+    async def _finish_chat(self, conv: Conversation, answer: str, incomplete: bool = False) -> OrchestratorResult:
+        to_store, res = self._chat_reply_step(conv, answer, incomplete)
+        for msg in to_store:
+            await self._append(conv, msg)
+        return res
+
+    async def start(self, conv: Conversation) -> OrchestratorResult:
+        return await self._ask_current_question(conv)
+
+    async def handle_user_message(self, conv: Conversation, user_text: str, mode: Mode = Mode.ANSWER) -> OrchestratorResult:
+        await self._append(conv, Message(role=Role.PATIENT, content=user_text, meta={"mode": mode.value}))
+
+        if mode == Mode.CHAT:
+            if not self.chatbot:
+                await self._append(conv, Message(role=Role.ASSISTANT, content="Chatbot not available."))
+                return self._end_turn(conv, await self._ask_current_question(conv))
+
+            conv.state = ConversationState.CHAT_MODE
+            acc = await self._chat_context(conv)
+            ctx = self._build_chat_context(conv, acc)
+
+            answer = await self.chatbot.answer(user_text=user_text, transcript=list(acc.window), context=ctx)
+            return self._end_turn(conv, await self._finish_chat(conv, answer))
+
+        self._record_answer(conv, user_text)
+        return self._end_turn(conv, await self._ask_current_question(conv))
+
+    async def handle_user_message_stream(self, conv: Conversation, user_text: str, mode: Mode = Mode.ANSWER) -> AsyncIterator[str]:
+        '''Async counterpart of ConversationOrchestrator.handle_user_message_stream.
+        Async generators cannot return a value, so check conv.state == DONE afterwards instead of res.done.
+        A stream that is closed early or fails stores its partial reply, marked "incomplete".'''
+        if mode != Mode.CHAT or not isinstance(self.chatbot, IAsyncStreamingChatbot):
+            res = await self.handle_user_message(conv, user_text, mode=mode)
+            if res.bot_text:
+                yield res.bot_text
+            return
+
+        await self._append(conv, Message(role=Role.PATIENT, content=user_text, meta={"mode": mode.value}))
+
+        conv.state = ConversationState.CHAT_MODE
+        acc = await self._chat_context(conv)
+        ctx = self._build_chat_context(conv, acc)
+
+        parts = []
+        try:
+            async for token in self.chatbot.answer_stream(user_text=user_text, transcript=list(acc.window), context=ctx):
+                parts.append(token)
+                yield token
+        except BaseException:  # closed when the client went away (often by cancelling the task), or the chatbot failed
+            # Shielded: a cancelled task must still store the reply, or the transcript ends on an unanswered turn
+            res = await asyncio.shield(self._finish_chat(conv, "".join(parts), incomplete=True))
+            self._end_turn(conv, res)
+            raise
+
+        answer = "".join(parts)
+        res = self._end_turn(conv, await self._finish_chat(conv, answer))
+        tail = res.bot_text[len(answer):]
+        if tail:
+            yield tail
+
+    async def finalize(self, conv: Conversation) -> dict:
+        if not self.summarizer and not self.running_summary:
+            raise RuntimeError("Summarizer not configured.")
+        template = self._load_template()
+
+        transcript = await self.store.view(conv.conversation_id)
+        summary = None
+        if self.running_summary is not None:
+            summary = await asyncio.to_thread(self.running_summary.result, conv.conversation_id,
+                                              *self._summary_plan(conv, template))
+        if summary is None:
+            if not self.summarizer:
+                raise RuntimeError("Summarizer not configured.")
+            llm_transcript, schema = self._summary_input(conv, transcript, template)
+            summary = await self.summarizer.summarize(transcript=llm_transcript, schema=schema)
+        if self.running_summary is not None:
+            await asyncio.to_thread(self.running_summary.discard, conv.conversation_id)
+
+        return self._complete_summary(conv, summary, transcript, template)
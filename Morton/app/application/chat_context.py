@@ -0,0 +1,54 @@
+'''What: Per-conversation chat context kept up to date as messages are appended.
+Why: A chat turn used to rescan the transcript and rebuild the answered-questions list from scratch;
+with this, the orchestrator only formats the final context string and the chatbot gets a short window.'''
+
+from __future__ import annotations
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+from app.domain.models import Message, Question, Role
+
+
+class ChatContextAccumulator:
+    """
+    - window: the most recent chat-mode patient/assistant messages (oldest first).
+      The chatbot picks its history from it by token budget, so it holds more
+      messages than a budget usually takes.
+    - answered block: the "- question -> answer" lines, re-joined only after an answer changes.
+    """
+
+    def __init__(self, window_size: int = 64):
+        self.window: Deque[Message] = deque(maxlen=window_size)
+        self._answered: Dict[str, str] = {}
+        self._answered_block: Optional[str] = None
+        # conv.answers.version this block reflects (None = unknown, rebuild on next use)
+        self.answers_version: Optional[int] = None
+
+    def observe(self, message: Message) -> None:
+        if message.role in (Role.PATIENT, Role.ASSISTANT) and (message.meta or {}).get("mode") == "chat":
+            self.window.append(message)
+
+    def record_answer(self, question: Question, answer: str, answers_version: Optional[int] = None) -> None:
+        self._answered[question.id] = f"- {question.text} -> {answer}"
+        self._answered_block = None
+        self.answers_version = answers_version
+
+    def answered_block(self) -> str:
+        if self._answered_block is None:
+            self._answered_block = "\n".join(self._answered.values()) or "None yet."
+        return self._answered_block
+
+    def reset_answers(self, answered: Iterable[dict], answers_version: Optional[int] = None) -> None:
+        """Replace the answered list, e.g. after conv.answers was changed outside the orchestrator."""
+        self._answered = {x["question_id"]: f"- {x['question']} -> {x['answer']}" for x in answered}
+        self._answered_block = None
+        self.answers_version = answers_version
+
+    @classmethod
+    def from_history(cls, transcript: Iterable[Message], answered: Iterable[dict],
+                     answers_version: Optional[int] = None, window_size: int = 64) -> "ChatContextAccumulator":
+        """Rebuild from a stored transcript (first chat turn after a restart)."""
+        acc = cls(window_size=window_size)
+        for m in transcript:
+            acc.observe(m)
+        acc.reset_answers(answered, answers_version)
+        return acc
@@ -3,167 +3,342 @@ Why: This is the “single brain” that keeps your modules independent: questio
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Generator, List, Optional, Sequence, Tuple
 from app.domain.models import Conversation, ConversationState, Message, Role, Mode
-from app.interfaces.chatbot import IChatbot
+from app.domain.answer_parsing import parse_answer
+from app.domain.transcript_view import as_view, without_parsed_answers
+from app.application.chat_context import ChatContextAccumulator
+from app.application.running_summary import RunningSummary
+from app.adapters.schema_registry import LoadedSchema, SchemaRegistry, default_registry
+from app.adapters.template_schema import set_path
+from app.interfaces.chatbot import ChatContext, IChatbot, IStreamingChatbot
 from app.interfaces.question_flow import IQuestionFlow
 from app.interfaces.transcript_store import ITranscriptStore
 from app.interfaces.summarizer import ISummarizer
-import json
 
 @dataclass
 class OrchestratorResult:
     bot_text: Optional[str] = None
     done: bool = False
 
-class ConversationOrchestrator:
-    def __init__(self, question_flow: IQuestionFlow, transcript_store: ITranscriptStore, chatbot:Optional[IChatbot] = None, summarizer: Optional[ISummarizer] = None, template_path: Optional[str] = None):
-        self.question_flow = question_flow
-        self.store = transcript_store
-        self.chatbot = chatbot
-        self.summarizer = summarizer
-        self.template_path = template_path
 
+class BaseOrchestrator:
+    '''What: The flow decisions shared by the sync and async orchestrators.
+    Why: These steps only touch the Conversation and return the messages to store,
+    so each orchestrator just does its own (sync or async) I/O around them.'''
 
-    def _ask_current_question(self, conv: Conversation) -> OrchestratorResult:
+    def __init__(self, question_flow: IQuestionFlow, template_path: Optional[str] = None, schema_registry: Optional[SchemaRegistry] = None,
+                 running_summary: Optional[RunningSummary] = None):
+        self.question_flow = question_flow
+        self.template_path = template_path
+        self.schemas = schema_registry or default_registry
+        # Optional: summarize turn by turn in the background so finalize has little left to do
+        self.running_summary = running_summary
+        self._contexts: Dict[str, ChatContextAccumulator] = {}
+        # conversation_id -> (answers object id, answers.version, built list)
+        self._answers_cache: Dict[str, Tuple[int, int, List[dict]]] = {}
+
+    def _observe(self, conv: Conversation, msg: Message) -> None:
+        acc = self._contexts.get(conv.conversation_id)
+        if acc is not None:
+            acc.observe(msg)
+
+    def _cached_chat_context(self, conv: Conversation) -> Optional[ChatContextAccumulator]:
+        acc = self._contexts.get(conv.conversation_id)
+        version = getattr(conv.answers, "version", None)
+        if acc is not None and (version is None or acc.answers_version != version):
+            acc.reset_answers(self.build_questionnaire_answers(conv), version)
+        return acc
+
+    def _new_chat_context(self, conv: Conversation, transcript: Sequence[Message]) -> ChatContextAccumulator:
+        # First chat turn for this conversation in this process: one scan, then incremental
+        acc = ChatContextAccumulator.from_history(as_view(transcript).filter(mode="chat"),
+                                                  self.build_questionnaire_answers(conv),
+                                                  getattr(conv.answers, "version", None))
+        self._contexts[conv.conversation_id] = acc
+        return acc
+
+    def forget(self, conversation_id: str) -> None:
+        """Drop cached per-conversation state (the transcript itself stays in the store)."""
+        self._contexts.pop(conversation_id, None)
+        self._answers_cache.pop(conversation_id, None)
+        self.question_flow.forget(conversation_id)
+        if self.running_summary is not None:
+            self.running_summary.forget(conversation_id)
+
+    def _end_turn(self, conv: Conversation, res: OrchestratorResult) -> OrchestratorResult:
+        if self.running_summary is not None and self.template_path:
+            self.running_summary.notify(conv.conversation_id, *self._summary_plan(conv, self._load_template()))
+        return res
+
+    def _current_question_step(self, conv: Conversation) -> Tuple[Message, OrchestratorResult]:
         q = self.question_flow.get_question(conv)
         if not q:
             conv.state = ConversationState.DONE
-            self.store.append(conv.conversation_id, Message(role=Role.SYSTEM, content="Questionnaire complete."))
-            return OrchestratorResult(bot_text="Questionnaire complete.", done=True)
+            return (Message(role=Role.SYSTEM, content="Questionnaire complete."),
+                    OrchestratorResult(bot_text="Questionnaire complete.", done=True))
 
         conv.state = ConversationState.FLOW_WAITING_ANSWER
         conv.active_question_id = q.id
-        self.store.append(conv.conversation_id, Message(
+        msg = Message(
             role=Role.SYSTEM,
             content=q.text,
             meta={"question_id": q.id, "channel": "questionnaire"}
-        ))
-        return OrchestratorResult(bot_text=q.text)
-
-
-    def start(self, conv: Conversation) -> OrchestratorResult:
-        return self._ask_current_question(conv)
-
-
-    def handle_user_message(self, conv: Conversation, user_text: str, mode: Mode = Mode.ANSWER) -> OrchestratorResult:
-        # Always store patient message
-        self.store.append(conv.conversation_id,
-                          Message(role=Role.PATIENT, content=user_text, meta={"mode": mode.value}))
-
-        # NEW: handle chat interruptions
-        if mode == Mode.CHAT:
-            if not self.chatbot:
-                self.store.append(conv.conversation_id, Message(role=Role.ASSISTANT, content="Chatbot not available."))
-                return self._ask_current_question(conv)
-
-            conv.state = ConversationState.CHAT_MODE
-            transcript = self.store.get(conv.conversation_id)
-
-            current_q = self.question_flow.get_question(conv)
-            answered = self.build_questionnaire_answers(conv)
-
-            answered_lines = "\n".join(
-                f"- {x['question']} -> {x['answer']}" for x in answered
-            ) or "None yet."
-
-            ctx = (
-                f"IMPORTANT CONTEXT:\n"
-                f"The patient is currently being asked this standardized question:\n"
-                f"  → \"{current_q.text}\" (question id: {current_q.id})\n\n"
-                f"When the patient asks 'why do you need to know this?' or 'why are you asking this?' or refers to 'this question', "
-                f"they are referring to THIS CURRENT QUESTION: \"{current_q.text}\"\n\n"
-                f"Previously answered standardized questions:\n{answered_lines}\n\n"
-                f"If the patient asks what has been asked/answered so far, refer to the list above."
-            )
-
-            answer = self.chatbot.answer(user_text=user_text, transcript=transcript, context=ctx)
-
-            self.store.append(
-                conv.conversation_id,
-                Message(role=Role.ASSISTANT, content=answer, meta={"mode": "chat"})
-            )
-
-            # 2) Return to flow (same question_index), but return BOTH texts to the UI
-            q = self.question_flow.get_question(conv)
-            if not q:
-                conv.state = ConversationState.DONE
-                return OrchestratorResult(bot_text=answer + "\n\nQuestionnaire complete.", done=True)
-
-            conv.state = ConversationState.FLOW_WAITING_ANSWER
-            conv.active_question_id = q.id
-
-            # Store that we are re-showing the current question
-            self.store.append(
-                conv.conversation_id,
-                Message(role=Role.SYSTEM, content=q.text, meta={"question_id": q.id, "reask": True})
-            )
-
-            combined = f"{answer}\n\n---\nBack to the questionnaire:\n{q.text}"
-            return OrchestratorResult(bot_text=combined, done=False)
+        )
+        return msg, OrchestratorResult(bot_text=q.text)
 
+    def _record_answer(self, conv: Conversation, user_text: str) -> None:
         # ANSWER branch (standardized flow)
         if conv.state != ConversationState.FLOW_WAITING_ANSWER:
             conv.state = ConversationState.FLOW_WAITING_ANSWER
 
         qid = conv.active_question_id
         if qid:
+            q = self.question_flow.get_question(conv)
+            # Typed questions (yesno/number/choice) are parsed here, so the summarizer never has to
+            parsed = parse_answer(q, user_text) if q is not None and q.id == qid else None
+            if parsed is not None and parsed.ok:
+                conv.parsed_answers[qid] = parsed
+            else:
+                conv.parsed_answers.pop(qid, None)
             conv.answers[qid] = user_text
+            acc = self._contexts.get(conv.conversation_id)
+            if acc is not None and q is not None and q.id == qid:
+                acc.record_answer(q, user_text, getattr(conv.answers, "version", None))
 
         # Advance to next question
         self.question_flow.advance_with_answer(conv, user_text)
 
-        # Ask next (or finish)
-        return self._ask_current_question(conv)
+    def _build_chat_context(self, conv: Conversation, acc: ChatContextAccumulator) -> ChatContext:
+        current_q = self.question_flow.get_question(conv)
+        answered_lines = acc.answered_block()
+
+        current = (
+            f"IMPORTANT CONTEXT:\n"
+            f"The patient is currently being asked this standardized question:\n"
+            f"  → \"{current_q.text}\" (question id: {current_q.id})\n\n"
+            f"When the patient asks 'why do you need to know this?' or 'why are you asking this?' or refers to 'this question', "
+            f"they are referring to THIS CURRENT QUESTION: \"{current_q.text}\""
+        )
+        full = (
+            f"{current}\n\n"
+            f"Previously answered standardized questions:\n{answered_lines}\n\n"
+            f"If the patient asks what has been asked/answered so far, refer to the list above."
+        )
+        return ChatContext(full, conversation_id=conv.conversation_id, question_id=current_q.id, shared=current)
+
+    def _chat_reply_step(self, conv: Conversation, answer: str,
+                         incomplete: bool = False) -> Tuple[List[Message], OrchestratorResult]:
+        # incomplete: the stream broke off (client gone, chatbot error); the partial reply is kept and marked
+        meta = {"mode": "chat", "incomplete": True} if incomplete else {"mode": "chat"}
+        to_store = [Message(role=Role.ASSISTANT, content=answer, meta=meta)]
+
+        # 2) Return to flow (same question_index), but return BOTH texts to the UI
+        q = self.question_flow.get_question(conv)
+        if not q:
+            conv.state = ConversationState.DONE
+            return to_store, OrchestratorResult(bot_text=answer + "\n\nQuestionnaire complete.", done=True)
 
-    def finalize(self, conv: Conversation) -> dict:
-        if not self.summarizer:
-            raise RuntimeError("Summarizer not configured.")
-        if not self.template_path:
-            raise RuntimeError("template_path not configured.")
+        conv.state = ConversationState.FLOW_WAITING_ANSWER
+        conv.active_question_id = q.id
 
-        with open(self.template_path, "r", encoding="utf-8") as f:
-            template = json.load(f)
+        # Store that we are re-showing the current question
+        to_store.append(Message(role=Role.SYSTEM, content=q.text, meta={"question_id": q.id, "reask": True}))
 
-        transcript = self.store.get(conv.conversation_id)
-        summary = self.summarizer.summarize(transcript=transcript, schema=template)
+        combined = f"{answer}\n\n---\nBack to the questionnaire:\n{q.text}"
+        return to_store, OrchestratorResult(bot_text=combined, done=False)
 
+    def _load_template(self) -> LoadedSchema:
+        if not self.template_path:
+            raise RuntimeError("template_path not configured.")
+        # Parsed once and reused until the file changes; summarizers must not mutate it
+        return self.schemas.load(self.template_path)
+
+    def _summary_plan(self, conv: Conversation, template: LoadedSchema) -> Tuple[Dict[str, Any], List[str]]:
+        '''What: The schema the summarizer fills and the questions whose messages it does not need, once parsed typed
+        answers are taken out.
+        Why: A schema field marked "x-from-question" whose answer parsed needs no model, and an answer that said
+        nothing beyond its value needs no prompt lines; _complete_summary puts the values in.'''
+        parsed = conv.parsed_answers
+        if not parsed:
+            return template.llm_document, []
+        schema = self.schemas.without_answered(template, [q for q in parsed if q in template.question_fields])
+        return schema, [q for q, p in parsed.items() if p.complete]
+
+    def _summary_input(self, conv: Conversation, transcript: Sequence[Message],
+                       template: LoadedSchema) -> Tuple[Sequence[Message], Dict[str, Any]]:
+        """The transcript and schema for a one-shot summary (see _summary_plan)."""
+        schema, done = self._summary_plan(conv, template)
+        return (without_parsed_answers(transcript, done) if done else transcript), schema
+
+    def _complete_summary(self, conv: Conversation, summary: Dict[str, Any], transcript: Sequence[Message],
+                          template: Optional[LoadedSchema] = None) -> dict:
         # Deterministic questionnaire answers:
         summary["questionnaire_answers"] = self.build_questionnaire_answers(conv)
 
+        if template is not None:
+            for qid, (path, value_map) in template.question_fields.items():
+                parsed = conv.parsed_answers.get(qid)
+                if parsed is not None:
+                    set_path(summary, path, value_map.get(str(parsed.value), parsed.value))
+
         summary["patient_questions"] = self.build_patient_questions(transcript)
 
+        if template is not None and template.deterministic_fields:
+            # The model never saw these fields; put them back in schema order
+            order = template.json_schema.get("properties", {})
+            summary = {**{k: summary[k] for k in order if k in summary}, **summary}
+
         return summary
 
     def build_questionnaire_answers(self, conv: Conversation) -> list[dict]:
         '''What: Pair each question’s id/text with conv.answers[id].
-        Why: 100% correct, no hallucination.'''
+        Why: 100% correct, no hallucination.
+        One pass over the flow's ordered questions, cached until conv.answers changes.'''
+        answers = conv.answers
+        version = getattr(answers, "version", None)
+        cached = self._answers_cache.get(conv.conversation_id)
+        if cached is not None and version is not None and cached[0] == id(answers) and cached[1] == version:
+            return list(cached[2])
+
+        parsed = conv.parsed_answers
         items = []
-        # iterate all questions in order using question_flow adapter data
-        idx = 0
-        while True:
-            tmp = type(conv)(conversation_id=conv.conversation_id)  # make a lightweight clone
-            tmp.question_index = idx
-            q = self.question_flow.get_question(tmp)
-            if not q:
-                break
-            ans = conv.answers.get(q.id)
-            if ans is not None:
-                items.append({"question_id": q.id, "question": q.text, "answer": ans})
-            idx += 1
-        return items
-
-    def build_patient_questions(self, transcript: list[Message]) -> list[dict]:
+        for q in self.question_flow.questions():
+            if q.id not in answers:
+                continue
+            item = {"question_id": q.id, "question": q.text, "answer": answers[q.id]}
+            p = parsed.get(q.id)
+            if p is not None:
+                item["value"] = p.value
+                if p.unit:
+                    item["unit"] = p.unit
+            items.append(item)
+        if version is not None:
+            self._answers_cache[conv.conversation_id] = (id(answers), version, items)
+        return list(items)
+
+    def build_patient_questions(self, transcript: Sequence[Message]) -> list[dict]:
         out = []
         pending_q = None
-        for m in transcript:
-            mode = (m.meta or {}).get("mode")
-            if m.role == Role.PATIENT and mode == "chat":
+        for m in as_view(transcript).filter(mode="chat"):
+            if m.role == Role.PATIENT:
                 pending_q = m.content
-            elif m.role == Role.ASSISTANT and mode == "chat" and pending_q is not None:
+            elif m.role == Role.ASSISTANT and pending_q is not None:
                 out.append({"question": pending_q, "answer": m.content})
                 pending_q = None
         # if last question had no answer, keep it with empty answer
         if pending_q is not None:
             out.append({"question": pending_q, "answer": ""})
         return out
+
+
+class ConversationOrchestrator(BaseOrchestrator):
+    def __init__(self, question_flow: IQuestionFlow, transcript_store: ITranscriptStore, chatbot:Optional[IChatbot] = None, summarizer: Optional[ISummarizer] = None, template_path: Optional[str] = None, schema_registry: Optional[SchemaRegistry] = None, running_summary: Optional[RunningSummary] = None):
+        super().__init__(question_flow, template_path, schema_registry, running_summary)
+        self.store = transcript_store
+        self.chatbot = chatbot
+        self.summarizer = summarizer
+
+
+    def _append(self, conv: Conversation, msg: Message) -> None:
+        self.store.append(conv.conversation_id, msg)
+        self._observe(conv, msg)
+
+    def _chat_context(self, conv: Conversation) -> ChatContextAccumulator:
+        return self._cached_chat_context(conv) or self._new_chat_context(conv, self.store.view(conv.conversation_id))
+
+    def _ask_current_question(self, conv: Conversation) -> OrchestratorResult:
+        msg, res = self._current_question_step(conv)
+        self._append(conv, msg)
+        return res
+
+
+    def start(self, conv: Conversation) -> OrchestratorResult:
+        return self._ask_current_question(conv)
+
+
+    def handle_user_message(self, conv: Conversation, user_text: str, mode: Mode = Mode.ANSWER) -> OrchestratorResult:
+        # Always store patient message
+        self._append(conv, Message(role=Role.PATIENT, content=user_text, meta={"mode": mode.value}))
+
+        # NEW: handle chat interruptions
+        if mode == Mode.CHAT:
+            if not self.chatbot:
+                self._append(conv, Message(role=Role.ASSISTANT, content="Chatbot not available."))
+                return self._end_turn(conv, self._ask_current_question(conv))
+
+            conv.state = ConversationState.CHAT_MODE
+            acc = self._chat_context(conv)
+            ctx = self._build_chat_context(conv, acc)
+
+            # The chatbot only needs the recent chat exchanges, not the whole transcript
+            answer = self.chatbot.answer(user_text=user_text, transcript=list(acc.window), context=ctx)
+            return self._end_turn(conv, self._finish_chat(conv, answer))
+
+        self._record_answer(conv, user_text)
+
+        # Ask next (or finish)
+        return self._end_turn(conv, self._ask_current_question(conv))
+
+    def handle_user_message_stream(self, conv: Conversation, user_text: str, mode: Mode = Mode.ANSWER) -> Generator[str, None, OrchestratorResult]:
+        '''What: Same as handle_user_message, but yields the bot text in chunks as the chatbot produces them.
+        Why: Time-to-first-token is what the patient notices; the full answer is still stored once the stream closes.
+        The OrchestratorResult is the generator's return value (use `yield from` to get it). A stream that is closed
+        early or fails stores what was said so far, marked "incomplete", and goes back to the current question.'''
+        if mode != Mode.CHAT or not isinstance(self.chatbot, IStreamingChatbot):
+            res = self.handle_user_message(conv, user_text, mode=mode)
+            if res.bot_text:
+                yield res.bot_text
+            return res
+
+        self._append(conv, Message(role=Role.PATIENT, content=user_text, meta={"mode": mode.value}))
+
+        conv.state = ConversationState.CHAT_MODE
+        acc = self._chat_context(conv)
+        ctx = self._build_chat_context(conv, acc)
+
+        parts = []
+        try:
+            for token in self.chatbot.answer_stream(user_text=user_text, transcript=list(acc.window), context=ctx):
+                parts.append(token)
+                yield token
+        except BaseException:  # GeneratorExit when the client goes away, or the chatbot failed mid-reply
+            # The transcript must not end on a patient turn without a reply
+            self._end_turn(conv, self._finish_chat(conv, "".join(parts), incomplete=True))
+            raise
+
+        answer = "".join(parts)
+        res = self._end_turn(conv, self._finish_chat(conv, answer))
+        # The UI already has the answer; only send what comes after it
+        tail = res.bot_text[len(answer):]
+        if tail:
+            yield tail
+        return res
+
+    def _finish_chat(self, conv: Conversation, answer: str, incomplete: bool = False) -> OrchestratorResult:
+        to_store, res = self._chat_reply_step(conv, answer, incomplete)
+        for msg in to_store:
+            self._append(conv, msg)
+        return res
+
+    def finalize(self, conv: Conversation) -> dict:
+        if not self.summarizer and not self.running_summary:
+            raise RuntimeError("Summarizer not configured.")
+        template = self._load_template()
+
+        transcript = self.store.view(conv.conversation_id)
+        summary = None
+        if self.running_summary is not None:
+            # Usually already folded in the background; this only catches up on the last turn if needed
+            summary = self.running_summary.result(conv.conversation_id, *self._summary_plan(conv, template))
+        if summary is None:
+            if not self.summarizer:
+                raise RuntimeError("Summarizer not configured.")
+            # Fields marked "x-deterministic" or answered by a parsed typed answer are left out of what the model generates
+            llm_transcript, schema = self._summary_input(conv, transcript, template)
+            summary = self.summarizer.summarize(transcript=llm_transcript, schema=schema)
+        if self.running_summary is not None:
+            # The conversation is summarized for good: its checkpoint must not outlive it
+            self.running_summary.discard(conv.conversation_id)
+
+        return self._complete_summary(conv, summary, transcript, template)
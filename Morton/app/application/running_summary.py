@@ -0,0 +1,152 @@
+'''What: A per-conversation summary that a background worker keeps up to date while the interview runs.
+Why: finalize used to summarize the whole transcript in one large LLM call after the last answer; with this,
+each turn is folded in while the patient reads the next question, and finalize only catches up and reconciles.'''
+
+from __future__ import annotations
+import json
+import os
+import queue
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Sequence
+from urllib.parse import quote
+
+from app.adapters.template_schema import fill_required
+from app.domain.transcript_view import without_parsed_answers
+from app.interfaces.summarizer import IIncrementalSummarizer
+from app.interfaces.transcript_store import ITranscriptStore
+
+
+class _State:
+    __slots__ = ("summary", "folded", "question_id", "lock")
+
+    def __init__(self, summary: Optional[Dict[str, Any]] = None, folded: int = 0, question_id: Optional[str] = None):
+        self.summary = summary
+        self.folded = folded            # number of transcript messages already in the summary
+        self.question_id = question_id  # last question asked in those messages
+        self.lock = threading.Lock()    # held while a fold is running
+
+
+class RunningSummary:
+    """
+    - notify(cid, schema, skip_questions): queue a catch-up for the conversation (cheap; called after every turn).
+    - result(cid, schema, skip_questions): wait for a running fold, fold whatever is still missing, return the summary.
+    - skip_questions: questions whose answer messages the model does not need (answers parsed deterministically,
+      see BaseOrchestrator._summary_plan); they are left out of what is folded, as in a one-shot summary.
+    - forget / discard: drop the in-memory state / also its checkpoint.
+    - checkpoint_dir: when set, every fold is written to <dir>/<conversation id>.json (atomic replace)
+      and read back after a restart, so a crash only loses the folds that had not finished.
+
+    Progress is tracked as a message count, and the worker reads the new messages from the store
+    itself, so a lost notification or a restart never leaves a gap: the next fold picks it up.
+    """
+
+    def __init__(self, summarizer: IIncrementalSummarizer, store: ITranscriptStore, checkpoint_dir: Optional[str] = None):
+        self.summarizer = summarizer
+        self.store = store
+        self.checkpoint_dir = checkpoint_dir
+        if checkpoint_dir:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+        self.folds = 0
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+        self._states: Dict[str, _State] = {}
+        self._states_lock = threading.Lock()
+        self._pending: set[str] = set()
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="running-summary", daemon=True)
+        self._worker.start()
+
+    def _checkpoint_path(self, conversation_id: str) -> str:
+        return os.path.join(self.checkpoint_dir, quote(conversation_id, safe="") + ".json")
+
+    def _state(self, conversation_id: str) -> _State:
+        with self._states_lock:
+            state = self._states.get(conversation_id)
+            if state is None:
+                state = _State()
+                if self.checkpoint_dir and os.path.exists(self._checkpoint_path(conversation_id)):
+                    with open(self._checkpoint_path(conversation_id), "r", encoding="utf-8") as f:
+                        saved = json.load(f)
+                    state = _State(saved["summary"], saved["folded"], saved.get("question_id"))
+                self._states[conversation_id] = state
+            return state
+
+    def _save(self, conversation_id: str, state: _State) -> None:
+        path = self._checkpoint_path(conversation_id)
+        # A unique temporary name: another process folding the same conversation never writes into this file
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=self.checkpoint_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"folded": state.folded, "question_id": state.question_id, "summary": state.summary}, f,
+                          ensure_ascii=False)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def _catch_up(self, conversation_id: str, schema: Dict[str, Any], skip_questions: Sequence[str] = ()) -> _State:
+        state = self._state(conversation_id)
+        with state.lock:
+            new_messages = self.store.get_since(conversation_id, state.folded)
+            if new_messages:
+                to_fold = (without_parsed_answers(new_messages, skip_questions, state.question_id)
+                           if skip_questions else new_messages)
+                if to_fold:
+                    state.summary = self.summarizer.update(state.summary, to_fold, schema)
+                    self.folds += 1
+                state.folded += len(new_messages)
+                state.question_id = next((m.meta["question_id"] for m in reversed(new_messages)
+                                          if (m.meta or {}).get("question_id") is not None), state.question_id)
+                if self.checkpoint_dir:
+                    self._save(conversation_id, state)
+        return state
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            conversation_id, schema, skip_questions = item
+            with self._states_lock:
+                if conversation_id not in self._pending:
+                    continue  # discarded while queued
+                self._pending.discard(conversation_id)
+            try:
+                self._catch_up(conversation_id, schema, skip_questions)
+            except Exception as e:  # finalize retries the fold in the caller's thread
+                self.errors += 1
+                self.last_error = e
+
+    def notify(self, conversation_id: str, schema: Dict[str, Any], skip_questions: Sequence[str] = ()) -> None:
+        with self._states_lock:
+            if conversation_id in self._pending:
+                return
+            self._pending.add(conversation_id)
+        self._queue.put((conversation_id, schema, tuple(skip_questions)))
+
+    def result(self, conversation_id: str, schema: Dict[str, Any],
+               skip_questions: Sequence[str] = ()) -> Optional[Dict[str, Any]]:
+        """
+        The up-to-date summary, or None if the conversation has no messages. Reconciliation is cheap:
+        fields no turn ever mentioned are filled in with empty/unknown values, no extra LLM call.
+        """
+        summary = self._catch_up(conversation_id, schema, skip_questions).summary
+        return fill_required(summary, schema) if summary is not None else None
+
+    def forget(self, conversation_id: str) -> None:
+        """Drop the in-memory state; a checkpoint stays and is read back on next use."""
+        with self._states_lock:
+            self._states.pop(conversation_id, None)
+
+    def discard(self, conversation_id: str) -> None:
+        """Drop the state and its checkpoint (the conversation is finished or deleted)."""
+        with self._states_lock:
+            self._states.pop(conversation_id, None)
+            self._pending.discard(conversation_id)
+        if self.checkpoint_dir and os.path.exists(self._checkpoint_path(conversation_id)):
+            os.remove(self._checkpoint_path(conversation_id))
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._worker.join()
@@ -0,0 +1,185 @@
+'''What: Keep live Conversations by id, each with its own asyncio.Lock; with a session store, keep only the
+recently used ones in memory and restore the rest on demand.
+Why: Two requests for the same session must not interleave (they share question_index/state),
+while different sessions should run fully in parallel. Without a store every session stayed in memory until
+deleted; with one, each turn is saved, idle and least recently used sessions are dropped, and the next
+request restores them - memory stays flat under load and another (or a restarted) worker can continue.
+A hot copy is checked against the stored revision before use, so a conversation that another worker moved on
+is reloaded rather than overwritten with stale state. Requests for one conversation on two workers at the
+same moment are not serialized (the lock is per process): the later save wins.
+Store calls are awaited; with offload=True they run in a worker thread (as AsyncTranscriptStore does), so a
+slow disk read for one conversation does not stall the event loop and every open stream with it.'''
+
+from __future__ import annotations
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+from app.domain.models import Conversation
+from app.interfaces.session_store import ISessionStore
+
+
+class UnknownConversationError(KeyError):
+    """No such conversation in memory or in the store."""
+
+
+class SessionRegistry:
+    """
+    - store: where snapshots go (app/adapters/session_store_file.py / session_store_sqlite.py);
+      without one, sessions live in memory until remove()
+    - max_hot: most conversations kept in memory (least recently used go first)
+    - idle_s: drop conversations not used for this long (checked whenever the registry is used, or call evict())
+    - on_evict(conversation_id): called when a conversation leaves memory or is reloaded, e.g. orchestrator.forget
+    - verify_hot: compare a hot conversation's revision with the store's before using it (one small read
+      per request); False skips that read when every request for a conversation reaches this worker
+      (sticky routing, or a single worker)
+    - offload: run store calls in a worker thread (set it for file and SQLite stores)
+
+    Serve each request inside `async with sessions.use(cid) as conv:` - it takes the conversation's lock,
+    restores it if it was evicted and saves it afterwards (UnknownConversationError if there is none). A conversation is never evicted while a request
+    holds or waits for it.
+    """
+
+    def __init__(self, store: Optional[ISessionStore] = None, max_hot: Optional[int] = None,
+                 idle_s: Optional[float] = None, on_evict: Optional[Callable[[str], None]] = None,
+                 clock: Callable[[], float] = time.monotonic, verify_hot: bool = True, offload: bool = False):
+        if store is None and (max_hot is not None or idle_s is not None):
+            raise ValueError("max_hot/idle_s need a store to evict to")
+        self.store = store
+        self.max_hot = max_hot
+        self.idle_s = idle_s
+        self.on_evict = on_evict
+        self.verify_hot = verify_hot
+        self.offload = offload
+        self._clock = clock
+        self._sessions: "OrderedDict[str, Conversation]" = OrderedDict()  # least recently used first
+        self._last_used: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._pins: Dict[str, int] = {}  # requests holding or waiting for the conversation
+        self.restores = 0
+        self.evictions = 0
+        self.stale_reloads = 0  # hot copies replaced because another worker saved a newer revision
+
+    async def _store_call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.offload:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def create(self, conversation_id: Optional[str] = None) -> Conversation:
+        cid = conversation_id or str(uuid.uuid4())
+        async with self.lock(cid):
+            if cid in self._sessions or (conversation_id and self.store is not None
+                                         and await self._store_call(self.store.load, cid)):
+                raise KeyError(f"Conversation {cid} already exists.")
+            conv = Conversation(conversation_id=cid)
+            self._admit(conv)
+            await self.save(conv)
+        return conv
+
+    async def get(self, conversation_id: str, verify: bool = True) -> Optional[Conversation]:
+        """
+        The conversation, restored from the store if it is not in memory; None if there is none.
+        verify=False trusts a hot copy without reading its stored revision (a quick check before use()).
+        """
+        conv = self._sessions.get(conversation_id)
+        if conv is not None and self.store is not None and self.verify_hot and verify:
+            stored = await self._store_call(self.store.revision, conversation_id)
+            if stored != conv.revision:
+                # Saved by another worker since (or removed there): drop the copy and its cached state
+                if self._sessions.get(conversation_id) is conv:
+                    self._drop(conversation_id)
+                self.stale_reloads += 1
+                conv = None
+                if stored is None:
+                    return None
+        if conv is not None:
+            self._sessions.move_to_end(conversation_id)
+            self._last_used[conversation_id] = self._clock()
+            return conv
+        if self.store is None:
+            return None
+        conv = await self._store_call(self.store.load, conversation_id)
+        if conv is None:
+            return None
+        if conversation_id in self._sessions:  # restored by another request while this one read the store
+            return self._sessions[conversation_id]
+        self.restores += 1
+        self._admit(conv)
+        return conv
+
+    async def save(self, conv: Conversation) -> None:
+        if self.store is not None:
+            conv.revision += 1
+            await self._store_call(self.store.save, conv)
+
+    def lock(self, conversation_id: str) -> asyncio.Lock:
+        return self._locks.setdefault(conversation_id, asyncio.Lock())
+
+    @asynccontextmanager
+    async def use(self, conversation_id: str) -> AsyncIterator[Conversation]:
+        """Lock, get (restoring if needed), yield, save. Raises UnknownConversationError for an unknown conversation."""
+        self._pins[conversation_id] = self._pins.get(conversation_id, 0) + 1
+        try:
+            async with self.lock(conversation_id):
+                conv = await self.get(conversation_id)
+                if conv is None:
+                    raise UnknownConversationError(f"Unknown conversation {conversation_id}.")
+                try:
+                    yield conv
+                finally:
+                    if self._sessions.get(conversation_id) is conv:  # not removed meanwhile
+                        await self.save(conv)
+        finally:
+            pins = self._pins.pop(conversation_id) - 1
+            if pins:
+                self._pins[conversation_id] = pins
+            self.evict()
+
+    async def remove(self, conversation_id: str) -> bool:
+        """Drop the conversation from memory and the store. False if it did not exist."""
+        known = self._sessions.pop(conversation_id, None) is not None
+        self._last_used.pop(conversation_id, None)
+        self._locks.pop(conversation_id, None)
+        if self.store is not None:
+            known = known or await self._store_call(self.store.revision, conversation_id) is not None
+            await self._store_call(self.store.delete, conversation_id)
+        return known
+
+    def evict(self) -> int:
+        """Drop idle and over-capacity conversations from memory (they stay in the store). Returns how many."""
+        if self.store is None:
+            return 0
+        over = len(self._sessions) - self.max_hot if self.max_hot is not None else 0
+        idle_before = self._clock() - self.idle_s if self.idle_s is not None else None
+        victims = []
+        for cid in self._sessions:  # oldest use first, so the idle ones come first too
+            if len(victims) >= over and (idle_before is None or self._last_used[cid] > idle_before):
+                break
+            lock = self._locks.get(cid)
+            if cid not in self._pins and (lock is None or not lock.locked()):
+                victims.append(cid)
+        for cid in victims:
+            self._drop(cid)
+            self._locks.pop(cid, None)
+            self.evictions += 1
+        return len(victims)
+
+    def _drop(self, conversation_id: str) -> None:
+        del self._sessions[conversation_id]
+        del self._last_used[conversation_id]
+        if self.on_evict is not None:
+            self.on_evict(conversation_id)
+
+    def _admit(self, conv: Conversation) -> None:
+        self._sessions[conv.conversation_id] = conv
+        self._last_used[conv.conversation_id] = self._clock()
+        self.evict()
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -0,0 +1,153 @@
+'''What: Parse and normalize answers to typed questions (yesno, number, choice) without a model call.
+Why: "Ja", "yes, twice" or "54 år" have one obvious meaning; parsing them here gives exact values for the
+summary and leaves only genuinely free text for the LLM.'''
+
+from __future__ import annotations
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from app.domain.models import Question
+
+
+@dataclass(frozen=True)
+class ParsedAnswer:
+    ok: bool
+    value: Any = None            # "yes"/"no", int/float, or the matching choice
+    unit: Optional[str] = None   # canonical unit for numbers, if the answer or question had one
+    error: Optional[str] = None  # why the answer could not be used as-is
+    complete: bool = True        # False if the answer says more than the value ("yes, and I felt sick after")
+
+
+# English and Danish; a leading word decides ("yes, twice" -> yes, "nej tak" -> no)
+_YES = {"yes", "y", "yeah", "yep", "yup", "sure", "correct", "true", "ja", "jo", "jep", "jah", "korrekt", "rigtigt"}
+_NO = {"no", "n", "nope", "nah", "never", "false", "nej", "nix", "aldrig", "ikke"}
+_YES_PHRASES = ("of course", "i have", "i do", "selvfølgelig", "det har jeg", "det gør jeg")
+_NO_PHRASES = ("not at all", "i have not", "i havent", "i dont", "i do not", "slet ikke", "har ikke", "det har jeg ikke")
+# A negation anywhere turns "I have never had anesthesia" into no, and makes "yes, but not ..." unparsed
+# (_norm drops apostrophes, so "haven't" arrives as "havent")
+_NEGATIONS = {
+    "not", "never", "no", "none", "nothing", "ikke", "aldrig", "ingen", "intet",
+    "dont", "doesnt", "didnt", "havent", "hasnt", "hadnt", "isnt", "wasnt", "arent", "werent", "cant", "cannot",
+    "wont", "wouldnt", "couldnt", "shouldnt",
+}
+# "I don't know" is neither yes nor no; these stay with the LLM (or get the question asked again)
+_UNSURE = re.compile(
+    r"\b(dont know|do not know|dont remember|do not remember|cant remember|not sure|unsure|no idea|maybe|perhaps"
+    r"|ved ikke|ved det ikke|ikke sikker|usikker|kan ikke huske|husker ikke|aner det ikke|ingen anelse|måske)\b"
+)
+
+# unit word -> (canonical unit, factor to it)
+_UNITS: Dict[str, Tuple[str, float]] = {
+    "year": ("years", 1), "years": ("years", 1), "yr": ("years", 1), "yrs": ("years", 1), "y": ("years", 1),
+    "år": ("years", 1), "aar": ("years", 1),
+    "month": ("months", 1), "months": ("months", 1), "måned": ("months", 1), "måneder": ("months", 1),
+    "kg": ("kg", 1), "kilo": ("kg", 1), "kilos": ("kg", 1), "g": ("kg", 0.001), "lb": ("kg", 0.45359237),
+    "lbs": ("kg", 0.45359237), "pounds": ("kg", 0.45359237),
+    "cm": ("cm", 1), "m": ("cm", 100), "meter": ("cm", 100), "mm": ("cm", 0.1),
+    "cigarettes": ("cigarettes", 1), "cigaretter": ("cigarettes", 1),
+    "units": ("units", 1), "genstande": ("units", 1),
+}
+_NUMBER = re.compile(r"(-?\d+(?:[.,]\d+)?)\s*([a-zæøå]+)?")
+# Words that add nothing to a parsed value ("yes I have", "I am 54 years old", "ja det har jeg")
+_FILLER = {
+    "i", "im", "am", "have", "has", "had", "do", "did", "it", "that", "is", "was", "please", "thanks", "thank", "you",
+    "old", "about", "around", "approximately", "roughly", "exactly", "of", "course", "not", "at", "all", "sir",
+    "jeg", "er", "har", "det", "gør", "tak", "gammel", "cirka", "ca", "omkring", "ikke", "slet", "selvfølgelig",
+}
+_WORD_NUMBERS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9,
+    "ten": 10, "nul": 0, "en": 1, "et": 1, "to": 2, "tre": 3, "fire": 4, "fem": 5, "seks": 6, "syv": 7, "otte": 8,
+    "ni": 9, "ti": 10,
+}
+# Also everyday words ("not to say", "en uge"): a number only when they are the whole answer, or it plus a unit
+_BARE_WORD_NUMBERS = {"en", "et", "to"}
+
+
+def _norm(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).casefold().strip()
+    text = re.sub(r"['’`]", "", text)  # "haven't" -> "havent", "I'm" -> "im": keeps the word whole
+    return " ".join(re.sub(r"[^\w\s.,-]", " ", text).split())
+
+
+def parse_yesno(text: str) -> ParsedAnswer:
+    t = _norm(text)
+    words = t.replace(",", " ").replace(".", " ").split()
+    if not words:
+        return ParsedAnswer(False, error="empty answer")
+    if _UNSURE.search(t):
+        return ParsedAnswer(False, error="uncertain answer")
+    negated = any(w in _NEGATIONS for w in words)
+    if any(t.startswith(p) for p in _NO_PHRASES) or words[0] in _NO or (negated and words[0] not in _YES):
+        # "I have never had anesthesia": a negation anywhere beats the "i have" prefix
+        return ParsedAnswer(True, "no", complete=all(w in _FILLER or w in _NEGATIONS for w in words[1:]))
+    if negated:  # "yes, but not since 2010"
+        return ParsedAnswer(False, error="not a yes/no answer")
+    if any(t.startswith(p) for p in _YES_PHRASES) or words[0] in _YES:
+        return ParsedAnswer(True, "yes", complete=all(w in _FILLER for w in words[1:]))
+    return ParsedAnswer(False, error="not a yes/no answer")
+
+
+def parse_number(text: str, validation: Optional[Dict[str, Any]] = None) -> ParsedAnswer:
+    validation = validation or {}
+    t = _norm(text)
+    m = _NUMBER.search(t)
+    if m:
+        number = float(m.group(1).replace(",", "."))
+        unit_word = m.group(2)
+        rest = (t[:m.start()] + " " + t[m.end():]).split()
+    else:
+        words = t.replace(",", " ").replace(".", " ").split()
+        bare = 1 <= len(words) <= 2 and words[0] in _WORD_NUMBERS and words[-1] in (words[0], *_UNITS)
+        i = 0 if bare else next((i for i, w in enumerate(words)
+                                 if w in _WORD_NUMBERS and w not in _BARE_WORD_NUMBERS), None)
+        if i is None:
+            return ParsedAnswer(False, error="no number found")
+        number = float(_WORD_NUMBERS[words[i]])
+        unit_word = words[i + 1] if i + 1 < len(words) and words[i + 1] in _UNITS else None
+        rest = words[:i] + words[i + 1:]
+    complete = all(w in _FILLER or w in _UNITS for w in rest)
+
+    unit = validation.get("unit")
+    if unit_word in _UNITS:
+        canonical, factor = _UNITS[unit_word]
+        if unit and canonical != unit:
+            return ParsedAnswer(False, error=f"expected {unit}, got {canonical}")
+        number, unit = number * factor, canonical
+
+    value: Any = int(number) if number.is_integer() and validation.get("integer", True) else round(number, 3)
+    if "min" in validation and value < validation["min"]:
+        return ParsedAnswer(False, value, unit, error=f"below {validation['min']}")
+    if "max" in validation and value > validation["max"]:
+        return ParsedAnswer(False, value, unit, error=f"above {validation['max']}")
+    return ParsedAnswer(True, value, unit, complete=complete)
+
+
+def parse_choice(text: str, choices: Optional[list]) -> ParsedAnswer:
+    if not choices:
+        return ParsedAnswer(False, error="question has no choices")
+    t = _norm(text)
+    normalized = [_norm(c) for c in choices]
+    if t in normalized:
+        return ParsedAnswer(True, choices[normalized.index(t)])
+    if t.isdigit() and 1 <= int(t) <= len(choices):  # "2" = the second option
+        return ParsedAnswer(True, choices[int(t) - 1])
+    # a unique choice mentioned in the answer, or a unique choice the answer is the start of
+    hits = [c for c, n in zip(choices, normalized) if re.search(rf"\b{re.escape(n)}\b", t)]
+    if len(hits) != 1:
+        hits = [c for c, n in zip(choices, normalized) if t and n.startswith(t)]
+    if len(hits) == 1:
+        return ParsedAnswer(True, hits[0], complete=False)  # picked out of a longer answer
+    return ParsedAnswer(False, error="ambiguous choice" if hits else "no matching choice")
+
+
+def parse_answer(question: Question, text: str) -> Optional[ParsedAnswer]:
+    """Parsed answer for typed questions; None for free_text (and unknown types), which stay with the LLM."""
+    if question.type == "yesno":
+        return parse_yesno(text)
+    if question.type == "number":
+        return parse_number(text, question.validation)
+    if question.type == "choice":
+        return parse_choice(text, question.choices)
+    return None
@@ -1,8 +1,10 @@
 from __future__ import annotations
+import sys
+import time
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, List, Optional
-from datetime import datetime, timezone
 
 
 class Role(str, Enum):
@@ -16,15 +18,113 @@ class Mode(str, Enum):
     CHAT = "chat"       # patient asking free-form question to chatbot
 
 
-@dataclass
+_ROLES: Dict[str, Role] = {r.value: r for r in Role}
+_last_ts = 0
+
+
+def now_ts() -> int:
+    """Epoch seconds for a new message; never lower than the previous one, so a clock step back keeps order."""
+    global _last_ts
+    t = int(time.time())
+    if t < _last_ts:
+        t = _last_ts
+    _last_ts = t
+    return t
+
+
+def _intern_meta(meta: Dict[str, Any]) -> Dict[str, Any]:
+    # Keys and short values ("mode", "chat", "q3") repeat on every message; share one string object each
+    return {sys.intern(k): (sys.intern(v) if type(v) is str and len(v) <= 32 else v) for k, v in meta.items()}
+
+
+class _LazyMeta(MutableMapping):
+    """msg.meta of a message that has none yet: reads as empty, and the first write gives the message its dict."""
+    __slots__ = ("_msg",)
+
+    def __init__(self, msg: "Message"):
+        self._msg = msg
+
+    def __getitem__(self, key: str) -> Any:
+        return (self._msg._meta or {})[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self._msg._meta is None:
+            self._msg._meta = {}
+        self._msg._meta[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del (self._msg._meta or {})[key]
+
+    def __iter__(self):
+        return iter(self._msg._meta or ())
+
+    def __len__(self) -> int:
+        return len(self._msg._meta or ())
+
+    def __repr__(self) -> str:
+        return repr(self._msg._meta or {})
+
+
 class Message:
-    role: Role
-    content: str
-    ts: int = int(datetime.now(timezone.utc).timestamp())
-    meta: Dict[str, Any] = field(default_factory=dict)
+    """
+    One transcript line. Slotted and without a meta dict unless there is meta: a long-running process keeps
+    hundreds of thousands of these. msg.meta of a message without meta is a small view that allocates the
+    dict on the first write, so msg.meta[key] = value works either way. ts is taken per message (it used to
+    be fixed at import time).
+    """
+    __slots__ = ("role", "content", "ts", "_meta")
+
+    def __init__(self, role: Role, content: str, ts: Optional[int] = None, meta: Optional[Dict[str, Any]] = None):
+        self.role = role if type(role) is Role else _ROLES[role]
+        self.content = content
+        self.ts = now_ts() if ts is None else ts
+        self._meta = meta or None
+
+    @property
+    def meta(self) -> MutableMapping[str, Any]:
+        meta = self._meta
+        return _LazyMeta(self) if meta is None else meta
+
+    @meta.setter
+    def meta(self, value: Optional[Dict[str, Any]]) -> None:
+        self._meta = value or None
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Message):
+            return NotImplemented
+        return (self.role, self.content, self.ts, self.meta) == (other.role, other.content, other.ts, other.meta)
+
+    __hash__ = None
 
+    def __repr__(self) -> str:
+        return f"Message(role={self.role!r}, content={self.content!r}, ts={self.ts!r}, meta={dict(self.meta)!r})"
 
-@dataclass
+    def __getstate__(self):
+        return (self.role.value, self.content, self.ts, self._meta)
+
+    def __setstate__(self, state) -> None:
+        role, self.content, self.ts, self._meta = state
+        self.role = _ROLES[role]
+
+    def to_record(self) -> Dict[str, Any]:
+        """Plain dict for JSON/event logs; "meta" only when there is some."""
+        record = {"role": self.role.value, "content": self.content, "ts": self.ts}
+        if self._meta:
+            record["meta"] = self._meta
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Message":
+        meta = record.get("meta")
+        msg = cls.__new__(cls)
+        msg.role = _ROLES[record["role"]]
+        msg.content = record["content"]
+        msg.ts = record.get("ts") or 0
+        msg._meta = _intern_meta(meta) if meta else None
+        return msg
+
+
+@dataclass(slots=True)
 class Question:
     id: str
     text: str
@@ -33,6 +133,54 @@ class Question:
     help_prompt: Optional[str] = None
     choices: Optional[List[str]] = None
     validation: Optional[Dict[str, Any]] = None
+    when: Optional[Dict[str, Any]] = None  # condition on earlier answers (app/domain/question_graph.py)
+
+
+class Answers(Dict[str, str]):
+    """
+    question_id -> answer dict that counts its own changes.
+    Lets the orchestrator cache things derived from the answers until they actually change.
+    """
+    __slots__ = ("version",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key: str, value: str) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def setdefault(self, key: str, default: str = None):
+        if key not in self:
+            self.version += 1
+        return super().setdefault(key, default)
+
+    def pop(self, key: str, *default):
+        if key in self:
+            self.version += 1
+        return super().pop(key, *default)
+
+    def popitem(self):
+        item = super().popitem()
+        self.version += 1
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
 
 
 class ConversationState(str, Enum):
@@ -43,10 +191,45 @@ class ConversationState(str, Enum):
     DONE = "done"
 
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     conversation_id: str
     state: ConversationState = ConversationState.FLOW_ASKING
     question_index: int = 0
     active_question_id: Optional[str] = None
-    answers: Dict[str, str] = field(default_factory=dict)
+    answers: Dict[str, str] = field(default_factory=Answers)
+    # question_id -> ParsedAnswer (app/domain/answer_parsing.py) for typed answers that parsed cleanly
+    parsed_answers: Dict[str, Any] = field(default_factory=dict)
+    # Saves so far (SessionRegistry.save); a worker whose copy is behind the stored one reloads it
+    revision: int = 0
+
+    def __post_init__(self):
+        if not isinstance(self.answers, Answers):
+            self.answers = Answers(self.answers)
+
+    def to_record(self) -> Dict[str, Any]:
+        """Snapshot of the flow state as a JSON-able dict (the transcript lives in the transcript store)."""
+        return {
+            "v": 1,
+            "conversation_id": self.conversation_id,
+            "revision": self.revision,
+            "state": self.state.value,
+            "question_index": self.question_index,
+            "active_question_id": self.active_question_id,
+            "answers": dict(self.answers),
+            "parsed_answers": {qid: {"ok": p.ok, "value": p.value, "unit": p.unit, "error": p.error,
+                                     "complete": p.complete} for qid, p in self.parsed_answers.items()},
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Conversation":
+        from app.domain.answer_parsing import ParsedAnswer  # answer_parsing imports this module
+        return cls(
+            conversation_id=record["conversation_id"],
+            state=ConversationState(record["state"]),
+            question_index=record["question_index"],
+            active_question_id=record.get("active_question_id"),
+            answers=Answers(record.get("answers") or {}),
+            parsed_answers={qid: ParsedAnswer(**p) for qid, p in (record.get("parsed_answers") or {}).items()},
+            revision=record.get("revision", 0),
+        )
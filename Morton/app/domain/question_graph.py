@@ -0,0 +1,192 @@
+'''What: Compile a questionnaire with conditions ("when") into a DAG: one predicate closure per question, skip
+pointers over runs of questions that share a condition, and a bitset of required questions.
+Why: Walking a flat list and rescanning it for completeness costs O(questions) per turn. Here the cursor only
+moves forward (each question is looked at once per interview, so next-question is amortized O(1)) and
+"is everything required answered?" is one integer compare.
+
+Conditions may only refer to earlier questions, which is what keeps the graph acyclic:
+    {"q4": "yes"}                          answer (parsed value if there is one) equals "yes"
+    {"q4": ["yes", "unsure"]}              one of
+    {"q2": {"gte": 65}}                    ops: eq, ne, in, gt, gte, lt, lte, answered
+    {"all": [...]}, {"any": [...]}, {"not": {...}}'''
+
+from __future__ import annotations
+import operator
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.domain.models import Question
+
+ValueOf = Callable[[str], Any]        # question_id -> answer value, None if not answered
+Predicate = Callable[[ValueOf], bool]
+
+
+def _norm(value: Any) -> Any:
+    return value.strip().casefold() if isinstance(value, str) else value
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _compare(op: Callable[[float, float], bool], expected: Any) -> Callable[[Any], bool]:
+    target = float(expected)
+    def test(value: Any) -> bool:
+        number = _number(value)
+        return number is not None and op(number, target)
+    return test
+
+
+def _value_test(op: str, expected: Any) -> Callable[[Any], bool]:
+    if op == "eq":
+        expected = _norm(expected)
+        return lambda v: v is not None and _norm(v) == expected
+    if op == "ne":
+        expected = _norm(expected)
+        return lambda v: v is not None and _norm(v) != expected
+    if op == "in":
+        options = frozenset(_norm(e) for e in expected)
+        return lambda v: v is not None and _norm(v) in options
+    if op == "answered":
+        return (lambda v: v is not None) if expected else (lambda v: v is None)
+    ops = {"gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+    if op in ops:
+        return _compare(ops[op], expected)
+    raise ValueError(f"Unknown condition operator {op!r}")
+
+
+def compile_condition(cond: Dict[str, Any], known: Dict[str, int], position: int) -> Tuple[Predicate, List[int]]:
+    """
+    Predicate closure for one "when" object, plus the indexes of the questions it depends on.
+    known: question id -> index; every referenced question must come before `position`.
+    """
+    tests: List[Predicate] = []
+    deps: List[int] = []
+    for key, expected in cond.items():
+        if key in ("all", "any"):
+            parts = [compile_condition(c, known, position) for c in expected]
+            preds = [p for p, _ in parts]
+            deps.extend(d for _, ds in parts for d in ds)
+            combine = all if key == "all" else any
+            tests.append(lambda value_of, preds=preds, combine=combine: combine(p(value_of) for p in preds))
+            continue
+        if key == "not":
+            inner, inner_deps = compile_condition(expected, known, position)
+            deps.extend(inner_deps)
+            tests.append(lambda value_of, inner=inner: not inner(value_of))
+            continue
+
+        index = known.get(key)
+        if index is None or index >= position:
+            raise ValueError(f"Condition refers to {key!r}, which is not an earlier question")
+        deps.append(index)
+        if isinstance(expected, dict):
+            value_tests = [_value_test(op, arg) for op, arg in expected.items()]
+        elif isinstance(expected, list):
+            value_tests = [_value_test("in", expected)]
+        else:
+            value_tests = [_value_test("eq", expected)]
+        tests.append(lambda value_of, qid=key, value_tests=value_tests:
+                     all(t(value_of(qid)) for t in value_tests))
+
+    if len(tests) == 1:
+        return tests[0], deps
+    return (lambda value_of: all(t(value_of) for t in tests)), deps
+
+
+class FlowCursor:
+    """Per-conversation position in a QuestionGraph and the required questions still open (a bitset)."""
+    __slots__ = ("position", "missing")
+
+    def __init__(self, position: int, missing: int):
+        self.position = position
+        self.missing = missing
+
+
+class QuestionGraph:
+    def __init__(self, questions: Sequence[Question]):
+        self.questions: Tuple[Question, ...] = tuple(questions)
+        self.index: Dict[str, int] = {}
+        predicates: List[Optional[Predicate]] = []
+        self.parents: List[Tuple[int, ...]] = []
+        self.required_mask = 0
+        for i, q in enumerate(self.questions):
+            if q.id in self.index:
+                raise ValueError(f"Duplicate question id {q.id!r}")
+            if q.when:
+                pred, deps = compile_condition(q.when, self.index, i)
+            else:
+                pred, deps = None, []
+            predicates.append(pred)
+            self.parents.append(tuple(sorted(set(deps))))
+            self.index[q.id] = i
+            if q.required:
+                self.required_mask |= 1 << i
+        self.predicates: Tuple[Optional[Predicate], ...] = tuple(predicates)
+
+        # skip_to[i]: first question after the run of questions that share question i's condition, and the
+        # bits of that run; a false condition skips the whole run in one step
+        n = len(self.questions)
+        skip_to = [n] * n
+        run_bits = [0] * n
+        for i in range(n - 1, -1, -1):
+            same = i + 1 < n and self.questions[i].when is not None and self.questions[i + 1].when == self.questions[i].when
+            skip_to[i] = skip_to[i + 1] if same else i + 1
+            run_bits[i] = (1 << i) | (run_bits[i + 1] if same else 0)
+        self.skip_to: Tuple[int, ...] = tuple(skip_to)
+        self.run_bits: Tuple[int, ...] = tuple(run_bits)
+
+    def start(self) -> FlowCursor:
+        return FlowCursor(0, self.required_mask)
+
+    def restore(self, position: int, answered: Callable[[str], bool]) -> FlowCursor:
+        """Rebuild a cursor from stored progress: questions before `position` left unanswered were skipped. O(n), once."""
+        missing = self.required_mask
+        for i, q in enumerate(self.questions):
+            if i < position or answered(q.id):
+                missing &= ~(1 << i)
+        return FlowCursor(position, missing)
+
+    def settle(self, cursor: FlowCursor, value_of: ValueOf, done: Optional[Callable[[str], bool]] = None) -> Optional[Question]:
+        """
+        Move the cursor to the next question to ask: past questions whose condition is false (they stop
+        being required) and, if `done` is given, past questions it reports as already answered.
+        """
+        n = len(self.questions)
+        i = cursor.position
+        while i < n:
+            pred = self.predicates[i]
+            if pred is not None and not pred(value_of):
+                cursor.missing &= ~self.run_bits[i]
+                i = self.skip_to[i]
+            elif done is not None and done(self.questions[i].id):
+                cursor.missing &= ~(1 << i)
+                i += 1
+            else:
+                break
+        cursor.position = i
+        return self.questions[i] if i < n else None
+
+    def answered(self, cursor: FlowCursor, question_id: str) -> None:
+        i = self.index.get(question_id)
+        if i is not None:
+            cursor.missing &= ~(1 << i)
+
+    def current(self, cursor: FlowCursor) -> Optional[Question]:
+        return self.questions[cursor.position] if cursor.position < len(self.questions) else None
+
+    @staticmethod
+    def is_complete(cursor: FlowCursor) -> bool:
+        return cursor.missing == 0
+
+    def missing_ids(self, cursor: FlowCursor) -> List[str]:
+        """Required questions still open (for display; O(open questions))."""
+        out = []
+        bits = cursor.missing
+        while bits:
+            low = bits & -bits
+            out.append(self.questions[low.bit_length() - 1].id)
+            bits ^= low
+        return out
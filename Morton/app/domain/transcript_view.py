@@ -0,0 +1,90 @@
+'''What: A read-only, zero-copy window over an append-only list of Messages.
+Why: Transcripts only ever grow, so a (list, start, stop) triple is a stable snapshot; slicing and
+tail reads move two integers instead of copying the whole history on every turn.'''
+
+from __future__ import annotations
+from itertools import islice
+from typing import Iterator, List, Optional, Sequence, Union, overload
+from app.domain.models import Message, Mode, Role
+
+
+class TranscriptView(Sequence[Message]):
+    __slots__ = ("_items", "_start", "_stop")
+
+    def __init__(self, items: List[Message], start: int = 0, stop: Optional[int] = None):
+        # stop is fixed at creation, so later appends to `items` never show up in this view
+        self._items = items
+        self._start = start
+        self._stop = len(items) if stop is None else stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, i: int) -> Message: ...
+    @overload
+    def __getitem__(self, i: slice) -> Union["TranscriptView", List[Message]]: ...
+
+    def __getitem__(self, i):
+        r = range(self._start, self._stop)[i]
+        if isinstance(r, int):
+            return self._items[r]
+        if r.step == 1:
+            return TranscriptView(self._items, r.start, max(r.start, r.stop))
+        return [self._items[j] for j in r]
+
+    def __iter__(self) -> Iterator[Message]:
+        return islice(self._items, self._start, self._stop)
+
+    def __reversed__(self) -> Iterator[Message]:
+        items = self._items
+        for j in range(self._stop - 1, self._start - 1, -1):
+            yield items[j]
+
+    def tail(self, n: int) -> "TranscriptView":
+        """The last n messages (as a view)."""
+        return TranscriptView(self._items, max(self._start, self._stop - max(n, 0)), self._stop)
+
+    def filter(self, role: Optional[Role] = None, mode: Optional[str] = None) -> Iterator[Message]:
+        """Lazily yield messages matching role and/or meta['mode'], oldest first."""
+        for m in self:
+            if role is not None and m.role != role:
+                continue
+            if mode is not None and (m.meta or {}).get("mode") != mode:
+                continue
+            yield m
+
+    def to_list(self) -> List[Message]:
+        return self._items[self._start:self._stop]
+
+    def __repr__(self) -> str:
+        return f"TranscriptView(len={len(self)})"
+
+
+def as_view(transcript: Sequence[Message]) -> TranscriptView:
+    """Wrap a plain list (without copying) so callers can use tail()/filter() on any transcript."""
+    if isinstance(transcript, TranscriptView):
+        return transcript
+    return TranscriptView(transcript if isinstance(transcript, list) else list(transcript))
+
+
+def without_parsed_answers(transcript: Sequence[Message], question_ids: Sequence[str],
+                           current_question_id: Optional[str] = None) -> List[Message]:
+    """
+    The transcript minus the question and answer messages of these questions (chat detours stay).
+    current_question_id: the question asked last before this part of the transcript, when it is a
+    continuation (the running summary folds a few messages at a time).
+    """
+    out = []
+    skip = current_question_id in question_ids if current_question_id is not None else False
+    for m in transcript:
+        meta = m.meta or {}
+        qid = meta.get("question_id")
+        if qid is not None:
+            skip = qid in question_ids
+            if skip:
+                continue
+        elif skip and m.role == Role.PATIENT and meta.get("mode") == Mode.ANSWER.value:
+            continue
+        out.append(m)
+    return out
@@ -1,11 +1,49 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, Iterator, Optional, Sequence
 from app.domain.models import Message
 
+
+class ChatContext(str):
+    """
+    The questionnaire context string the orchestrator hands to a chatbot, plus what it was built from.
+    Chatbots that only need the text can use it as a plain str; wrappers such as the response cache
+    read the attributes.
+    - shared: the same context without anything patient-specific (only the current question)
+    """
+
+    def __new__(cls, text: str, conversation_id: Optional[str] = None, question_id: Optional[str] = None,
+                shared: Optional[str] = None) -> "ChatContext":
+        obj = super().__new__(cls, text)
+        obj.conversation_id = conversation_id
+        obj.question_id = question_id
+        obj.shared = shared
+        return obj
+
+
 class IChatbot(ABC):
     @abstractmethod
-    def answer(self, user_text: str, transcript: List[Message], context: Optional[str] = None) -> str:
+    def answer(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None) -> str:
         """Return assistant answer to user free-form question."""
         pass
 
+
+class IStreamingChatbot(IChatbot):
+    @abstractmethod
+    def answer_stream(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None) -> Iterator[str]:
+        """Yield the assistant answer in chunks as soon as they are generated."""
+        pass
+
+
+class IAsyncChatbot(ABC):
+    @abstractmethod
+    async def answer(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None) -> str:
+        """Return assistant answer to user free-form question without blocking the event loop."""
+        pass
+
+
+class IAsyncStreamingChatbot(IAsyncChatbot):
+    @abstractmethod
+    def answer_stream(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None) -> AsyncIterator[str]:
+        """Async-iterate the assistant answer in chunks as soon as they are generated."""
+        pass
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional
+from typing import Optional, Sequence
 from abc import ABC, abstractmethod
 from app.domain.models import Conversation, Question
 
@@ -13,3 +13,30 @@ class IQuestionFlow(ABC):
     def advance_with_answer(self, conv: Conversation, answer_text: str) -> Conversation:
         """Update conversation progress after receiving an answer."""
         pass
+
+    def questions(self) -> Sequence[Question]:
+        """All questions in questionnaire order.
+        The default walks get_question() index by index; flows that load a list should override it."""
+        out = []
+        probe = Conversation(conversation_id="__questions__")
+        while True:
+            q = self.get_question(probe)
+            if not q:
+                return out
+            out.append(q)
+            probe.question_index += 1
+
+    def question_by_id(self, question_id: str) -> Optional[Question]:
+        for q in self.questions():
+            if q.id == question_id:
+                return q
+        return None
+
+    def is_complete(self, conv: Conversation) -> bool:
+        """True once every required question the patient has to answer is answered.
+        The default scans the questions; flows that track this incrementally should override it."""
+        return all(q.id in conv.answers for q in self.questions() if q.required)
+
+    def forget(self, conversation_id: str) -> None:
+        """Drop per-conversation state the flow keeps in memory, if any."""
+        pass
@@ -0,0 +1,19 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass
+class RetrievedPassage:
+    question: str
+    answer: str
+    score: float            # cosine similarity to the query, 1.0 = same meaning
+    source: str = "faq"     # "faq" (clinic FAQ) or "approved" (a past chatbot answer a clinician approved)
+
+
+class IRetriever(ABC):
+    @abstractmethod
+    def search(self, query: str, k: int = 3) -> List[RetrievedPassage]:
+        """Return the k passages most similar to the query, best first."""
+        pass
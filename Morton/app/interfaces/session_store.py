@@ -0,0 +1,28 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Optional
+from app.domain.models import Conversation
+
+class ISessionStore(ABC):
+    """Durable Conversation snapshots (Conversation.to_record), so a session can leave memory and come back."""
+
+    @abstractmethod
+    def save(self, conv: Conversation) -> None:
+        pass
+
+    @abstractmethod
+    def load(self, conversation_id: str) -> Optional[Conversation]:
+        pass
+
+    @abstractmethod
+    def delete(self, conversation_id: str) -> None:
+        pass
+
+    def revision(self, conversation_id: str) -> Optional[int]:
+        """Conversation.revision of the stored snapshot, None if there is none.
+        The default loads the whole snapshot; stores that can read the number alone should override it."""
+        conv = self.load(conversation_id)
+        return conv.revision if conv is not None else None
+
+    def close(self) -> None:
+        pass
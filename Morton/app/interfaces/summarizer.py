@@ -1,11 +1,24 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, Optional, Sequence
 from app.domain.models import Message
 
 class ISummarizer(ABC):
     @abstractmethod
-    def summarize(self, transcript: List[Message], schema: Dict[str, Any]) -> Dict[str, Any]:
+    def summarize(self, transcript: Sequence[Message], schema: Dict[str, Any]) -> Dict[str, Any]:
         """Return structured JSON matching template."""
         pass
 
+
+class IAsyncSummarizer(ABC):
+    @abstractmethod
+    async def summarize(self, transcript: Sequence[Message], schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Return structured JSON matching template without blocking the event loop."""
+        pass
+
+
+class IIncrementalSummarizer(ISummarizer):
+    @abstractmethod
+    def update(self, summary: Optional[Dict[str, Any]], new_messages: Sequence[Message], schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Fold new transcript messages into an existing summary (None = start from scratch)."""
+        pass
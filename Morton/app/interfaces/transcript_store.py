@@ -2,6 +2,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import List
 from app.domain.models import Message
+from app.domain.transcript_view import TranscriptView
 
 class ITranscriptStore(ABC):
     @abstractmethod
@@ -10,4 +11,31 @@ class ITranscriptStore(ABC):
 
     @abstractmethod
     def get(self, conversation_id: str) -> List[Message]:
-        pass
\ No newline at end of file
+        pass
+
+    def view(self, conversation_id: str) -> TranscriptView:
+        """Read-only snapshot of the transcript. Stores backed by an in-memory list return it without copying."""
+        return TranscriptView(self.get(conversation_id))
+
+    def get_since(self, conversation_id: str, seq: int) -> List[Message]:
+        """Messages appended after the first `seq` ones (seq numbers start at 1)."""
+        return self.get(conversation_id)[seq:]
+
+    def get_tail(self, conversation_id: str, n: int) -> List[Message]:
+        """The last n messages, oldest first."""
+        if n <= 0:
+            return []
+        return self.get(conversation_id)[-n:]
+
+
+class IAsyncTranscriptStore(ABC):
+    @abstractmethod
+    async def append(self, conversation_id: str, message: Message) -> None:
+        pass
+
+    @abstractmethod
+    async def get(self, conversation_id: str) -> List[Message]:
+        pass
+
+    async def view(self, conversation_id: str) -> TranscriptView:
+        return TranscriptView(await self.get(conversation_id))
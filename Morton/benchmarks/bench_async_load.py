@@ -0,0 +1,103 @@
+'''What: Load test of ConversationOrchestrator (one sync worker) vs AsyncConversationOrchestrator (one event loop).
+Why: Nearly all of a turn is I/O wait on Ollama, so async should multiply sessions/s without more processes.
+
+Run from the Morton folder:  python -m benchmarks.bench_async_load [sync_sessions] [async_sessions]'''
+
+from __future__ import annotations
+import asyncio
+import sys
+import time
+
+from app.domain.models import Conversation, Mode
+from app.adapters.question_flow_json import JsonQuestionFlow
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.adapters.store_async import AsyncTranscriptStore
+from app.adapters.ollama_chatbot import OllamaChatbot
+from app.adapters.improved_ollama_summarizer import OllamaSummarizer
+from app.adapters.async_ollama_chatbot import AsyncOllamaChatbot
+from app.adapters.async_ollama_summarizer import AsyncOllamaSummarizer
+from app.adapters.ollama_http import OllamaClient
+from app.adapters.ollama_http_async import AsyncOllamaClient
+from app.application.orchestrator import ConversationOrchestrator
+from app.application.async_orchestrator import AsyncConversationOrchestrator
+from benchmarks.fake_ollama import fake_ollama_process
+
+QUESTIONS = "data/questions.json"
+TEMPLATE = "data/summary_schema.json"
+ANSWERS = ["Alex", "42", "Penicillin", "yes", "Knee surgery", "no", "yes"]
+CHAT_AT = 2  # ask one chatbot question while on the third standardized question
+
+
+def _pct(ms: list[float], p: float) -> float:
+    ms = sorted(ms)
+    return ms[min(len(ms) - 1, int(len(ms) * p))]
+
+
+def _report(name: str, sessions: int, wall_s: float, turns_ms: list[float]) -> None:
+    # Only turns that hit Ollama (chat + finalize); plain answers are pure CPU and ~0 ms in both modes
+    print(f"{name:<6} sessions {sessions:4d}   {sessions / wall_s:7.1f} sessions/s   "
+          f"LLM turn p50 {_pct(turns_ms, 0.50):7.1f} ms   p99 {_pct(turns_ms, 0.99):7.1f} ms")
+
+
+def run_sync(base_url: str, sessions: int) -> None:
+    client = OllamaClient(base_url=base_url)
+    orch = ConversationOrchestrator(
+        JsonQuestionFlow(QUESTIONS), MemoryTranscriptStore(),
+        chatbot=OllamaChatbot(client=client), summarizer=OllamaSummarizer(client=client),
+        template_path=TEMPLATE,
+    )
+    turns = []
+    t0 = time.perf_counter()
+    for i in range(sessions):
+        conv = Conversation(conversation_id=f"sync-{i}")
+        orch.start(conv)
+        for n, answer in enumerate(ANSWERS):
+            if n == CHAT_AT:
+                t = time.perf_counter()
+                orch.handle_user_message(conv, "Why do you need to know this?", mode=Mode.CHAT)
+                turns.append((time.perf_counter() - t) * 1000)
+            orch.handle_user_message(conv, answer)
+        t = time.perf_counter()
+        orch.finalize(conv)
+        turns.append((time.perf_counter() - t) * 1000)
+    _report("sync", sessions, time.perf_counter() - t0, turns)
+    client.close()
+
+
+async def run_async(base_url: str, sessions: int) -> None:
+    client = AsyncOllamaClient(base_url=base_url, pool_size=sessions)
+    orch = AsyncConversationOrchestrator(
+        JsonQuestionFlow(QUESTIONS), AsyncTranscriptStore(MemoryTranscriptStore()),
+        chatbot=AsyncOllamaChatbot(client=client), summarizer=AsyncOllamaSummarizer(client=client),
+        template_path=TEMPLATE,
+    )
+    turns = []
+
+    async def one(i: int) -> None:
+        conv = Conversation(conversation_id=f"async-{i}")
+        await orch.start(conv)
+        for n, answer in enumerate(ANSWERS):
+            if n == CHAT_AT:
+                t = time.perf_counter()
+                await orch.handle_user_message(conv, "Why do you need to know this?", mode=Mode.CHAT)
+                turns.append((time.perf_counter() - t) * 1000)
+            await orch.handle_user_message(conv, answer)
+        t = time.perf_counter()
+        await orch.finalize(conv)
+        turns.append((time.perf_counter() - t) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(sessions)))
+    _report("async", sessions, time.perf_counter() - t0, turns)
+    await client.aclose()
+
+
+def main(sync_sessions: int = 20, async_sessions: int = 300) -> None:
+    # ~50 ms prompt processing per LLM call, like a small local model
+    with fake_ollama_process(prompt_delay_s=0.05) as base_url:
+        run_sync(base_url, sync_sessions)
+        asyncio.run(run_async(base_url, async_sessions))
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
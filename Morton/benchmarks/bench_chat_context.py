@@ -0,0 +1,68 @@
+'''What: Time to build a chat turn's context (answered list + history + message list) vs conversation length,
+rescanning the transcript every turn (old) vs the incremental ChatContextAccumulator.
+
+Run from the Morton folder:  python -m benchmarks.bench_chat_context'''
+
+from __future__ import annotations
+import json
+import os
+import tempfile
+import time
+
+from app.domain.models import Conversation, Mode
+from app.adapters.question_flow_json import JsonQuestionFlow
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.adapters.ollama_chatbot import DEFAULT_SYSTEM_PROMPT, build_chat_messages
+from app.application.orchestrator import ConversationOrchestrator
+from app.interfaces.chatbot import IChatbot
+
+
+class _EchoBot(IChatbot):
+    def answer(self, user_text, transcript, context=None) -> str:
+        return "ok"
+
+
+def _orchestrator(questions: int, tmp: str) -> ConversationOrchestrator:
+    path = os.path.join(tmp, f"questions-{questions}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"questions": [{"id": f"q{i}", "text": f"Question number {i}?"} for i in range(questions)]}, f)
+    return ConversationOrchestrator(JsonQuestionFlow(path), MemoryTranscriptStore(), chatbot=_EchoBot())
+
+
+def _old_turn(orch: ConversationOrchestrator, conv: Conversation) -> None:
+    # What every chat turn did before: rebuild answered lines, then rescan the transcript tail
+    answered = orch.build_questionnaire_answers(conv)
+    lines = "\n".join(f"- {x['question']} -> {x['answer']}" for x in answered) or "None yet."
+    ctx = f"Previously answered standardized questions:\n{lines}"
+    build_chat_messages(DEFAULT_SYSTEM_PROMPT, "why?", orch.store.view(conv.conversation_id), ctx)
+
+
+def _new_turn(orch: ConversationOrchestrator, conv: Conversation) -> None:
+    acc = orch._chat_context(conv)
+    ctx = orch._build_chat_context(conv, acc)
+    build_chat_messages(DEFAULT_SYSTEM_PROMPT, "why?", list(acc.window), ctx)
+
+
+def _time(fn, *args, rounds: int = 200) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn(*args)
+    return (time.perf_counter() - t0) / rounds * 1e6
+
+
+def run() -> None:
+    print(f"{'messages':>9} {'answered':>9} {'rescan us':>11} {'incremental us':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for answered in (10, 100, 1000):
+            orch = _orchestrator(answered * 2, tmp)
+            conv = Conversation(conversation_id="bench")
+            orch.start(conv)
+            for i in range(answered):
+                orch.handle_user_message(conv, f"question {i}?", mode=Mode.CHAT)
+                orch.handle_user_message(conv, f"answer {i}")
+            messages = len(orch.store.view(conv.conversation_id))
+            print(f"{messages:9d} {answered:9d} {_time(_old_turn, orch, conv):11.1f} {_time(_new_turn, orch, conv):15.1f}")
+
+
+if __name__ == "__main__":
+    run()
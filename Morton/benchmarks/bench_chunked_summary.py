@@ -0,0 +1,81 @@
+'''What: Single-shot vs map-reduce (chunked) summaries of synthetic 200-turn interviews.
+Why: A long transcript overflows the model context (Ollama silently drops the start of the prompt) and one
+big call is slow; chunking keeps every fact inside the context and lets chunks run in parallel.
+
+The stub model has a 4096-token context, spends prompt_token_delay per prompt token and token_delay per
+generated word, and "summarizes" by copying every fact marker (F000, F001, ...) it can still see into notes.
+Quality = share of the transcript's facts that reach the final summary.
+
+Run from the Morton folder:  python -m benchmarks.bench_chunked_summary [turns] [chunk_tokens]'''
+
+from __future__ import annotations
+import json
+import re
+import sys
+import time
+from typing import Any, Dict, List
+
+from app.domain.models import Message, Role
+from app.adapters.improved_ollama_summarizer import OllamaSummarizer, chunk_transcript, estimate_tokens, fmt_message
+from app.adapters.ollama_http import OllamaClient
+from app.adapters.schema_registry import SchemaRegistry
+from benchmarks.fake_ollama import FakeOllama, dummy_instance
+
+FACT = re.compile(r"\bF\d{3}\b")
+FILLER = ("I am not completely sure, but I think my doctor mentioned something about that last year "
+          "when we talked about the operation and the medicine I take in the morning. ")
+
+
+def synthetic_transcript(turns: int) -> List[Message]:
+    """Question, answer (one fact each), and every third question a chat detour of two turns."""
+    out: List[Message] = []
+    q = 0
+    while len(out) < turns:
+        qid = f"q{q}"
+        out.append(Message(role=Role.SYSTEM, content=f"Standardized question number {q}?", meta={"question_id": qid}))
+        out.append(Message(role=Role.PATIENT, content=f"{FILLER}My answer is F{q:03d}.", meta={"mode": "answer"}))
+        if q % 3 == 2:
+            out.append(Message(role=Role.PATIENT, content="Why do you need to know that?", meta={"mode": "chat"}))
+            out.append(Message(role=Role.ASSISTANT, content=FILLER * 2, meta={"mode": "chat"}))
+            out.append(Message(role=Role.SYSTEM, content=f"Standardized question number {q}?",
+                               meta={"question_id": qid, "reask": True}))
+        q += 1
+    return out[:turns]
+
+
+def stub_model(payload: Dict[str, Any]) -> str:
+    seen = FACT.findall(" ".join(m.get("content", "") for m in payload["messages"]))
+    out = dummy_instance(payload["format"])
+    out["notes"] = " ".join(dict.fromkeys(seen))
+    return json.dumps(out)
+
+
+def run(turns: int = 200, chunk_tokens: int = 3000, rounds: int = 2) -> None:
+    schema = SchemaRegistry().load("data/summary_schema.json").llm_document
+    transcript = synthetic_transcript(turns)
+    facts = set(FACT.findall(" ".join(m.content for m in transcript)))
+    prompt_tokens = sum(estimate_tokens(fmt_message(m)) + 1 for m in transcript)
+    chunks = chunk_transcript(transcript, chunk_tokens)
+    print(f"{turns} turns, ~{prompt_tokens} prompt tokens, {len(facts)} facts, "
+          f"{len(chunks)} chunks of <= {chunk_tokens} tokens")
+
+    with FakeOllama(reply_fn=stub_model, context_tokens=4096,
+                    prompt_token_delay_s=0.0002, token_delay_s=0.02) as fake:
+        client = OllamaClient(fake.base_url)
+        modes = (
+            ("single-shot", OllamaSummarizer(client=client)),
+            ("chunked, sequential", OllamaSummarizer(client=client, chunk_tokens=chunk_tokens)),
+            ("chunked, 4 parallel", OllamaSummarizer(client=client, chunk_tokens=chunk_tokens, max_parallel=4)),
+        )
+        for label, summarizer in modes:
+            t0 = time.perf_counter()
+            for _ in range(rounds):
+                summary = summarizer.summarize(transcript, schema)
+            wall = (time.perf_counter() - t0) / rounds
+            recall = len(facts & set(summary["notes"].split())) / len(facts)
+            print(f"{label:20s} {wall * 1000:8.1f} ms   fact recall {recall:6.1%}")
+        client.close()
+
+
+if __name__ == "__main__":
+    run(*(int(a) for a in sys.argv[1:3]))
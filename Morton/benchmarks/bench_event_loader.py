@@ -0,0 +1,111 @@
+'''What: Parse a generated directory of interview logs (ToGood2Go/runs format: a third of the sessions in the
+interview.py legacy format, a third in the interview_with_chat.py one, a third in schema version 1) with
+ToGood2Go/utils/events.py: json vs orjson, one process vs several, and rebuilding Conversation + Message
+transcripts (utils/replay.py). Also the size of a slotted event vs the same line kept as a dict.
+
+Run from the Morton folder:  python -m benchmarks.bench_event_loader [sessions]'''
+
+from __future__ import annotations
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from ToGood2Go.utils import events
+from ToGood2Go.utils.events import (AnswerGiven, ChatMessage, QuestionShown, SessionEnded, SessionStarted,
+                                    dumps, load_runs)
+from ToGood2Go.utils.replay import rebuild
+
+QUESTIONS = 40
+CHATS = 10
+
+
+def _legacy_lines(sid: str, chat_style: bool) -> list:
+    t = 1769513000
+
+    def ts(i: int):
+        return datetime.fromtimestamp(t + i, timezone.utc).isoformat() if chat_style else t + i
+
+    lines = [{"ts": ts(0), "type": "session_started", "sessionId": sid, "meta": {"questionsFile": "questions.json"}}]
+    for q in range(QUESTIONS):
+        lines.append({"ts": ts(q), "type": "standard_question_shown", "sessionId": sid, "questionId": f"q{q}",
+                      "text": f"Spørgsmål nummer {q}: hvordan har du det med din operation?"})
+        if q < CHATS:
+            if chat_style:
+                lines.append({"ts": ts(q), "type": "patient_chat_question", "sessionId": sid, "text": "Hvorfor spørger I om det?"})
+                lines.append({"ts": ts(q), "type": "bot_chat_answer", "sessionId": sid, "text": "Det hjælper lægen med at planlægge bedøvelsen."})
+            else:
+                lines.append({"ts": ts(q), "type": "chat", "sessionId": sid, "questionId": "chat",
+                              "text": {"role": "user", "content": "Hvorfor spørger I om det?"}})
+        lines.append({"ts": ts(q), "type": "standard_answer_given", "sessionId": sid, "questionId": f"q{q}",
+                      "text": "Det går fint, jeg er lidt nervøs men ellers klar."})
+    lines.append({"ts": ts(QUESTIONS), "type": "session_finished", "sessionId": sid})
+    return [json.dumps(line, ensure_ascii=False) for line in lines]
+
+
+def _v1_lines(sid: str) -> list:
+    out = [SessionStarted(sid, {"questionsFile": "questions.json"})]
+    for q in range(QUESTIONS):
+        out.append(QuestionShown(sid, f"q{q}", f"Spørgsmål nummer {q}: hvordan har du det med din operation?"))
+        if q < CHATS:
+            out.append(ChatMessage(sid, "patient", "Hvorfor spørger I om det?"))
+            out.append(ChatMessage(sid, "assistant", "Det hjælper lægen med at planlægge bedøvelsen."))
+        out.append(AnswerGiven(sid, f"q{q}", "Det går fint, jeg er lidt nervøs men ellers klar."))
+    out.append(SessionEnded(sid))
+    return [dumps(e) for e in out]
+
+
+def _timed(label: str, fn, total_events: int) -> None:
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    print(f"{label:38s} {elapsed * 1000:8.0f} ms  {total_events / elapsed:10,.0f} events/s")
+
+
+def run(sessions: int = 600) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        total = 0
+        for i in range(sessions):
+            sid = f"session-{i:05d}"
+            lines = _v1_lines(sid) if i % 3 == 2 else _legacy_lines(sid, chat_style=i % 3 == 1)
+            total += len(lines)
+            with open(os.path.join(tmp, f"{sid}.jsonl"), "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        print(f"{sessions} logs, {total} events, {sum(os.path.getsize(os.path.join(tmp, p)) for p in os.listdir(tmp)) >> 20} MiB, "
+              f"{os.cpu_count()} CPUs")
+
+        def consume(workers):
+            return lambda: sum(len(evs) for _, evs in load_runs(tmp, workers=workers))
+
+        def plain_json():
+            # The baseline: every line a dict, with the format questions left to the reader
+            for name in sorted(os.listdir(tmp)):
+                with open(os.path.join(tmp, name), "rb") as f:
+                    [json.loads(line) for line in f if line.strip()]
+
+        _timed("json.loads only (dicts, no schema)", plain_json, total)
+        fast = events._loads
+        events._loads = json.loads
+        _timed("events, json, 1 process", consume(1), total)
+        events._loads = fast
+        if events.orjson is not None:
+            _timed("events, orjson, 1 process", consume(1), total)
+        workers = 4  # only faster with that many cores; os.cpu_count() here: see the first line
+        _timed(f"events, {'orjson' if events.orjson else 'json'}, {workers} processes", consume(workers), total)
+        _timed("events + rebuild Conversation/Messages",
+               lambda: [rebuild(evs) for _, evs in load_runs(tmp)], total)
+
+        path = os.path.join(tmp, "session-00000.jsonl")
+        with open(path, "rb") as f:
+            line = next(l for l in f if b"standard_answer_given" in l)
+        as_dict = json.loads(line)
+        event = events.from_record(as_dict)
+        dict_bytes = sys.getsizeof(as_dict)
+        print(f"one answer event: dict {dict_bytes} bytes, slotted {type(event).__name__} {sys.getsizeof(event)} bytes "
+              f"(field values not counted)")
+
+
+if __name__ == "__main__":
+    run(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,85 @@
+'''What: Events per second for the interview logs: the old append_jsonl (open, write one line, close per event)
+vs EventLogWriter (ToGood2Go/utils/event_log.py) at each durability level, and 32 sessions writing
+concurrently, one file each vs one shared writer with rotating segments.
+
+Run from the Morton folder:  python -m benchmarks.bench_event_log [events]'''
+
+from __future__ import annotations
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from ToGood2Go.utils.event_log import EventLogWriter
+
+EVENT = {"ts": "2026-01-01T12:00:00+00:00", "type": "answer", "sessionId": "3f1c6a9e-0000-4000-8000-000000000000",
+         "questionId": "q3", "text": "Jeg er allergisk over for penicillin og latex."}
+
+
+def legacy_append(path: Path, obj: dict) -> None:
+    # append_jsonl as it was in interview.py / interview_with_chat.py
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+
+
+def _rate(n: int, seconds: float) -> str:
+    return f"{n / seconds:12,.0f} events/s"
+
+
+def run(events: int = 20000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        path = root / "legacy.jsonl"
+        n = events // 10  # the legacy path is slow; fewer events are enough
+        t0 = time.perf_counter()
+        for _ in range(n):
+            legacy_append(path, EVENT)
+        print(f"legacy append_jsonl          {_rate(n, time.perf_counter() - t0)}")
+
+        for durability in ("none", "flush", "fsync"):
+            path = root / f"{durability}.jsonl"
+            t0 = time.perf_counter()
+            with EventLogWriter(path, durability=durability) as log:
+                for _ in range(events):
+                    log.write(EVENT)
+            elapsed = time.perf_counter() - t0
+            with path.open(encoding="utf-8") as f:
+                assert sum(1 for _ in f) == events
+            print(f"writer, durability={durability:5s}   {_rate(events, elapsed)}  ({log.batches} batches)")
+
+        sessions = 32
+        per_session = events // sessions
+
+        def concurrent(make_writer, label: str) -> None:
+            def session(i: int) -> None:
+                log = make_writer(i)
+                for _ in range(per_session):
+                    log.write({**EVENT, "sessionId": f"s{i}"})
+                if log is not shared:
+                    log.close()
+            threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+            t0 = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            if shared is not None:
+                shared.close()
+            print(f"{label:28s} {_rate(sessions * per_session, time.perf_counter() - t0)}")
+
+        shared = None
+        concurrent(lambda i: EventLogWriter(root / "per_session" / f"s{i}.jsonl", durability="flush"),
+                   f"{sessions} sessions, own files")
+        shared = EventLogWriter(root / "segments", durability="flush", segment_bytes=256 * 1024)
+        concurrent(lambda i: shared, f"{sessions} sessions, segments")
+        segments = sorted(os.listdir(root / "segments"))
+        lines = sum(1 for s in segments for _ in open(root / "segments" / s, encoding="utf-8"))
+        assert lines == sessions * per_session
+        print(f"{'':28s} {len(segments)} segment files of <= 256 KiB")
+
+
+if __name__ == "__main__":
+    run(*(int(a) for a in sys.argv[1:2]))
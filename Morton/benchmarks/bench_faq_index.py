@@ -0,0 +1,91 @@
+'''What: FAQ index (app/adapters/faq_index.py) startup, search latency, retrieval recall and chat latency.
+
+- startup: first open embeds the corpus in batches; reopening memory-maps the stored vectors (no embed calls)
+- search: brute-force top-k over unit vectors of the real embedding size (768) at growing corpus sizes
+- recall: paraphrased patient questions against data/faq.json. The stub's /api/embed is a hashed
+  bag-of-words, a lower bound for a real embedding model, so read recall as "the plumbing works"
+- chat: OllamaChatbot answering a question with a vetted FAQ match vs generating a reply
+
+Run from the Morton folder:  python -m benchmarks.bench_faq_index'''
+
+from __future__ import annotations
+import tempfile
+import time
+
+import numpy as np
+
+from app.adapters.ollama_chatbot import OllamaChatbot
+from app.adapters.ollama_http import OllamaClient
+from benchmarks.fake_ollama import FakeOllama
+from app.adapters.faq_index import FaqIndex, OllamaEmbedder, load_corpus
+
+# paraphrase -> index of the FAQ entry that answers it
+PARAPHRASES = [
+    ("what does it mean to fast before the operation", 0),
+    ("why can't I eat before I am put to sleep", 1),
+    ("am I allowed to drink water on the morning of surgery", 2),
+    ("should I take my pills on the day of the operation", 3),
+    ("why is my age important", 4),
+    ("why do you want to know about my allergies", 5),
+    ("is smoking a problem for the anesthesia", 6),
+    ("why does it matter that I had anesthesia before", 7),
+    ("will it hurt during the surgery", 8),
+    ("how long until I wake up after the anesthesia", 9),
+    ("can I drive myself home afterwards", 10),
+    ("what if I feel sick after waking up", 11),
+    ("who sees the answers I give here", 12),
+    ("I caught a cold before my operation, what should I do", 13),
+]
+
+
+def _time_ms(fn, rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - t0) / rounds * 1000
+
+
+def run() -> None:
+    entries = load_corpus("data/faq.json", "data/approved_answers.jsonl")
+    with FakeOllama(token_delay_s=0.02) as fake, tempfile.TemporaryDirectory() as index_dir:
+        client = OllamaClient(fake.base_url)
+        embedder = OllamaEmbedder(client=client, batch_size=8)
+
+        t0 = time.perf_counter()
+        FaqIndex.open(index_dir, entries, embedder)
+        first = time.perf_counter() - t0
+        calls = len(fake.requests)
+        t0 = time.perf_counter()
+        index = FaqIndex.open(index_dir, entries, embedder)
+        reopen = time.perf_counter() - t0
+        print(f"startup, {len(entries)} entries: first open {first * 1000:.1f} ms ({calls} embed calls), "
+              f"reopen {reopen * 1000:.2f} ms ({len(fake.requests) - calls} embed calls)")
+
+        rng = np.random.default_rng(0)
+        for n in (100, 10_000, 100_000):
+            vectors = rng.standard_normal((n, 768)).astype(np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            big = FaqIndex([{"question": "", "answer": ""}] * n, vectors, embedder)
+            q = vectors[n // 2]
+            print(f"search top-3, {n:7d} x 768: {_time_ms(lambda: big.search_vector(q, 3), 50):7.3f} ms")
+
+        at1 = at3 = 0
+        top_scores = []
+        for text, expected in PARAPHRASES:
+            hits = index.search(text, k=3)
+            top_scores.append(hits[0].score)
+            at1 += hits[0].question == entries[expected]["question"]
+            at3 += any(h.question == entries[expected]["question"] for h in hits)
+        print(f"recall@1 {at1 / len(PARAPHRASES):.0%}, recall@3 {at3 / len(PARAPHRASES):.0%}, "
+              f"top score median {np.median(top_scores):.2f}")
+
+        plain = OllamaChatbot(client=client)
+        with_faq = OllamaChatbot(client=client, faq_index=index)
+        question = entries[0]["question"]
+        print(f"chat, generated reply:  {_time_ms(lambda: plain.answer(question, []), 3):8.1f} ms")
+        print(f"chat, vetted FAQ match: {_time_ms(lambda: with_faq.answer(question, []), 3):8.1f} ms")
+        client.close()
+
+
+if __name__ == "__main__":
+    run()
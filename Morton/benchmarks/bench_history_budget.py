@@ -0,0 +1,106 @@
+'''What: Prompt size and turn latency over a long chat (60 turns, a questionnaire answer every 10) with short and
+with long messages, for the chat history chosen by message count vs by token budget (app/adapters/prompt_budget.py):
+
+    last 10 messages     the window before this change
+    1024 tok, sliding    the newest messages within 1024 estimated tokens, re-chosen every turn
+    1024 tok, stable     the same budget, start moved in steps, dropped exchanges in a rolling summary (default)
+
+The stub Ollama has a 2048-token context (longer prompts lose their start, system prompt first, like Ollama's
+num_ctx truncation) and a one-slot prefix cache, so "evaluated" counts only the tokens after the cached prefix.
+Prompt tokens are estimated from the request (~4 characters per token plus the per-message overhead).
+
+Run from the Morton folder:  python -m benchmarks.bench_history_budget [turns]'''
+
+from __future__ import annotations
+import sys
+import time
+from typing import Any, Dict, List
+
+from app.domain.models import Conversation, Mode
+from app.adapters.ollama_chatbot import DEFAULT_SYSTEM_PROMPT, OllamaChatbot
+from app.adapters.ollama_http import OllamaClient
+from app.adapters.prompt_budget import MESSAGE_OVERHEAD, estimate_tokens
+from app.adapters.question_flow_graph import GraphQuestionFlow
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.application.orchestrator import ConversationOrchestrator
+from benchmarks.fake_ollama import FakeOllama
+
+NUM_CTX = 2048
+ANSWERS = ["Jane Doe", "54", "Penicillin", "yes", "Knee surgery in 2019"]
+SENTENCE = "I have had some trouble with my {} lately and I am not sure whether it matters for the operation."
+TOPICS = ["knee", "stomach", "sleep", "blood pressure", "back", "breathing", "medication", "teeth"]
+REPLY = ("That is a good question. It can matter, so please mention it to the anesthesiologist on the day. "
+         "Most patients with this can still have the operation as planned. ")
+LENGTHS = {"short": (1, 1), "long": (6, 8)}  # (sentences per patient message, reply repeats)
+
+
+class RecordingClient(OllamaClient):
+    """Keeps the estimated prompt size and Ollama's timing fields of every response."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats: List[Dict[str, int]] = []
+
+    def chat(self, payload: Dict[str, Any], timeout=None) -> Dict[str, Any]:
+        data = super().chat(payload, timeout)
+        messages = payload["messages"]
+        self.stats.append({"prompt": sum(estimate_tokens(m["content"]) + MESSAGE_OVERHEAD for m in messages),
+                           "history": sum(m["role"] != "system" for m in messages) - 1,
+                           "evaluated": data.get("prompt_eval_count", 0)})
+        return data
+
+
+def chat_session(length: str, turns: int, **kwargs: Any) -> Dict[str, Any]:
+    sentences, repeats = LENGTHS[length]
+    truncated = []
+
+    def reply(payload: Dict[str, Any]) -> str:
+        # What the model sees after num_ctx truncation: did the system prompt survive?
+        truncated.append(payload["messages"][0]["content"] != DEFAULT_SYSTEM_PROMPT)
+        return REPLY * repeats
+
+    with FakeOllama(reply_fn=reply, context_tokens=NUM_CTX, prefix_cache_slots=1, prompt_token_delay_s=0.0002) as fake:
+        client = RecordingClient(base_url=fake.base_url)
+        chatbot = OllamaChatbot(client=client, **kwargs)
+        orch = ConversationOrchestrator(GraphQuestionFlow("data/questions.json"), MemoryTranscriptStore(), chatbot=chatbot)
+        conv = Conversation(conversation_id="bench")
+        orch.start(conv)
+        answers = iter(ANSWERS)
+        latencies = []
+        for turn in range(1, turns + 1):
+            text = " ".join(SENTENCE.format(TOPICS[(turn + i) % len(TOPICS)]) for i in range(sentences))
+            t0 = time.perf_counter()
+            orch.handle_user_message(conv, f"Turn {turn}: {text}", mode=Mode.CHAT)
+            latencies.append(time.perf_counter() - t0)
+            if turn % 10 == 0:
+                orch.handle_user_message(conv, next(answers, "no"), mode=Mode.ANSWER)
+        client.close()
+    return {"stats": client.stats, "latencies": latencies, "truncated": sum(truncated),
+            "counter": chatbot.history.counter}
+
+
+def run(turns: int = 60) -> None:
+    configs = [
+        ("last 10 messages", {"max_history": 10, "history_tokens": None, "summary_tokens": 0, "stable_history": False}),
+        ("1024 tok, sliding", {"history_tokens": 1024, "stable_history": False}),
+        ("1024 tok, stable", {}),
+    ]
+    print(f"{turns} chat turns, num_ctx {NUM_CTX}")
+    print(f"{'':7s}{'':19s} {'prompt tok':>16s} {'history msgs':>13s} {'truncated':>10s} "
+          f"{'evaluated':>10s} {'turn p50':>9s} {'turn p95':>9s}")
+    print(f"{'':7s}{'':19s} {'mean':>7s} {'max':>8s}")
+    for length in LENGTHS:
+        for label, kwargs in configs:
+            r = chat_session(length, turns, **kwargs)
+            stats, lat = r["stats"], sorted(r["latencies"])
+            prompts = [s["prompt"] for s in stats]
+            print(f"{length:7s}{label:19s} {sum(prompts) / len(prompts):7.0f} {max(prompts):8d} "
+                  f"{sum(s['history'] for s in stats) / len(stats):13.1f} {r['truncated']:10d} "
+                  f"{sum(s['evaluated'] for s in stats):10d} {lat[len(lat) // 2] * 1000:7.1f}ms "
+                  f"{lat[int(len(lat) * 0.95)] * 1000:7.1f}ms")
+        counter = r["counter"]
+        print(f"{'':7s}token counts cached: {counter.hits} hits, {counter.misses} counted")
+
+
+if __name__ == "__main__":
+    run(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,55 @@
+'''What: Per-call latency of bare requests.post (old code) vs the pooled OllamaClient, against the fake Ollama.
+Why: Shows what connection reuse saves per turn and how many TCP connections each approach opens.
+
+Run from the Morton folder:  python -m benchmarks.bench_http_pool'''
+
+from __future__ import annotations
+import statistics
+import time
+
+import requests
+
+from app.adapters.ollama_http import OllamaClient
+from benchmarks.fake_ollama import FakeOllama
+
+PAYLOAD = {"model": "llama3.1", "messages": [{"role": "user", "content": "hello"}]}
+
+
+def _measure(call, calls: int) -> list[float]:
+    out = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        call()
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def _report(name: str, ms: list[float], connections: int) -> None:
+    ms = sorted(ms)
+    p50 = statistics.median(ms)
+    p99 = ms[int(len(ms) * 0.99) - 1]
+    print(f"{name:<22} p50 {p50:6.2f} ms   p99 {p99:6.2f} ms   connections {connections}")
+
+
+def run(calls: int = 500) -> None:
+    with FakeOllama(reply="ok") as fake:
+        url = f"{fake.base_url}/api/chat"
+
+        def bare():
+            r = requests.post(url, json={**PAYLOAD, "stream": False}, timeout=60)
+            r.raise_for_status()
+            return r.json()["message"]["content"]
+
+        before = fake.connections
+        bare_ms = _measure(bare, calls)
+        _report("bare requests.post", bare_ms, fake.connections - before)
+
+        client = OllamaClient(base_url=fake.base_url)
+        before = fake.connections
+        pooled_ms = _measure(lambda: client.chat(PAYLOAD)["message"]["content"], calls)
+        _report("pooled OllamaClient", pooled_ms, fake.connections - before)
+        client.close()
+
+
+if __name__ == "__main__":
+    run()
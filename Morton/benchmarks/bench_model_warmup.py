@@ -0,0 +1,104 @@
+'''What: Startup and first-turn latency with cold model loads: one model for everything (as before) vs per-task
+routing (app/adapters/model_router.py) without warming, with a blocking prewarm, and with a background prewarm
+while the patient reads the first question. Then the same after an idle gap longer than Ollama's default
+keep-alive, and a chat turn that falls back to the large model when the chat model is not pulled (Ollama 404).
+
+The stub Ollama (benchmarks/fake_ollama.py) loads the small chat model in LOAD["llama3.2:3b"] s and the large
+one in LOAD["llama3.1"] s, and unloads a model after IDLE_S s without requests unless the request's
+keep_alive says otherwise. Times are scaled down; real loads take seconds to tens of seconds, the default
+keep-alive is 5 minutes.
+
+Run from the Morton folder:  python -m benchmarks.bench_model_warmup [think_s]'''
+
+from __future__ import annotations
+import sys
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Dict, Optional, Sequence
+
+from app.domain.models import Conversation, Mode
+from app.adapters.improved_ollama_summarizer import OllamaSummarizer
+from app.adapters.model_router import ModelRouter
+from app.adapters.ollama_chatbot import OllamaChatbot
+from app.adapters.ollama_http import OllamaClient
+from app.adapters.question_flow_graph import GraphQuestionFlow
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.application.orchestrator import ConversationOrchestrator
+from benchmarks.fake_ollama import FakeOllama
+
+LOAD = {"llama3.2:3b": 0.8, "llama3.1": 2.5, "jobautomation/OpenEuroLLM-Danish:latest": 2.5}
+IDLE_S = 1.5
+QUESTION = "Can I drink water before the operation?"
+
+
+def _build(router: ModelRouter, client: OllamaClient) -> ConversationOrchestrator:
+    return ConversationOrchestrator(
+        GraphQuestionFlow("data/questions.json"), MemoryTranscriptStore(),
+        chatbot=OllamaChatbot(model=router.model("chat"), client=router.client("chat", client)),
+        summarizer=OllamaSummarizer(model=router.model("summarization"), client=router.client("summarization", client)),
+        template_path="data/summary_schema.json")
+
+
+def session(router: ModelRouter, prewarm: Optional[str], think_s: float, idle_s: float = 0.0,
+            missing: Sequence[str] = ()) -> Dict[str, Any]:
+    """
+    startup (until the first question is shown), first chat turn, finalize. The patient takes think_s per
+    question; idle_s is a pause after an earlier chat turn; the stub answers 404 for the missing models.
+    """
+    with FakeOllama(model_load_delays=LOAD, keep_alive_s=IDLE_S, prompt_delay_s=0.02, token_delay_s=0.002,
+                    missing_models=missing) as fake:
+        client = OllamaClient(base_url=fake.base_url)
+        t0 = time.perf_counter()
+        if prewarm == "blocking":
+            router.prewarm(client)
+        elif prewarm == "background":
+            threading.Thread(target=router.prewarm, args=(client,), daemon=True).start()
+        orch = _build(router, client)
+        conv = Conversation(conversation_id="bench")
+        orch.start(conv)
+        startup = time.perf_counter() - t0
+
+        time.sleep(think_s)  # the patient reads the first question, then asks something
+        if idle_s:
+            orch.handle_user_message(conv, QUESTION, mode=Mode.CHAT)  # an earlier chat turn...
+            time.sleep(idle_s)                                         # ...then a long pause
+        t1 = time.perf_counter()
+        orch.handle_user_message(conv, QUESTION, mode=Mode.CHAT)
+        chat = time.perf_counter() - t1
+
+        for answer in ("Jane Doe", "54", "No allergies"):
+            time.sleep(think_s)
+            orch.handle_user_message(conv, answer, mode=Mode.ANSWER)
+        t2 = time.perf_counter()
+        orch.finalize(conv)
+        finalize = time.perf_counter() - t2
+        client.close()
+        return {"startup": startup, "chat": chat, "finalize": finalize, "loads": fake.loads,
+                "fallbacks": orch.chatbot.client.fallbacks}
+
+
+def run(think_s: float = 1.0) -> None:
+    single = ModelRouter.single("llama3.1", keep_alive=None)  # before: one model, Ollama's default keep-alive
+    routed = ModelRouter.from_file("data/models.json")
+    no_keep_alive = ModelRouter({t: replace(r, keep_alive=None) for t, r in routed.routes.items()}, routed.prewarm_tasks)
+
+    rows = [
+        ("one model, cold", single, None, 0.0),
+        ("routed, cold", routed, None, 0.0),
+        ("routed, blocking prewarm", routed, "blocking", 0.0),
+        ("routed, background prewarm", routed, "background", 0.0),
+        (f"idle {IDLE_S * 2:.0f}s, no keep_alive", no_keep_alive, "background", IDLE_S * 2),
+        (f"idle {IDLE_S * 2:.0f}s, keep_alive 30m", routed, "background", IDLE_S * 2),
+        ("chat model not pulled, fallback", routed, "blocking", 0.0, ["llama3.2:3b"]),
+    ]
+    print(f"loads: {LOAD}; patient reads the first question for {think_s}s")
+    print(f"{'':34s} {'startup':>8s} {'1st chat':>9s} {'finalize':>9s} {'loads':>6s} {'fallbacks':>10s}")
+    for label, router, prewarm, idle, *missing in rows:
+        r = session(router, prewarm, think_s, idle, *missing)
+        print(f"{label:34s} {r['startup']:7.2f}s {r['chat']:8.2f}s {r['finalize']:8.2f}s {r['loads']:6d} "
+              f"{r['fallbacks']:10d}")
+
+
+if __name__ == "__main__":
+    run(*(float(a) for a in sys.argv[1:2]))
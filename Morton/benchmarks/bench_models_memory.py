@@ -0,0 +1,110 @@
+'''What: Memory of 100k in-memory transcript messages (1,000 conversations x 100 messages) with the slotted
+Message/Conversation in app/domain/models.py vs the previous plain dataclasses (copied below), and the time to
+serialize them to and from JSON-able records. Message text is created beforehand and shared by both runs,
+so "bytes/message" is the model's own overhead.
+
+Run from the Morton folder:  python -m benchmarks.bench_models_memory [messages]'''
+
+from __future__ import annotations
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.domain.models import Answers, Conversation, ConversationState, Message, Role
+
+
+@dataclass
+class LegacyMessage:
+    role: Role
+    content: str
+    ts: int = int(datetime.now(timezone.utc).timestamp())
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class LegacyConversation:
+    conversation_id: str
+    state: ConversationState = ConversationState.FLOW_ASKING
+    question_index: int = 0
+    active_question_id: Optional[str] = None
+    answers: Dict[str, str] = field(default_factory=Answers)
+    parsed_answers: Dict[str, Any] = field(default_factory=dict)
+
+
+def _shape(i: int):
+    """Role and meta as the orchestrator writes them: question, answer, chat question, chat answer, re-ask."""
+    k = i % 5
+    if k == 0:
+        return Role.SYSTEM, {"question_id": f"q{i % 40}", "channel": "questionnaire"}
+    if k == 1:
+        return Role.PATIENT, {"mode": "answer"}
+    if k == 2:
+        return Role.PATIENT, {"mode": "chat"}
+    if k == 3:
+        return Role.ASSISTANT, {"mode": "chat"}
+    return Role.SYSTEM, {}  # e.g. "Questionnaire complete." / "Chatbot not available."
+
+
+def build(message_cls, conversation_cls, texts, per_conv: int):
+    convs = []
+    for c in range(len(texts) // per_conv):
+        conv = conversation_cls(conversation_id=f"c{c}")
+        msgs = []
+        for i in range(c * per_conv, (c + 1) * per_conv):
+            role, meta = _shape(i)
+            msgs.append(message_cls(role=role, content=texts[i], ts=1769513000 + i, meta=dict(meta)))
+        convs.append((conv, msgs))
+    return convs
+
+
+def measure(message_cls, conversation_cls, texts, per_conv: int):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    data = build(message_cls, conversation_cls, texts, per_conv)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return data, after - before
+
+
+def run(n: int = 100_000, per_conv: int = 100) -> None:
+    texts = [f"Patient line number {i}: I have no allergies that I know of." for i in range(n)]
+
+    legacy, legacy_bytes = measure(LegacyMessage, LegacyConversation, texts, per_conv)
+    slotted, slotted_bytes = measure(Message, Conversation, texts, per_conv)
+    convs = n // per_conv
+    conv_legacy = sys.getsizeof(legacy[0][0]) + sys.getsizeof(legacy[0][0].__dict__)
+    conv_slotted = sys.getsizeof(slotted[0][0])
+    print(f"{n} messages in {convs} conversations")
+    print(f"legacy dataclasses: {legacy_bytes / n:6.1f} bytes/message (incl. list + conversation share), "
+          f"conversation object {conv_legacy} bytes")
+    print(f"slotted models:     {slotted_bytes / n:6.1f} bytes/message, conversation object {conv_slotted} bytes")
+
+    legacy_msgs = [m for _, ms in legacy for m in ms]
+    slotted_msgs = [m for _, ms in slotted for m in ms]
+
+    def legacy_roundtrip():
+        lines = [json.dumps({"role": m.role.value, "content": m.content, "ts": m.ts, "meta": m.meta}) for m in legacy_msgs]
+        return [LegacyMessage(role=Role(r["role"]), content=r["content"], ts=r["ts"], meta=r["meta"])
+                for r in map(json.loads, lines)]
+
+    def slotted_roundtrip():
+        lines = [json.dumps(m.to_record()) for m in slotted_msgs]
+        return [Message.from_record(r) for r in map(json.loads, lines)]
+
+    for label, fn in (("legacy", legacy_roundtrip), ("slotted", slotted_roundtrip)):
+        t0 = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - t0
+        print(f"{label:8s} to JSON lines and back: {elapsed * 1000:6.0f} ms ({n / elapsed:9,.0f} messages/s)")
+    assert out == slotted_msgs
+
+    stamps = {Message(Role.PATIENT, "x").ts for _ in range(3)}
+    print(f"default ts: legacy fixed at import {LegacyMessage(Role.PATIENT, 'x').ts}, now per message {sorted(stamps)}")
+
+
+if __name__ == "__main__":
+    run(*(int(a) for a in sys.argv[1:2]))
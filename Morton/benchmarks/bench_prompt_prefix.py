@@ -0,0 +1,118 @@
+'''What: Prompt evaluation per turn over a 40-turn chat (with a questionnaire answer every 8 turns), read from the
+prompt_eval_count / prompt_eval_duration fields of each Ollama response, for three prompt layouts:
+
+    before          system prompt, questionnaire context, history (last 10 messages), question
+    context last    system prompt, stable history window, questionnaire context, question
+    stable window   system prompt, questionnaire context, stable history window, question (the default order)
+
+"Stable history window": the history start only moves in steps (HistoryWindow). The questionnaire context
+changes on answers only, the last-10 window on every chat turn once it is full.
+
+The stub Ollama keeps the KV cache of the previous request per model (prefix_cache_slots=1, like a server with
+OLLAMA_NUM_PARALLEL=1) and only evaluates the tokens after the longest cached prefix, as Ollama's runner does.
+
+Run from the Morton folder:  python -m benchmarks.bench_prompt_prefix [turns]'''
+
+from __future__ import annotations
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.domain.models import Conversation, Message, Mode, Role
+from app.adapters.ollama_chatbot import OllamaChatbot, chat_history
+from app.adapters.ollama_http import OllamaClient
+from app.adapters.question_flow_graph import GraphQuestionFlow
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.application.orchestrator import ConversationOrchestrator
+from app.interfaces.retriever import RetrievedPassage
+from benchmarks.fake_ollama import FakeOllama
+
+ANSWERS = ["Jane Doe", "54", "Penicillin", "yes", "Knee surgery in 2019"]
+QUESTIONS = ["Can I drink water before the operation?", "Will I be awake during the surgery?",
+             "How long does the anesthesia last?", "Why do you need to know this?",
+             "What happens if I feel sick afterwards?", "Can my partner stay with me?"]
+
+
+class RecordingClient(OllamaClient):
+    """Keeps Ollama's timing fields of every response."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats: List[Dict[str, int]] = []
+
+    def chat(self, payload: Dict[str, Any], timeout=None) -> Dict[str, Any]:
+        data = super().chat(payload, timeout)
+        self.stats.append({k: data.get(k, 0) for k in ("prompt_eval_count", "prompt_eval_duration")})
+        return data
+
+
+class BeforeChatbot(OllamaChatbot):
+    """The prompt before this change: a last-10 history window."""
+
+    def _build_messages(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None,
+                        passages: Sequence[RetrievedPassage] = ()) -> List[dict]:
+        messages = [{"role": "system", "content": self.system_prompt}]
+        if context:
+            messages.append({"role": "system", "content": f"Questionnaire context: {context}"})
+        for m in chat_history(user_text, transcript)[-10:]:
+            messages.append({"role": "user" if m.role == Role.PATIENT else "assistant", "content": m.content})
+        messages.append({"role": "user", "content": user_text})
+        return messages
+
+
+class ContextLastChatbot(OllamaChatbot):
+    """Stable history window, but the questionnaire context after it (re-evaluated every turn)."""
+
+    def _build_messages(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None,
+                        passages: Sequence[RetrievedPassage] = ()) -> List[dict]:
+        messages = [{"role": "system", "content": self.system_prompt}]
+        history = self.history.select(getattr(context, "conversation_id", None), chat_history(user_text, transcript))
+        for m in history:
+            messages.append({"role": "user" if m.role == Role.PATIENT else "assistant", "content": m.content})
+        if context:
+            messages.append({"role": "system", "content": f"Questionnaire context: {context}"})
+        messages.append({"role": "user", "content": user_text})
+        return messages
+
+
+def chat_session(fake: FakeOllama, chatbot_cls, turns: int, **kwargs: Any) -> List[Dict[str, int]]:
+    client = RecordingClient(base_url=fake.base_url)
+    orch = ConversationOrchestrator(GraphQuestionFlow("data/questions.json"), MemoryTranscriptStore(),
+                                    chatbot=chatbot_cls(client=client, **kwargs))
+    conv = Conversation(conversation_id=f"bench-{chatbot_cls.__name__}-{kwargs}")
+    orch.start(conv)
+    answers = iter(ANSWERS)
+    for turn in range(1, turns + 1):
+        orch.handle_user_message(conv, f"{QUESTIONS[turn % len(QUESTIONS)]} (turn {turn})", mode=Mode.CHAT)
+        if turn % 8 == 0:
+            orch.handle_user_message(conv, next(answers, "no"), mode=Mode.ANSWER)
+    client.close()
+    return client.stats
+
+
+def run(turns: int = 40) -> None:
+    ten = {"max_history": 10, "history_tokens": None, "summary_tokens": 0}  # the same history in every layout
+    layouts = [("before", BeforeChatbot, {}),
+               ("context last", ContextLastChatbot, ten),
+               ("stable window", OllamaChatbot, ten)]
+    results = {}
+    for label, cls, kwargs in layouts:
+        # A fresh server per layout, so no layout profits from another's cache
+        with FakeOllama(prefix_cache_slots=1, prompt_token_delay_s=0.0002) as fake:
+            results[label] = chat_session(fake, cls, turns, **kwargs)
+
+    shown = [t for t in (1, 2, 5, 6, 10, 11, 20, 25, 30, 35, 40) if t <= turns]
+    print("prompt tokens evaluated / prompt_eval_duration (ms) per turn")
+    print(f"{'turn':>5} " + " ".join(f"{label:>20s}" for label, _, _ in layouts))
+    for t in shown:
+        cells = []
+        for label, _, _ in layouts:
+            s = results[label][t - 1]
+            cells.append(f"{s['prompt_eval_count']:>8d} {s['prompt_eval_duration'] / 1e6:8.1f}ms")
+        print(f"{t:>5} " + " ".join(f"{c:>20s}" for c in cells))
+    print(f"{'total':>5} " + " ".join(
+        f"{sum(s['prompt_eval_count'] for s in results[label]):>8d} "
+        f"{sum(s['prompt_eval_duration'] for s in results[label]) / 1e6:8.1f}ms".rjust(20) for label, _, _ in layouts))
+
+
+if __name__ == "__main__":
+    run(*(int(a) for a in sys.argv[1:2]))
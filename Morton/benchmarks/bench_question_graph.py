@@ -0,0 +1,112 @@
+'''What: One full interview over a generated questionnaire (default 1,000 questions; every 4th question opens
+a block of 3 follow-ups asked only for certain answers) with a next-question lookup and a completeness check
+after each answer:
+- linear: the old way - scan forward from the current index evaluating each "when" object as data,
+  then rescan all questions for open required ones (ConversationEngine.unanswered_required_slots)
+- graph: GraphQuestionFlow - the questionnaire compiled once into predicates, skip pointers and a bitset
+
+Run from the Morton folder:  python -m benchmarks.bench_question_graph [questions]'''
+
+from __future__ import annotations
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from app.domain.models import Conversation
+from app.adapters.question_flow_graph import GraphQuestionFlow
+
+
+def generate(n: int) -> List[Dict[str, Any]]:
+    questions = []
+    gate = None
+    for i in range(n):
+        q = {"id": f"q{i}", "text": f"Question {i}?", "type": "yesno" if i % 4 == 0 else "free_text",
+             "required": i % 7 != 0}
+        if i % 4 == 0:
+            gate = q["id"]
+        else:
+            q["when"] = {gate: "yes"}
+        questions.append(q)
+    return questions
+
+
+def answer_for(qid: str) -> str:
+    return "yes" if int(qid[1:]) % 8 == 0 else "no"  # half of the gates open their follow-ups
+
+
+def _matches(when: Dict[str, Any], answers: Dict[str, str]) -> bool:
+    return all(str(answers.get(k, "")).strip().casefold() == str(v).casefold() for k, v in when.items())
+
+
+def linear_interview(questions: List[Dict[str, Any]]) -> int:
+    answers: Dict[str, str] = {}
+    skipped = set()
+    index = asked = 0
+    while True:
+        current = None
+        for i in range(index, len(questions)):
+            q = questions[i]
+            if q.get("when") and not _matches(q["when"], answers):
+                skipped.add(q["id"])
+                continue
+            index, current = i, q
+            break
+        missing = [q["id"] for q in questions if q["required"] and q["id"] not in answers and q["id"] not in skipped]
+        complete = not missing
+        if current is None:
+            break
+        answers[current["id"]] = answer_for(current["id"])
+        index += 1
+        asked += 1
+    assert complete
+    return asked
+
+
+def graph_interview(flow: GraphQuestionFlow, cid: str) -> int:
+    conv = Conversation(conversation_id=cid)
+    asked = 0
+    while True:
+        q = flow.get_question(conv)
+        complete = flow.is_complete(conv)
+        if q is None:
+            break
+        conv.answers[q.id] = answer_for(q.id)
+        flow.advance_with_answer(conv, conv.answers[q.id])
+        asked += 1
+    assert complete
+    flow.forget(cid)
+    return asked
+
+
+def run(n: int = 1000) -> None:
+    questions = generate(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "questions.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"questions": questions}, f)
+
+        t0 = time.perf_counter()
+        flow = GraphQuestionFlow(path)
+        compile_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        linear_asked = linear_interview(questions)
+        linear_s = time.perf_counter() - t0
+
+        rounds = 20
+        t0 = time.perf_counter()
+        for r in range(rounds):
+            graph_asked = graph_interview(flow, f"c{r}")
+        graph_s = (time.perf_counter() - t0) / rounds
+
+    assert linear_asked == graph_asked
+    print(f"{n} questions, {graph_asked} asked; load + compile {compile_ms:.1f} ms")
+    print(f"linear: interview {linear_s * 1000:8.1f} ms, {linear_s / linear_asked * 1e6:8.1f} us/turn")
+    print(f"graph:  interview {graph_s * 1000:8.1f} ms, {graph_s / graph_asked * 1e6:8.1f} us/turn")
+
+
+if __name__ == "__main__":
+    run(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,67 @@
+'''What: build_questionnaire_answers on a 500-question questionnaire: the old per-index Conversation clones
+vs one pass over JsonQuestionFlow.questions(), and the cached result when conv.answers has not changed.
+
+Run from the Morton folder:  python -m benchmarks.bench_questionnaire_answers [questions]'''
+
+from __future__ import annotations
+import json
+import os
+import sys
+import tempfile
+import time
+
+from app.domain.models import Conversation
+from app.adapters.question_flow_json import JsonQuestionFlow
+from app.application.orchestrator import BaseOrchestrator
+
+
+def _legacy(flow: JsonQuestionFlow, conv: Conversation) -> list[dict]:
+    # The builder as it was: a new Conversation per question index
+    items = []
+    idx = 0
+    while True:
+        tmp = type(conv)(conversation_id=conv.conversation_id)
+        tmp.question_index = idx
+        q = flow.get_question(tmp)
+        if not q:
+            break
+        ans = conv.answers.get(q.id)
+        if ans is not None:
+            items.append({"question_id": q.id, "question": q.text, "answer": ans})
+        idx += 1
+    return items
+
+
+def _time(fn, rounds: int = 300) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - t0) / rounds * 1e6
+
+
+def run(questions: int = 500) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "questions.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"questions": [{"id": f"q{i}", "text": f"Question {i}?"} for i in range(questions)]}, f)
+        flow = JsonQuestionFlow(path)
+
+    orch = BaseOrchestrator(flow)
+    conv = Conversation(conversation_id="bench")
+    for i in range(0, questions, 2):
+        conv.answers[f"q{i}"] = f"answer {i}"
+
+    assert _legacy(flow, conv) == orch.build_questionnaire_answers(conv)
+
+    def uncached():
+        conv.answers["q0"] = "changed"  # bumps answers.version, so the cache is rebuilt
+        orch.build_questionnaire_answers(conv)
+
+    print(f"{questions} questions, {len(conv.answers)} answered")
+    print(f"legacy (clone per index):      {_time(lambda: _legacy(flow, conv)):8.1f} us")
+    print(f"single pass (answers changed): {_time(uncached):8.1f} us")
+    print(f"cached (answers unchanged):    {_time(lambda: orch.build_questionnaire_answers(conv)):8.1f} us")
+
+
+if __name__ == "__main__":
+    run(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,215 @@
+'''What: Reproducible load for the orchestrator. Replays recorded sessions (ToGood2Go/runs/*.jsonl, read through
+ToGood2Go/utils/events.py) or synthetic ones generated from data/questions.json through ConversationOrchestrator.
+N sessions run concurrently against a stub Ollama in its own process (benchmarks/fake_ollama.py) with
+configurable latency and throughput. The result is one JSON report, so runs can be diffed:
+
+- turn latency percentiles per kind (answer, chat) and for finalize
+- CPU time spent in this process during turns (our code: orchestration, JSON, HTTP client) vs waiting
+- memory retained per finished session (tracemalloc, measured in a separate sequential pass)
+
+Run from the Morton folder:
+    python -m benchmarks.bench_replay --sessions 200 --concurrency 16 --out replay.json
+    python -m benchmarks.bench_replay --runs "ToGood2Go/runs/*.jsonl" --tokens-per-s 40 --max-parallel 4'''
+
+from __future__ import annotations
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.domain.models import Conversation, Mode
+from app.adapters.question_flow_graph import GraphQuestionFlow
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.adapters.ollama_chatbot import OllamaChatbot
+from app.adapters.improved_ollama_summarizer import OllamaSummarizer
+from app.adapters.ollama_http import OllamaClient
+from app.application.orchestrator import ConversationOrchestrator
+from benchmarks.fake_ollama import fake_ollama_process
+from ToGood2Go.utils.events import AnswerGiven, ChatMessage, iter_events
+
+QUESTIONS = "data/questions.json"
+TEMPLATE = "data/summary_schema.json"
+
+Turn = Tuple[str, str]  # ("answer" | "chat", text)
+
+_FREE_TEXT = ["Jane Doe", "Penicillin and latex", "Knee replacement on the left side", "No, I quit ten years ago",
+              "Nothing since midnight", "I sometimes get nauseous after operations"]
+_CHAT = ["Why do you need to know this?", "Can I drink water before the operation?",
+         "Will I be awake during the surgery?", "How long does the anesthesia last?"]
+
+
+def synthetic_sessions(n: int, chat_rate: float, seed: int) -> List[List[Turn]]:
+    """One answer per question in data/questions.json, typed by question type, with random chat detours."""
+    with open(QUESTIONS, "r", encoding="utf-8") as f:
+        questions = json.load(f)["questions"]
+    rng = random.Random(seed)
+    sessions = []
+    for _ in range(n):
+        turns: List[Turn] = []
+        for q in questions:
+            if rng.random() < chat_rate:
+                turns.append(("chat", rng.choice(_CHAT)))
+            kind = q.get("type", "free_text")
+            if kind == "yesno":
+                text = rng.choice(["yes", "no", "ja", "nej"])
+            elif kind == "number":
+                text = str(rng.randint(18, 90))
+            elif kind == "choice" and q.get("choices"):
+                text = rng.choice(q["choices"])
+            else:
+                text = rng.choice(_FREE_TEXT)
+            turns.append(("answer", text))
+        sessions.append(turns)
+    return sessions
+
+
+def recorded_sessions(pattern: str, n: int) -> List[List[Turn]]:
+    """Answers and patient chat questions from recorded logs, repeated round-robin up to n sessions."""
+    scripts = []
+    for path in sorted(glob.glob(pattern)):
+        turns = [("answer", e.text) if isinstance(e, AnswerGiven) else ("chat", e.text)
+                 for e in iter_events(path)
+                 if isinstance(e, AnswerGiven) or (isinstance(e, ChatMessage) and e.role == "patient")]
+        if turns:
+            scripts.append(turns)
+    if not scripts:
+        raise SystemExit(f"no replayable sessions in {pattern}")
+    return [scripts[i % len(scripts)] for i in range(n)]
+
+
+def build_orchestrator(base_url: str) -> Tuple[ConversationOrchestrator, OllamaClient]:
+    client = OllamaClient(base_url=base_url)
+    orch = ConversationOrchestrator(GraphQuestionFlow(QUESTIONS), MemoryTranscriptStore(),
+                                    chatbot=OllamaChatbot(client=client), summarizer=OllamaSummarizer(client=client),
+                                    template_path=TEMPLATE)
+    return orch, client
+
+
+def play(orch: ConversationOrchestrator, cid: str, turns: List[Turn], samples: Dict[str, List[Tuple[float, float]]]) -> None:
+    """Run one session; appends (wall_s, thread_cpu_s) per turn to samples[kind]."""
+    conv = Conversation(conversation_id=cid)
+    orch.start(conv)
+    done = False
+    for kind, text in turns:
+        if done:
+            break
+        w, c = time.perf_counter(), time.thread_time()
+        res = orch.handle_user_message(conv, text, mode=Mode.CHAT if kind == "chat" else Mode.ANSWER)
+        samples[kind].append((time.perf_counter() - w, time.thread_time() - c))
+        done = res.done
+    w, c = time.perf_counter(), time.thread_time()
+    orch.finalize(conv)
+    samples["finalize"].append((time.perf_counter() - w, time.thread_time() - c))
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ms = sorted(v * 1000 for v in values)
+    pick = lambda p: round(ms[min(len(ms) - 1, int(len(ms) * p))], 3)
+    return {"count": len(ms), "mean": round(sum(ms) / len(ms), 3), "p50": pick(0.50), "p90": pick(0.90),
+            "p99": pick(0.99), "max": round(ms[-1], 3)}
+
+
+def run_load(base_url: str, sessions: List[List[Turn]], concurrency: int) -> Dict[str, Any]:
+    orch, client = build_orchestrator(base_url)
+    samples: Dict[str, List[Tuple[float, float]]] = {"answer": [], "chat": [], "finalize": []}
+    lock = threading.Lock()
+
+    def worker(i: int) -> None:
+        local: Dict[str, List[Tuple[float, float]]] = {"answer": [], "chat": [], "finalize": []}
+        play(orch, f"s{i}", sessions[i], local)
+        with lock:
+            for k, v in local.items():
+                samples[k].extend(v)
+
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(len(sessions))))
+    wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+    client.close()
+
+    turn_wall = sum(w for v in samples.values() for w, _ in v)
+    turn_cpu = sum(c for v in samples.values() for _, c in v)
+    return {
+        "wall_s": round(wall, 3),
+        "sessions_per_s": round(len(sessions) / wall, 3),
+        "latency_ms": {k: _percentiles([w for w, _ in v]) for k, v in samples.items()},
+        "cpu": {
+            "process_cpu_s": round(cpu, 3),
+            "turn_cpu_s": round(turn_cpu, 3),        # our code, summed over all turns
+            "turn_wait_s": round(turn_wall - turn_cpu, 3),  # waiting on the stub model (and on the GIL)
+            "own_code_share": round(turn_cpu / turn_wall, 4) if turn_wall else None,
+            "cpu_ms_per_turn": {k: _percentiles([c for _, c in v]).get("mean") for k, v in samples.items()},
+        },
+    }
+
+
+def measure_memory(base_url: str, sessions: List[List[Turn]]) -> Dict[str, Any]:
+    """Bytes still allocated per finished session (transcript, answers, caches), sessions run one by one."""
+    orch, client = build_orchestrator(base_url)
+    samples: Dict[str, List[Tuple[float, float]]] = {"answer": [], "chat": [], "finalize": []}
+    play(orch, "warmup", sessions[0], samples)  # imports, schema registry, connection pool
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i, turns in enumerate(sessions):
+        play(orch, f"m{i}", turns, samples)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    client.close()
+    retained = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    return {"sessions": len(sessions), "bytes_per_session": retained // len(sessions),
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)}
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--runs", help='glob of recorded logs, e.g. "ToGood2Go/runs/*.jsonl" (default: synthetic)')
+    ap.add_argument("--sessions", type=int, default=100)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--chat-rate", type=float, default=0.2, help="synthetic: chance of a chat detour per question")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--tokens-per-s", type=float, default=200.0, help="stub generation speed per request")
+    ap.add_argument("--prompt-ms", type=float, default=20.0, help="stub fixed prompt processing time")
+    ap.add_argument("--prompt-token-us", type=float, default=50.0, help="stub prompt processing time per token")
+    ap.add_argument("--max-parallel", type=int, default=None, help="stub requests generated at once (throughput)")
+    ap.add_argument("--memory-sessions", type=int, default=20)
+    ap.add_argument("--out", help="write the JSON report here (default: stdout)")
+    args = ap.parse_args(argv)
+
+    sessions = (recorded_sessions(args.runs, args.sessions) if args.runs
+                else synthetic_sessions(args.sessions, args.chat_rate, args.seed))
+    stub = {"token_delay_s": 1.0 / args.tokens_per_s, "prompt_delay_s": args.prompt_ms / 1000,
+            "prompt_token_delay_s": args.prompt_token_us / 1e6, "max_parallel": args.max_parallel}
+    with fake_ollama_process(**stub) as base_url:
+        load = run_load(base_url, sessions, args.concurrency)
+        memory = measure_memory(base_url, sessions[:args.memory_sessions])
+
+    report = {
+        "config": {**{k: v for k, v in vars(args).items() if k != "out"},
+                   "source": args.runs or f"synthetic:{QUESTIONS}",
+                   "turns": sum(len(s) for s in sessions)},
+        "env": {"python": platform.python_version(), "cpus": os.cpu_count(), "platform": platform.platform()},
+        "load": load,
+        "memory": memory,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
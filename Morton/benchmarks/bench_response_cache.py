@@ -0,0 +1,76 @@
+'''What: Replay the patient chat questions from recorded interview logs (ToGood2Go/runs/*.jsonl) through
+CachedChatbot and report the cache hit rate. The inner chatbot is a stub that counts model calls.
+
+Pass 1 starts cold; pass 2 replays the same sessions against a SQLite-backed cache reopened from disk,
+as after a restart. Logs are read through ToGood2Go/utils/events.py, which handles every log format.
+
+Run from the Morton folder:  python -m benchmarks.bench_response_cache ["ToGood2Go/runs/*.jsonl"]'''
+
+from __future__ import annotations
+import glob
+import os
+import sys
+import tempfile
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from app.domain.models import Message, Role
+from app.interfaces.chatbot import ChatContext, IChatbot
+from app.adapters.cached_chatbot import CachedChatbot
+from app.adapters.response_cache import SqliteResponseCache
+from ToGood2Go.utils.events import ChatMessage, QuestionShown, iter_events
+
+
+class CountingChatbot(IChatbot):
+    model = "stub"
+    system_prompt = "stub system prompt"
+
+    def __init__(self):
+        self.calls = 0
+
+    def answer(self, user_text: str, transcript: Sequence[Message], context: Optional[str] = None) -> str:
+        self.calls += 1
+        return f"answer to {user_text!r}"
+
+
+def chat_questions(path: str) -> Iterator[Tuple[str, Optional[str], str]]:
+    """(session id, current question id, patient question) for every chat question in one log."""
+    qid = None
+    for event in iter_events(path):
+        if isinstance(event, QuestionShown):
+            qid = event.question_id
+        elif isinstance(event, ChatMessage) and event.role == "patient":
+            yield event.session_id or path, qid, event.text
+
+
+def replay(bot: CachedChatbot, questions: List[Tuple[str, Optional[str], str]]) -> None:
+    histories = {}
+    for session_id, qid, question in questions:
+        history = histories.setdefault(session_id, [])
+        history.append(Message(role=Role.PATIENT, content=question, meta={"mode": "chat"}))
+        shared = f"The patient is currently being asked question {qid}."
+        ctx = ChatContext(shared + "\nPreviously answered: ...", conversation_id=session_id, question_id=qid, shared=shared)
+        answer = bot.answer(user_text=question, transcript=list(history), context=ctx)
+        history.append(Message(role=Role.ASSISTANT, content=answer, meta={"mode": "chat"}))
+
+
+def run(pattern: str = "ToGood2Go/runs/*.jsonl") -> None:
+    paths = sorted(glob.glob(pattern))
+    questions = [q for path in paths for q in chat_questions(path)]
+    print(f"{len(paths)} logs, {len(questions)} chat questions")
+    if not questions:
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "cache.sqlite3")
+        for label in ("pass 1 (cold)", "pass 2 (reopened from disk)"):
+            inner = CountingChatbot()
+            cache = SqliteResponseCache(db)
+            bot = CachedChatbot(inner, cache=cache)
+            replay(bot, questions)
+            cache.close()
+            print(f"{label:28s} hits {bot.hits:3d}  misses {bot.misses:3d}  hit rate {bot.hit_rate:6.1%}  "
+                  f"model calls {inner.calls:3d}  conversation-scoped lookups {bot.personal_lookups}")
+
+
+if __name__ == "__main__":
+    run(*sys.argv[1:2])
@@ -0,0 +1,100 @@
+'''What: finalize latency with one full summarization call vs the running summary folded in the background.
+The stub model writes patient facts into notes; a full summary writes every field, an update only the patch.
+Between turns the "patient" thinks for think_s seconds, which is when the background folds run; finalize
+comes right after the last answer, so its fold is still on the clock.
+
+Run from the Morton folder:  python -m benchmarks.bench_running_summary [think_s]'''
+
+from __future__ import annotations
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+from app.domain.models import Conversation, Mode
+from app.adapters.question_flow_json import JsonQuestionFlow
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.adapters.improved_ollama_summarizer import OllamaSummarizer
+from app.adapters.ollama_http import OllamaClient
+from app.application.orchestrator import ConversationOrchestrator
+from app.application.running_summary import RunningSummary
+from benchmarks.fake_ollama import FakeOllama, dummy_instance
+
+ANSWERS = ["Jane Doe", "54", "Penicillin", "yes twice", "knee replacement", "quit ten years ago", "yes since midnight"]
+CHAT_AT = {2: "Why do you need to know about allergies?", 5: "Does smoking matter for anesthesia?"}
+CURRENT = re.compile(r"Current summary:\n(.*)\n\nNew transcript lines:\n", re.S)
+
+
+def stub_model(payload: Dict[str, Any]) -> str:
+    prompt = payload["messages"][-1]["content"]
+    facts = " ".join(line[len("PATIENT: "):] for line in prompt.splitlines() if line.startswith("PATIENT: "))
+    current = CURRENT.search(prompt)
+    if current is None:  # full summary: every field
+        out = dummy_instance(payload["format"])
+        out["notes"] = facts
+        return json.dumps(out)
+    notes = json.loads(current.group(1)).get("notes", "")
+    return json.dumps({"notes": f"{notes} {facts}".strip()})
+
+
+def interview(orch: ConversationOrchestrator, cid: str, think_s: float) -> Conversation:
+    conv = Conversation(conversation_id=cid)
+    orch.start(conv)
+    for i, answer in enumerate(ANSWERS):
+        if i in CHAT_AT:
+            orch.handle_user_message(conv, CHAT_AT[i], mode=Mode.CHAT)
+            time.sleep(think_s)
+        orch.handle_user_message(conv, answer)
+        if i < len(ANSWERS) - 1:  # main.py finalizes right after the last answer
+            time.sleep(think_s)
+    return conv
+
+
+def run(think_s: float = 1.0) -> None:
+    with FakeOllama(reply_fn=stub_model, prompt_token_delay_s=0.0005, token_delay_s=0.02) as fake, \
+            tempfile.TemporaryDirectory() as checkpoints:
+        client = OllamaClient(fake.base_url)
+        summarizer = OllamaSummarizer(client=client)
+
+        store = MemoryTranscriptStore()
+        orch = ConversationOrchestrator(JsonQuestionFlow("data/questions.json"), store,
+                                        summarizer=summarizer, template_path="data/summary_schema.json")
+        conv = interview(orch, "full", think_s)
+        t0 = time.perf_counter()
+        full = orch.finalize(conv)
+        full_s = time.perf_counter() - t0
+
+        running = RunningSummary(summarizer, store, checkpoint_dir=checkpoints)
+        orch = ConversationOrchestrator(JsonQuestionFlow("data/questions.json"), store,
+                                        summarizer=summarizer, template_path="data/summary_schema.json",
+                                        running_summary=running)
+        conv = interview(orch, "running", think_s)
+        t0 = time.perf_counter()
+        incremental = orch.finalize(conv)
+        running_s = time.perf_counter() - t0
+        assert not os.listdir(checkpoints)  # finalize drops the checkpoint of a finished conversation
+
+        # A process that stops mid-conversation: a new one reads the checkpoint back, nothing is left to fold
+        conv = interview(orch, "restart", think_s)
+        running.close()
+        restored = RunningSummary(summarizer, store, checkpoint_dir=checkpoints)
+        template = orch._load_template()
+        t0 = time.perf_counter()
+        after_restart = restored.result("restart", *orch._summary_plan(conv, template))
+        restart_s = time.perf_counter() - t0
+        restored.close()
+
+        # Both paths leave out answers that parsed completely ("54") and fold the same patient lines
+        assert incremental["notes"].split() == after_restart["notes"].split() == full["notes"].split()
+        print(f"think time {think_s:.1f} s between turns, {running.folds} folds over two interviews")
+        print(f"finalize, one full summary call:   {full_s * 1000:8.1f} ms")
+        print(f"finalize, running summary:         {running_s * 1000:8.1f} ms")
+        print(f"result after restart (checkpoint): {restart_s * 1000:8.1f} ms, {restored.folds} folds needed")
+        client.close()
+
+
+if __name__ == "__main__":
+    run(*(float(a) for a in sys.argv[1:2]))
@@ -0,0 +1,90 @@
+'''What: finalize with the full summary schema as Ollama's `format` vs the projected schema without the
+"x-deterministic" fields (questionnaire_answers, patient_questions), which the orchestrator fills in anyway.
+The stub model writes a realistic summary: whatever the format asks for, with the deterministic lists copied
+from the conversation, at a fixed delay per generated token.
+
+Run from the Morton folder:  python -m benchmarks.bench_schema_projection [token_delay_ms]'''
+
+from __future__ import annotations
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+from app.domain.models import Conversation, Mode
+from app.adapters.question_flow_json import JsonQuestionFlow
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.adapters.improved_ollama_summarizer import OllamaSummarizer
+from app.adapters.template_schema import DETERMINISTIC_MARKER
+from app.application.orchestrator import ConversationOrchestrator
+from benchmarks.fake_ollama import FakeOllama
+
+SCHEMA = "data/summary_schema.json"
+ANSWERS = ["Jane Doe", "54", "Penicillin", "yes, twice", "knee replacement", "no, quit 10 years ago", "yes"]
+CHAT = ["Why do you need my age?", "What does fasting mean before surgery?", "Can I take my usual medication?"]
+
+MODEL_PART = {
+    "patient": {"name": "Jane Doe", "age": 54, "allergies": "Penicillin", "prior_anesthesia": "yes",
+                "current_surgery": "Knee replacement", "asa_classification": "ASA-II",
+                "smoking_status": "former", "fasting_compliance": "compliant"},
+    "red_flags": [{"category": "allergy_concern", "severity": "medium",
+                   "description": "Penicillin allergy; avoid beta-lactam prophylaxis."}],
+    "notes": "Patient is calm, has had anesthesia twice before without complications.",
+}
+
+
+def _unmarked_copy(path: str, tmp: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    for prop in schema["properties"].values():
+        prop.pop(DETERMINISTIC_MARKER, None)
+    out = os.path.join(tmp, "summary_schema_full.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(schema, f)
+    return out
+
+
+def run(token_delay_ms: float = 5.0, rounds: int = 3) -> None:
+    deterministic: Dict[str, Any] = {}
+    generated = []
+
+    def reply(payload: Dict[str, Any]) -> str:
+        props = payload["format"]["properties"]
+        text = json.dumps({k: (MODEL_PART | deterministic)[k] for k in props})
+        generated.append((len(text.split(" ")), len(json.dumps(payload["format"]))))
+        return text
+
+    with tempfile.TemporaryDirectory() as tmp, FakeOllama(token_delay_s=token_delay_ms / 1000, reply_fn=reply) as fake:
+        for label, path in (("full schema", _unmarked_copy(SCHEMA, tmp)), ("projected schema", SCHEMA)):
+            store = MemoryTranscriptStore()
+            orch = ConversationOrchestrator(
+                JsonQuestionFlow("data/questions.json"),
+                store,
+                summarizer=OllamaSummarizer(base_url=fake.base_url),
+                template_path=path,
+            )
+            conv = Conversation(conversation_id=label)
+            orch.start(conv)
+            for i, answer in enumerate(ANSWERS):
+                if i < len(CHAT):
+                    # Chat turns without a chatbot configured still land in the transcript
+                    orch.handle_user_message(conv, CHAT[i], mode=Mode.CHAT)
+                orch.handle_user_message(conv, answer)
+            deterministic["questionnaire_answers"] = orch.build_questionnaire_answers(conv)
+            deterministic["patient_questions"] = orch.build_patient_questions(store.view(conv.conversation_id))
+
+            generated.clear()
+            t0 = time.perf_counter()
+            for _ in range(rounds):
+                summary = orch.finalize(conv)
+            wall = (time.perf_counter() - t0) / rounds
+            tokens, format_bytes = generated[-1]
+            assert summary["questionnaire_answers"] == deterministic["questionnaire_answers"]
+            print(f"{label:17s} format {format_bytes:5d} bytes, {tokens:4d} generated tokens, "
+                  f"finalize {wall * 1000:7.1f} ms, keys {list(summary)}")
+
+
+if __name__ == "__main__":
+    run(*(float(a) for a in sys.argv[1:2]))
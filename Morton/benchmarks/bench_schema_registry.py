@@ -0,0 +1,56 @@
+'''What: Per-finalize cost of getting the summary schema ready: the old path (open + json.load of the file,
+template_to_json_schema, a fresh validator per validation) vs SchemaRegistry hits.
+
+Run from the Morton folder:  python -m benchmarks.bench_schema_registry [rounds]'''
+
+from __future__ import annotations
+import json
+import sys
+import time
+
+from jsonschema import Draft202012Validator
+
+from app.adapters.schema_registry import SchemaRegistry
+from app.adapters.template_schema import template_to_json_schema
+from benchmarks.fake_ollama import dummy_instance
+
+FILES = ("data/summary_template.json", "data/summary_schema.json")
+
+
+def _time(fn, rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - t0) / rounds * 1e6
+
+
+def run(rounds: int = 200) -> None:
+    registry = SchemaRegistry()
+    for path in FILES:
+        schema = registry.load(path).json_schema
+        instance = dummy_instance(schema)
+
+        def legacy():
+            # finalize read the file, the summarizer derived the schema and validate() checked it and
+            # built a validator. (The derived "schema" of a real JSON Schema file describes the schema
+            # document itself, so only time the work here instead of asserting on the outcome.)
+            with open(path, "r", encoding="utf-8") as f:
+                template = json.load(f)
+            derived = template_to_json_schema(template)
+            Draft202012Validator.check_schema(derived)
+            Draft202012Validator(derived).is_valid(instance)
+
+        def cached():
+            template = registry.load(path).document
+            _, validator = registry.for_template(template)
+            validator.validate(instance)
+
+        validator = Draft202012Validator(schema)
+        print(path)
+        print(f"  legacy (read + derive + validate): {_time(legacy, rounds):8.1f} us")
+        print(f"  registry (stat + cached validate): {_time(cached, rounds):8.1f} us")
+        print(f"  validate only (lower bound):       {_time(lambda: validator.validate(instance), rounds):8.1f} us")
+
+
+if __name__ == "__main__":
+    run(*(int(a) for a in sys.argv[1:2]))
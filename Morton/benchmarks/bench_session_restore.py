@@ -0,0 +1,114 @@
+'''What: Memory and resume latency of SessionRegistry (app/application/sessions.py) with N interleaved sessions:
+everything in memory (no store) vs a hot LRU over FileSessionStore / SqliteSessionStore.
+Each session answers a few questions through AsyncConversationOrchestrator (transcripts in SQLite, no LLM
+calls), round robin, so with a small max_hot nearly every turn restores an evicted session. Then one more
+turn is timed for sessions that are hot, evicted, and after a "restart" (a new registry and orchestrator on the
+same files). Memory is what tracemalloc sees retained by the Python heap (SQLite's own cache is not counted).
+
+Run from the Morton folder:  python -m benchmarks.bench_session_restore [sessions] [max_hot]'''
+
+from __future__ import annotations
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+from app.domain.models import Mode
+from app.adapters.question_flow_graph import GraphQuestionFlow
+from app.adapters.session_store_file import FileSessionStore
+from app.adapters.session_store_sqlite import SqliteSessionStore
+from app.adapters.store_async import AsyncTranscriptStore
+from app.adapters.store_sqlite import SqliteTranscriptStore
+from app.application.async_orchestrator import AsyncConversationOrchestrator
+from app.application.sessions import SessionRegistry
+from app.interfaces.session_store import ISessionStore
+from benchmarks.bench_replay import QUESTIONS, synthetic_sessions
+
+ANSWERS_PER_SESSION = 4
+
+
+def _orchestrator(db: str) -> Tuple[AsyncConversationOrchestrator, SqliteTranscriptStore]:
+    transcripts = SqliteTranscriptStore(db, group_commit=True)
+    return AsyncConversationOrchestrator(GraphQuestionFlow(QUESTIONS), AsyncTranscriptStore(transcripts)), transcripts
+
+
+def _registry(store: Optional[ISessionStore], max_hot: Optional[int], orch: AsyncConversationOrchestrator) -> SessionRegistry:
+    # Store calls in a worker thread, as the service runs them
+    return SessionRegistry(store, max_hot=max_hot if store is not None else None, on_evict=orch.forget,
+                           offload=store is not None)
+
+
+async def _turn(sessions: SessionRegistry, orch: AsyncConversationOrchestrator, cid: str, text: str) -> float:
+    t0 = time.perf_counter()
+    async with sessions.use(cid) as conv:
+        await orch.handle_user_message(conv, text, mode=Mode.ANSWER)
+    return time.perf_counter() - t0
+
+
+def _ms(values: List[float]) -> str:
+    v = sorted(x * 1000 for x in values)
+    return f"p50 {v[len(v) // 2]:6.3f} ms  p99 {v[min(len(v) - 1, int(len(v) * 0.99))]:6.3f} ms"
+
+
+async def scenario(label: str, make_store: Callable[[str], Optional[ISessionStore]], n: int, max_hot: int) -> None:
+    workdir = tempfile.mkdtemp(prefix="morton-sessions-")
+    db = os.path.join(workdir, "transcripts.sqlite3")
+    scripts = [[text for _, text in s] for s in synthetic_sessions(n, chat_rate=0.0, seed=1)]
+    orch, transcripts = _orchestrator(db)
+    sessions = _registry(make_store(workdir), max_hot, orch)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    ids = [f"s{i}" for i in range(n)]
+    for cid in ids:
+        await sessions.create(cid)
+        async with sessions.use(cid) as conv:
+            await orch.start(conv)
+    for k in range(ANSWERS_PER_SESSION):
+        for i, cid in enumerate(ids):
+            await _turn(sessions, orch, cid, scripts[i][k])
+    transcripts.flush()
+    elapsed = time.perf_counter() - t0
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    turns = n * (ANSWERS_PER_SESSION + 1)
+    print(f"{label:22s} {len(sessions):6d} hot  {retained / n:8.0f} bytes/session  "
+          f"{turns / elapsed:8.0f} turns/s  restores {sessions.restores}")
+
+    rng = random.Random(2)
+    k = ANSWERS_PER_SESSION
+    hot = [cid for cid in list(sessions._sessions)[-min(len(sessions), 200):]]
+    cold = rng.sample([cid for cid in ids if cid not in sessions._sessions], min(200, n - len(sessions))) \
+        if sessions.store is not None else []
+    hot_times = [await _turn(sessions, orch, cid, scripts[int(cid[1:])][k]) for cid in hot]
+    line = f"{'':22s} next turn: hot {_ms(hot_times)}"
+    if cold:
+        cold_times = [await _turn(sessions, orch, cid, scripts[int(cid[1:])][k]) for cid in cold]
+        line += f" | evicted {_ms(cold_times)}"
+        # Another worker (or this one restarted): empty registry and orchestrator caches, same files
+        transcripts.close()
+        sessions.close()
+        orch2, transcripts2 = _orchestrator(db)
+        sessions2 = _registry(make_store(workdir), max_hot, orch2)
+        fresh = rng.sample(ids, 200)
+        fresh_times = [await _turn(sessions2, orch2, cid, scripts[int(cid[1:])][k + 1]) for cid in fresh]
+        line += f" | new worker {_ms(fresh_times)}"
+        transcripts2.close()
+        sessions2.close()
+    print(line)
+
+
+def run(n: int = 5000, max_hot: int = 256) -> None:
+    print(f"{n} sessions, {ANSWERS_PER_SESSION} answers each, max_hot={max_hot}")
+    asyncio.run(scenario("in memory (no store)", lambda d: None, n, max_hot))
+    asyncio.run(scenario("file store + LRU", lambda d: FileSessionStore(os.path.join(d, "sessions")), n, max_hot))
+    asyncio.run(scenario("sqlite store + LRU", lambda d: SqliteSessionStore(os.path.join(d, "sessions.sqlite3")), n, max_hot))
+
+
+if __name__ == "__main__":
+    run(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,60 @@
+'''What: Prompt tokens and latency per patient answer for ToGood2Go slot extraction, as the number of slots grows:
+the full mode (extract_slot_values: every slot in, whole dict out) vs the delta mode (extract_slot_delta: the
+question's slot in, sparse patch out), and 4 pending answers batched into one extract_slot_deltas call.
+The stub model spends 0.5 ms per prompt token and 20 ms per generated word.
+
+Run from the Morton folder:  python -m benchmarks.bench_slot_extraction'''
+
+from __future__ import annotations
+import json
+import re
+import time
+from typing import Any, Dict
+
+from ToGood2Go import llm_helpers
+from benchmarks.fake_ollama import FakeOllama
+
+ANSWER = "I take metformin twice a day and a baby aspirin every morning."
+FILLED = "Reported by the patient during the interview, no further details given."
+ASKED = re.compile(r"Question \((\w+)\)")
+
+
+def stub_model(payload: Dict[str, Any]) -> str:
+    prompt = payload["messages"][-1]["content"]
+    if "format" in payload:  # delta mode: patch for the asked slots only
+        return json.dumps({slot: ANSWER for slot in ASKED.findall(prompt)})
+    known = json.loads(prompt.split("Current known information (JSON):\n", 1)[1].split("\n\nNew patient answer", 1)[0])
+    first_empty = next(k for k, v in known.items() if v is None)
+    return json.dumps({**known, first_empty: ANSWER})
+
+
+def run(rounds: int = 3) -> None:
+    with FakeOllama(reply_fn=stub_model, prompt_token_delay_s=0.0005, token_delay_s=0.02) as fake:
+        llm_helpers.OLLAMA_BASE_URL = fake.base_url
+        print(f"{'slots':>5}  {'full tokens':>11} {'full ms':>8}  {'delta tokens':>12} {'delta ms':>8}  {'batch of 4, ms/answer':>21}")
+        for n in (7, 25, 50, 100):
+            questions = [{"id": f"s{i}", "slot": f"slot_{i}", "text": f"Question about topic {i}?", "required": True}
+                         for i in range(n)]
+            slots = {q["slot"]: (FILLED if i < n // 2 else None) for i, q in enumerate(questions)}
+            current = questions[n // 2]
+
+            def measure(fn):
+                fake.requests.clear()
+                t0 = time.perf_counter()
+                for _ in range(rounds):
+                    fn()
+                ms = (time.perf_counter() - t0) / rounds * 1000
+                chars = sum(len(m["content"]) for m in fake.requests[-1]["messages"])
+                return chars // 4, ms
+
+            full_tokens, full_ms = measure(lambda: llm_helpers.extract_slot_values(ANSWER, slots))
+            delta_tokens, delta_ms = measure(lambda: llm_helpers.extract_slot_delta(current, ANSWER, slots))
+            batch = [(questions[n // 2 + i], ANSWER) for i in range(min(4, n - n // 2))]
+            patch = llm_helpers.extract_slot_deltas(batch, slots)
+            assert set(patch) == {q["slot"] for q, _ in batch}
+            _, batch_ms = measure(lambda: llm_helpers.extract_slot_deltas(batch, slots))
+            print(f"{n:5d}  {full_tokens:11d} {full_ms:8.0f}  {delta_tokens:12d} {delta_ms:8.0f}  {batch_ms / len(batch):21.0f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,64 @@
+'''What: Appends/s (per-append commit vs group commit) and tail/since read latency of SqliteTranscriptStore
+with 10k conversations in the database.
+
+Run from the Morton folder:  python -m benchmarks.bench_sqlite_store [conversations] [messages_per_conversation]'''
+
+from __future__ import annotations
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.domain.models import Message, Role
+from app.adapters.store_sqlite import SqliteTranscriptStore
+
+
+def _messages(n: int) -> list[Message]:
+    roles = [Role.SYSTEM, Role.PATIENT, Role.ASSISTANT]
+    return [Message(role=roles[i % 3], content=f"message {i} " + "x" * 80,
+                    meta={"mode": "chat"} if i % 3 else {}) for i in range(n)]
+
+
+def _append_rate(store: SqliteTranscriptStore, conversations: int, per_conv: int) -> float:
+    msgs = _messages(per_conv)
+    t0 = time.perf_counter()
+    # Interleave sessions like a live server would
+    for i in range(per_conv):
+        for c in range(conversations):
+            store.append(f"conv-{c}", msgs[i])
+    store.flush()
+    return conversations * per_conv / (time.perf_counter() - t0)
+
+
+def _read_latency(fn, conversations: int, reads: int = 2000) -> float:
+    ids = [f"conv-{random.randrange(conversations)}" for _ in range(reads)]
+    t0 = time.perf_counter()
+    for cid in ids:
+        fn(cid)
+    return (time.perf_counter() - t0) / reads * 1e6
+
+
+def run(conversations: int = 10_000, per_conv: int = 20) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        # Per-append commits are slow by design, so measure them on a slice of the load
+        store = SqliteTranscriptStore(os.path.join(tmp, "single.sqlite3"))
+        rate = _append_rate(store, conversations // 10, per_conv)
+        print(f"append, commit per message: {rate:10.0f} appends/s")
+        store.close()
+
+        path = os.path.join(tmp, "group.sqlite3")
+        store = SqliteTranscriptStore(path, group_commit=True)
+        rate = _append_rate(store, conversations, per_conv)
+        print(f"append, group commit:       {rate:10.0f} appends/s   ({conversations} conversations x {per_conv})")
+        store.close()
+
+        store = SqliteTranscriptStore(path)
+        print(f"get_tail(10):               {_read_latency(lambda c: store.get_tail(c, 10), conversations):10.1f} us/read")
+        print(f"get_since(last 5):          {_read_latency(lambda c: store.get_since(c, per_conv - 5), conversations):10.1f} us/read")
+        print(f"get (full history):         {_read_latency(store.get, conversations):10.1f} us/read")
+        store.close()
+
+
+if __name__ == "__main__":
+    run(*(int(a) for a in sys.argv[1:3]))
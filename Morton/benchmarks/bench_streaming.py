@@ -0,0 +1,58 @@
+'''What: Compare time-to-first-chunk of handle_user_message_stream with the blocking handle_user_message.
+Why: Shows that streaming delivers the first token long before the full reply exists.
+
+Run from the Morton folder:  python -m benchmarks.bench_streaming'''
+
+from __future__ import annotations
+import time
+
+from app.domain.models import Conversation, Mode
+from app.adapters.question_flow_json import JsonQuestionFlow
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.adapters.ollama_chatbot import OllamaChatbot
+from app.application.orchestrator import ConversationOrchestrator
+from benchmarks.fake_ollama import FakeOllama
+
+QUESTION = "What does fasting mean before surgery?"
+
+
+def run(token_delay_s: float = 0.02, rounds: int = 5) -> None:
+    with FakeOllama(token_delay_s=token_delay_s) as fake:
+        store = MemoryTranscriptStore()
+        orch = ConversationOrchestrator(
+            JsonQuestionFlow("data/questions.json"),
+            store,
+            chatbot=OllamaChatbot(base_url=fake.base_url),
+        )
+
+        blocking, first, full = [], [], []
+        for i in range(rounds):
+            conv = Conversation(conversation_id=f"block-{i}")
+            orch.start(conv)
+            t0 = time.perf_counter()
+            orch.handle_user_message(conv, QUESTION, mode=Mode.CHAT)
+            blocking.append(time.perf_counter() - t0)
+
+            conv = Conversation(conversation_id=f"stream-{i}")
+            orch.start(conv)
+            t0 = time.perf_counter()
+            stream = orch.handle_user_message_stream(conv, QUESTION, mode=Mode.CHAT)
+            next(stream)
+            first.append(time.perf_counter() - t0)
+            text = "".join(stream)
+            full.append(time.perf_counter() - t0)
+
+            # The finished answer must still land in the transcript once the stream closes
+            stored = [m for m in store.get(conv.conversation_id) if (m.meta or {}).get("mode") == "chat"]
+            assert stored[-1].role.value == "assistant" and stored[-1].content, "answer not stored"
+            assert text, "stream produced no tail"
+
+        avg = lambda xs: sum(xs) / len(xs) * 1000
+        print(f"blocking reply:          {avg(blocking):8.1f} ms")
+        print(f"streaming first chunk:   {avg(first):8.1f} ms")
+        print(f"streaming full reply:    {avg(full):8.1f} ms")
+        assert max(first) < min(full), "first chunk did not arrive before the full reply"
+
+
+if __name__ == "__main__":
+    run()
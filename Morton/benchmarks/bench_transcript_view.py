@@ -0,0 +1,63 @@
+'''What: Allocations and latency of reading a 5k-message transcript per chat turn: get() (list copy) vs view().
+Why: The orchestrator reads the transcript on every chat turn and in finalize; the chatbot only needs the tail.
+
+Run from the Morton folder:  python -m benchmarks.bench_transcript_view'''
+
+from __future__ import annotations
+import time
+import tracemalloc
+
+from app.domain.models import Message, Role
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.adapters.ollama_chatbot import DEFAULT_SYSTEM_PROMPT, build_chat_messages
+from app.application.orchestrator import BaseOrchestrator
+
+CID = "conv-1"
+
+
+def _fill(store: MemoryTranscriptStore, n: int) -> None:
+    for i in range(n):
+        if i % 4 == 0:
+            store.append(CID, Message(role=Role.SYSTEM, content=f"Question {i}?", meta={"question_id": f"q{i}"}))
+        elif i % 4 == 1:
+            store.append(CID, Message(role=Role.PATIENT, content=f"answer {i}", meta={"mode": "answer"}))
+        elif i % 4 == 2:
+            store.append(CID, Message(role=Role.PATIENT, content=f"what about {i}?", meta={"mode": "chat"}))
+        else:
+            store.append(CID, Message(role=Role.ASSISTANT, content=f"reply {i}", meta={"mode": "chat"}))
+
+
+def _chat_turn(read, orch: BaseOrchestrator) -> None:
+    build_chat_messages(DEFAULT_SYSTEM_PROMPT, "new question?", read(CID), context="ctx")
+
+
+def _finalize(read, orch: BaseOrchestrator) -> None:
+    orch.build_patient_questions(read(CID))
+
+
+def _measure(name: str, step, read, orch: BaseOrchestrator, rounds: int = 200) -> None:
+    tracemalloc.start()
+    step(read, orch)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        step(read, orch)
+    us = (time.perf_counter() - t0) / rounds * 1e6
+    print(f"{name:<24} {us:9.1f} us   peak alloc {peak / 1024:8.1f} KiB")
+
+
+def run(messages: int = 5000) -> None:
+    store = MemoryTranscriptStore()
+    _fill(store, messages)
+    orch = BaseOrchestrator(question_flow=None)
+    print(f"transcript of {messages} messages")
+    _measure("chat turn, get() copy", _chat_turn, store.get, orch)
+    _measure("chat turn, view()", _chat_turn, store.view, orch)
+    _measure("finalize, get() copy", _finalize, store.get, orch)
+    _measure("finalize, view()", _finalize, store.view, orch)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,90 @@
+'''What: finalize on data/questions.json with typed answers parsed deterministically (app/domain/answer_parsing.py)
+vs the same questions all treated as free_text. Reports the summarizer prompt size, the `format` schema size,
+the generated tokens and the finalize latency. The stub model spends 0.5 ms per prompt token and 20 ms per
+generated token, and writes whatever the format asks for.
+
+Two answer sets: terse answers ("54", "yes") whose question/answer lines leave the prompt completely, and
+chattier ones ("yes, twice") that keep their lines for the model but still get their fields filled in.
+
+Run from the Morton folder:  python -m benchmarks.bench_typed_answers'''
+
+from __future__ import annotations
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict
+
+from app.domain.models import Conversation
+from app.adapters.question_flow_json import JsonQuestionFlow
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.adapters.improved_ollama_summarizer import OllamaSummarizer
+from app.application.orchestrator import ConversationOrchestrator
+from benchmarks.fake_ollama import FakeOllama
+
+QUESTIONS = "data/questions.json"
+SCHEMA = "data/summary_schema.json"
+ANSWER_SETS = {
+    "terse": ["Jane Doe", "54", "Penicillin", "yes", "knee replacement", "no, quit 10 years ago", "ja"],
+    "chatty": ["Jane Doe", "I am 54 years old", "Penicillin", "yes, twice, and I felt sick afterwards",
+               "knee replacement", "no, quit 10 years ago", "yes, nothing since last night"],
+}
+MODEL_PART = {
+    "patient": {"name": "Jane Doe", "age": 54, "allergies": "Penicillin", "prior_anesthesia": "yes",
+                "current_surgery": "Knee replacement", "asa_classification": "ASA-II",
+                "smoking_status": "former", "fasting_compliance": "compliant"},
+    "red_flags": [{"category": "allergy_concern", "severity": "medium",
+                   "description": "Penicillin allergy; avoid beta-lactam prophylaxis."}],
+    "notes": "Patient is calm, has had anesthesia twice before without complications.",
+}
+
+
+def reply(payload: Dict[str, Any]) -> str:
+    props = payload["format"]["properties"]
+    patient = props["patient"]["properties"]
+    out = {k: MODEL_PART[k] for k in props}
+    out["patient"] = {k: v for k, v in MODEL_PART["patient"].items() if k in patient}
+    return json.dumps(out)
+
+
+def _untyped_copy(tmp: str) -> str:
+    with open(QUESTIONS, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for q in data["questions"]:
+        q["type"] = "free_text"
+    path = os.path.join(tmp, "questions_untyped.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    return path
+
+
+def run(rounds: int = 3) -> None:
+    with tempfile.TemporaryDirectory() as tmp, \
+            FakeOllama(reply_fn=reply, prompt_token_delay_s=0.0005, token_delay_s=0.02) as fake:
+        print(f"{'answers':7s} {'questions':9s} {'prompt chars':>12s} {'format bytes':>12s} "
+              f"{'gen tokens':>10s} {'finalize ms':>11s}")
+        for set_name, answers in ANSWER_SETS.items():
+            for label, questions in (("free_text", _untyped_copy(tmp)), ("typed", QUESTIONS)):
+                orch = ConversationOrchestrator(JsonQuestionFlow(questions), MemoryTranscriptStore(),
+                                                summarizer=OllamaSummarizer(base_url=fake.base_url),
+                                                template_path=SCHEMA)
+                conv = Conversation(conversation_id=f"{set_name}-{label}")
+                orch.start(conv)
+                for answer in answers:
+                    orch.handle_user_message(conv, answer)
+
+                fake.requests.clear()
+                t0 = time.perf_counter()
+                for _ in range(rounds):
+                    summary = orch.finalize(conv)
+                ms = (time.perf_counter() - t0) / rounds * 1000
+                payload = fake.requests[-1]
+                prompt = sum(len(m["content"]) for m in payload["messages"])
+                generated = len(reply(payload).split(" "))
+                assert summary["patient"]["age"] == 54 and summary["patient"]["fasting_compliance"] == "compliant"
+                print(f"{set_name:7s} {label:9s} {prompt:12d} {len(json.dumps(payload['format'])):12d} "
+                      f"{generated:10d} {ms:11.0f}")
+
+
+if __name__ == "__main__":
+    run()
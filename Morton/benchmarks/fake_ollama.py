@@ -0,0 +1,351 @@
+'''What: A tiny stand-in for the Ollama HTTP API (/api/chat), built on the standard library.
+Why: Lets the benchmarks drive the real adapters and orchestrator reproducibly, without a GPU or a pulled model.'''
+
+from __future__ import annotations
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Union
+
+DEFAULT_REPLY = (
+    "Fasting means you should not eat or drink for a number of hours before "
+    "your anesthesia, so that your stomach is empty and the procedure is safe."
+)
+
+
+def dummy_instance(schema: Dict[str, Any]) -> Any:
+    """Smallest value that satisfies a (simple) JSON Schema; used to answer 'format' requests."""
+    if "enum" in schema:
+        return schema["enum"][0]
+    t = schema.get("type")
+    if t == "object":
+        return {k: dummy_instance(v) for k, v in schema.get("properties", {}).items()}
+    if t == "array":
+        return []
+    if t == "integer":
+        return 0
+    if t == "number":
+        return 0.0
+    if t == "boolean":
+        return False
+    if t == "string":
+        return "unknown"
+    return None
+
+
+def hashed_embedding(text: str, dim: int = 256) -> list[float]:
+    """Bag-of-words vector via the hashing trick: texts sharing words are similar. Stands in for /api/embed."""
+    vec = [0.0] * dim
+    for word in re.findall(r"\w+", text.lower()):
+        stem = word[:5]  # crude stemming so "fasting"/"fast" and "drink"/"drinking" meet
+        vec[int(hashlib.md5(stem.encode("utf-8")).hexdigest(), 16) % dim] += 1.0
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+
+def keep_alive_seconds(value: Union[str, int, float]) -> float:
+    """Ollama keep_alive ("30m", "10s", "1h", seconds; negative = forever) in seconds."""
+    if isinstance(value, (int, float)):
+        return math.inf if value < 0 else float(value)
+    match = re.fullmatch(r"(-?[\d.]+)(ms|s|m|h)?", value.strip())
+    if not match:
+        raise ValueError(f"bad keep_alive {value!r}")
+    amount = float(match.group(1))
+    if amount < 0:
+        return math.inf
+    return amount * {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}[match.group(2)]
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # load tests open hundreds of connections at once
+
+    def handle_error(self, request, client_address) -> None:
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):  # client gave up (timeout)
+            super().handle_error(request, client_address)
+
+
+class FakeOllama:
+    """
+    Runs a threaded HTTP server on 127.0.0.1 that imitates Ollama's /api/chat (and /api/embed, see hashed_embedding).
+
+    - load_delay_s: delay the first time a model is used (cold load); model_load_delays overrides it per model.
+      Concurrent requests for a cold model wait for one load, as in Ollama
+    - keep_alive_s: idle time after which a model is unloaded again (Ollama's default is 5 minutes);
+      a request's "keep_alive" overrides it. None = never unload. An empty "messages" list only loads the model
+    - prompt_delay_s: fixed delay before the first token (prompt processing)
+    - prompt_token_delay_s: extra prompt-processing delay per prompt token (~4 characters)
+    - context_tokens: model context size; longer prompts are cut from the front like Ollama's num_ctx
+      truncation (reply_fn sees the truncated messages)
+    - token_delay_s: delay between generated tokens
+    - max_parallel: requests generated at once, like OLLAMA_NUM_PARALLEL; the rest queue (None = unlimited)
+    - reply_fn: optional callable(payload) -> str to override the reply text
+    - missing_models: models answered with 404 "model not found", as Ollama does for a model that is not pulled
+    - prefix_cache_slots: keep the KV cache of this many prompts per model, like Ollama's runner slots; a prompt
+      only pays prompt_token_delay_s for the tokens after its longest cached prefix (prompt + reply of an earlier
+      request), and prompt_eval_count counts only those. 0 = every prompt is evaluated in full
+    """
+
+    def __init__(
+        self,
+        reply: str = DEFAULT_REPLY,
+        load_delay_s: float = 0.0,
+        prompt_delay_s: float = 0.0,
+        prompt_token_delay_s: float = 0.0,
+        context_tokens: Optional[int] = None,
+        token_delay_s: float = 0.0,
+        reply_fn: Optional[Callable[[Dict[str, Any]], str]] = None,
+        port: int = 0,
+        max_parallel: Optional[int] = None,
+        model_load_delays: Optional[Dict[str, float]] = None,
+        keep_alive_s: Optional[float] = None,
+        prefix_cache_slots: int = 0,
+        missing_models: Sequence[str] = (),
+    ):
+        self.reply = reply
+        self.load_delay_s = load_delay_s
+        self.model_load_delays = model_load_delays or {}
+        self.keep_alive_s = keep_alive_s
+        self.prefix_cache_slots = prefix_cache_slots
+        self.missing_models = set(missing_models)
+        self._kv: Dict[str, list] = {}  # model -> cached texts, most recently used last
+        self.prompt_delay_s = prompt_delay_s
+        self.prompt_token_delay_s = prompt_token_delay_s
+        self.context_tokens = context_tokens
+        self.token_delay_s = token_delay_s
+        self.reply_fn = reply_fn
+        self.requests: list[Dict[str, Any]] = []
+        self._slots = threading.BoundedSemaphore(max_parallel) if max_parallel else None
+        self.connections = 0
+        self.loads = 0
+        self._loaded: Dict[str, float] = {}  # model -> monotonic time it unloads
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllama":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOllama":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _truncate(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        messages = payload.get("messages", [])
+        budget = self.context_tokens * 4 if self.context_tokens else None
+        if budget is None or sum(len(m.get("content", "")) for m in messages) <= budget:
+            return payload
+        kept = []
+        for m in reversed(messages):  # newest first, cutting the oldest text
+            content = m.get("content", "")
+            if budget <= 0:
+                break
+            kept.append({**m, "content": content[-budget:]})
+            budget -= len(content)
+        return {**payload, "messages": kept[::-1]}
+
+    def _ensure_loaded(self, payload: Dict[str, Any]) -> None:
+        model = payload.get("model", "")
+        with self._lock:
+            load_lock = self._load_locks.setdefault(model, threading.Lock())
+        with load_lock:
+            if time.monotonic() >= self._loaded.get(model, 0.0):
+                time.sleep(self.model_load_delays.get(model, self.load_delay_s))
+                with self._lock:
+                    self.loads += 1
+            self._keep_loaded(payload)
+
+    def _keep_loaded(self, payload: Dict[str, Any]) -> None:
+        # The idle clock restarts when a request starts and again when it ends
+        keep_alive = payload.get("keep_alive")
+        idle_s = keep_alive_seconds(keep_alive) if keep_alive is not None else self.keep_alive_s
+        with self._lock:
+            self._loaded[payload.get("model", "")] = math.inf if idle_s is None else time.monotonic() + idle_s
+
+    @staticmethod
+    def _render(messages) -> str:
+        return "".join(f"<|{m.get('role', '')}|>{m.get('content', '')}" for m in messages)
+
+    def _cached_prefix(self, model: str, text: str) -> int:
+        """Characters of `text` already in a slot of this model's cache (the best slot moves to the end)."""
+        with self._lock:
+            slots = self._kv.setdefault(model, [])
+            best, best_len = None, 0
+            for i, cached in enumerate(slots):
+                n = len(os.path.commonprefix((cached, text)))
+                if n > best_len:
+                    best, best_len = i, n
+            if best is not None:
+                slots.append(slots.pop(best))
+            return best_len
+
+    def _store_prefix(self, model: str, prompt: str, reply: str, reused: int) -> None:
+        with self._lock:
+            slots = self._kv.setdefault(model, [])
+            if reused and slots:
+                slots.pop()  # the slot the prompt was evaluated in (moved to the end by _cached_prefix)
+            slots.append(prompt + f"<|assistant|>{reply}")
+            del slots[:-self.prefix_cache_slots]
+
+    def _reply_for(self, payload: Dict[str, Any]) -> str:
+        if self.reply_fn:
+            return self.reply_fn(payload)
+        fmt = payload.get("format")
+        if isinstance(fmt, dict):
+            return json.dumps(dummy_instance(fmt))
+        if fmt == "json":
+            return "{}"
+        return self.reply
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with fake._lock:
+                    fake.connections += 1
+
+            def log_message(self, *args):  # keep benchmark output clean
+                pass
+
+            def _send_json(self, obj: Dict[str, Any], status: int = 200) -> None:
+                body = json.dumps(obj).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_chunk(self, obj: Dict[str, Any]) -> None:
+                data = (json.dumps(obj) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with fake._lock:
+                    fake.requests.append(payload)
+
+                if self.path == "/api/embed":
+                    texts = payload.get("input", [])
+                    texts = [texts] if isinstance(texts, str) else texts
+                    self._send_json({"model": payload.get("model", ""), "embeddings": [hashed_embedding(t) for t in texts]})
+                    return
+
+                if self.path not in ("/api/chat", "/api/generate"):
+                    self.send_error(404)
+                    return
+                model = payload.get("model", "")
+                if model in fake.missing_models:
+                    self._send_json({"error": f"model '{model}' not found"}, status=404)
+                    return
+
+                if fake._slots is None:
+                    self._generate(payload)
+                    return
+                with fake._slots:
+                    self._generate(payload)
+
+            def _generate(self, payload: Dict[str, Any]) -> None:
+                model = payload.get("model", "")
+                started = time.perf_counter()
+                fake._ensure_loaded(payload)
+                load_ns = int((time.perf_counter() - started) * 1e9)
+                if self.path == "/api/chat" and not payload.get("messages"):
+                    self._send_json({"model": model, "message": {"role": "assistant", "content": ""}, "done": True,
+                                     "done_reason": "load", "load_duration": load_ns, "total_duration": load_ns})
+                    return
+                payload = fake._truncate(payload)
+                prompt_chars = sum(len(m.get("content", "")) for m in payload.get("messages", []))
+                prompt_tokens = max(1, prompt_chars // 4)
+                if fake.prefix_cache_slots:
+                    rendered = fake._render(payload.get("messages", []))
+                    reused = fake._cached_prefix(model, rendered)
+                    prompt_tokens = max(1, (len(rendered) - reused) // 4)
+                prompt_s = fake.prompt_delay_s + prompt_tokens * fake.prompt_token_delay_s
+                time.sleep(prompt_s)
+                prompt_ns = int(prompt_s * 1e9)
+
+                text = fake._reply_for(payload)
+                if fake.prefix_cache_slots:
+                    fake._store_prefix(model, rendered, text, reused)
+                tokens = [t + " " for t in text.split(" ")]
+                tokens[-1] = tokens[-1].rstrip(" ")
+                stats = {
+                    "load_duration": load_ns,
+                    "prompt_eval_count": prompt_tokens,
+                    "prompt_eval_duration": prompt_ns,
+                    "eval_count": len(tokens),
+                }
+
+                if payload.get("stream", True):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/x-ndjson")
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for tok in tokens:
+                        time.sleep(fake.token_delay_s)
+                        self._send_chunk({"model": model, "message": {"role": "assistant", "content": tok}, "done": False})
+                    stats["total_duration"] = int((time.perf_counter() - started) * 1e9)
+                    self._send_chunk({"model": model, "message": {"role": "assistant", "content": ""}, "done": True, **stats})
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                    fake._keep_loaded(payload)
+                    return
+
+                time.sleep(fake.token_delay_s * len(tokens))
+                stats["total_duration"] = int((time.perf_counter() - started) * 1e9)
+                self._send_json({"model": model, "message": {"role": "assistant", "content": text}, "done": True, **stats})
+                fake._keep_loaded(payload)
+
+        return Handler
+
+
+def _serve(kwargs: Dict[str, Any], ready) -> None:
+    fake = FakeOllama(**kwargs)
+    ready.put(fake.base_url)
+    fake._server.serve_forever()
+
+
+@contextmanager
+def fake_ollama_process(**kwargs: Any) -> Iterator[str]:
+    """
+    Run FakeOllama in a child process and yield its base_url.
+    Use this for load tests so the stub server does not compete with the code under test for the GIL.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Queue()
+    proc = ctx.Process(target=_serve, args=(kwargs, ready), daemon=True)
+    proc.start()
+    try:
+        yield ready.get(timeout=30)
+    finally:
+        proc.terminate()
+        proc.join()
@@ -1,22 +1,40 @@
 import json
+import threading
 
 from app.domain.models import Conversation, Mode
-from app.adapters.question_flow_json import JsonQuestionFlow
+from app.adapters.question_flow_graph import GraphQuestionFlow
 from app.adapters.store_memory import MemoryTranscriptStore
 from app.adapters.ollama_chatbot import OllamaChatbot
 # from app.adapters.ollama_summarizer import OllamaSummarizer
 from app.adapters.improved_ollama_summarizer import OllamaSummarizer
+from app.adapters.model_router import ModelRouter
+from app.adapters.ollama_http import get_client
 from app.application.orchestrator import ConversationOrchestrator
 
-model = "llama3.1" # "jobautomation/OpenEuroLLM-Danish:latest"
+# Which model serves which task (chat, summarization, ...): data/models.json
+router = ModelRouter.from_file("data/models.json")
+
+def yield_print(stream):
+    """Print chunks from a streaming orchestrator call and return its OrchestratorResult."""
+    while True:
+        try:
+            print(next(stream), end="", flush=True)
+        except StopIteration as stop:
+            print()
+            return stop.value
+
 
 def main():
     store = MemoryTranscriptStore()
-    qflow = JsonQuestionFlow("data/questions.json")
+    qflow = GraphQuestionFlow("data/questions.json")
+
+    # Load the models while the patient reads the first question
+    client = get_client("http://localhost:11434")
+    threading.Thread(target=router.prewarm, args=(client,), daemon=True).start()
 
     # NEW: Wire in Ollama chatbot
-    chatbot = OllamaChatbot(model=model, base_url="http://localhost:11434")
-    summarizer = OllamaSummarizer(model=model, base_url="http://localhost:11434")
+    chatbot = OllamaChatbot(model=router.model("chat"), client=router.client("chat", client))
+    summarizer = OllamaSummarizer(model=router.model("summarization"), client=router.client("summarization", client))
 
     orch = ConversationOrchestrator(
         qflow,
@@ -39,15 +57,16 @@ def main():
             break
 
         if user.startswith("?"):
-            res = orch.handle_user_message(conv, user[1:].strip(), mode=Mode.CHAT)
+            # Stream chat answers so the patient sees the first words right away
+            print("BOT: ", end="", flush=True)
+            res = yield_print(orch.handle_user_message_stream(conv, user[1:].strip(), mode=Mode.CHAT))
         else:
             res = orch.handle_user_message(conv, user, mode=Mode.ANSWER)
+            print("BOT:", res.bot_text)
 
         if res is None:
             raise RuntimeError("handle_user_message returned None (missing return).")
 
-        print("BOT:", res.bot_text)
-
         if res.done:
             print("\nGenerating structured summary...\n")
             summary = orch.finalize(conv)
@@ -0,0 +1,7 @@
+'''What: pytest setup shared by the tests: the app package imports from the Morton folder.
+Run from the Morton folder:  python -m pytest -q'''
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,46 @@
+'''What: yes/no answers with a negation or a "don't know" are not read as yes, and everyday words that double as
+number words ("to", "en", "et") only count as numbers when they are the whole answer.'''
+
+import pytest
+
+from app.domain.answer_parsing import parse_number, parse_yesno
+
+
+@pytest.mark.parametrize("text, value", [
+    ("Yes", "yes"), ("yes, twice", "yes"), ("I have", "yes"), ("Ja det har jeg", "yes"),
+    ("No", "no"), ("Nej tak", "no"), ("Det har jeg ikke", "no"), ("Aldrig", "no"),
+    ("I haven't", "no"), ("I don't", "no"), ("I haven't had anesthesia before", "no"),
+    ("I have never had anesthesia", "no"), ("I’ve not", "no"),
+])
+def test_yesno(text, value):
+    parsed = parse_yesno(text)
+    assert parsed.ok and parsed.value == value
+
+
+@pytest.mark.parametrize("text", ["I don't know", "No idea", "Not sure", "I'm not sure", "Ved ikke", "Maybe"])
+def test_uncertain_answers_are_not_parsed(text):
+    parsed = parse_yesno(text)
+    assert not parsed.ok and parsed.error == "uncertain answer"
+
+
+def test_yes_with_a_negation_is_left_to_the_model():
+    assert not parse_yesno("Yes, but not since 2010").ok
+
+
+def test_a_bare_negation_is_a_complete_no():
+    assert parse_yesno("I haven't").complete
+    assert not parse_yesno("I haven't had anesthesia before").complete
+
+
+@pytest.mark.parametrize("text, value, unit", [
+    ("54 år", 54, "years"), ("five years", 5, "years"), ("about five years old", 5, "years"), ("fem", 5, None),
+    ("to", 2, None), ("to år", 2, "years"), ("en", 1, None),
+])
+def test_number(text, value, unit):
+    parsed = parse_number(text)
+    assert parsed.ok and (parsed.value, parsed.unit) == (value, unit)
+
+
+@pytest.mark.parametrize("text", ["I would prefer not to say", "Jeg er en gammel mand", "Det er et godt spørgsmål"])
+def test_function_words_are_not_numbers(text):
+    assert not parse_number(text).ok
@@ -0,0 +1,65 @@
+'''What: CachedChatbot shares a cached reply only for questions that cannot depend on the patient, and never
+caches a reply written by the router's fallback model.'''
+
+import pytest
+import requests
+
+from app.adapters.cached_chatbot import CachedChatbot, needs_personal_context
+from app.adapters.model_router import ModelRoute, RoutedClient
+from app.adapters.ollama_chatbot import OllamaChatbot
+from app.interfaces.chatbot import ChatContext
+
+
+@pytest.mark.parametrize("question", [
+    "Is anesthesia risky for me with my allergy?", "Can I drink water before the operation?", "I'm worried",
+    "What did I answer about smoking?", "Må jeg spise i morgen?", "Er det farligt for mig?", "Hvad med min medicin?",
+])
+def test_questions_about_the_patient_are_personal(question):
+    assert needs_personal_context(question, [])
+
+
+@pytest.mark.parametrize("question", ["What does fasting mean?", "How long does anesthesia last?", "Hvad betyder faste?"])
+def test_general_questions_are_shared(question):
+    assert not needs_personal_context(question, [])
+
+
+def test_personal_question_gets_a_conversation_scoped_key():
+    class Inner:
+        model, system_prompt = "m", "p"
+
+        def __init__(self):
+            self.seen = []
+
+        def answer(self, user_text, transcript, context=None):
+            self.seen.append(context)
+            return "reply"
+
+    inner = Inner()
+    bot = CachedChatbot(inner)
+    bot.answer("Is it risky for me?", [], ChatContext("q", conversation_id="a", question_id="q1", shared="q"))
+    bot.answer("Is it risky for me?", [], ChatContext("q", conversation_id="b", question_id="q1", shared="q"))
+    assert len(inner.seen) == 2 and bot.personal_lookups == 2
+    assert all(isinstance(c, ChatContext) for c in inner.seen)  # full context, not the shared text
+
+
+class RefusingPrimary:
+    """Ollama client stub whose primary model refuses the request until `ok` is set."""
+
+    def __init__(self):
+        self.ok = False
+
+    def chat(self, payload, timeout=None):
+        if payload["model"] == "big" and not self.ok:
+            raise requests.HTTPError("model 'big' not found")
+        return {"message": {"content": f"from {payload['model']}"}}
+
+
+def test_fallback_replies_are_not_cached():
+    client = RefusingPrimary()
+    bot = CachedChatbot(OllamaChatbot(model="big", client=RoutedClient(client, ModelRoute("big", fallback="small"))))
+    ctx = ChatContext("q", conversation_id="c", question_id="q1", shared="q")
+    assert bot.answer("What is fasting?", [], ctx) == "from small"
+    assert len(bot.cache) == 0 and bot.fallback_skips == 1
+    client.ok = True
+    assert bot.answer("What is fasting?", [], ctx) == "from big"
+    assert bot.answer("What is fasting?", [], ctx) == "from big" and bot.hits == 1
@@ -0,0 +1,28 @@
+'''What: HistoryWindow finds its window start by identity, so a message repeated word for word in the same second
+does not move the window.'''
+
+from app.adapters.ollama_chatbot import HistoryWindow
+from app.domain.models import Message, Role
+
+
+def chat(role, text):
+    return Message(role, text, ts=1, meta={"mode": "chat"})
+
+
+def test_repeated_message_keeps_the_window():
+    history = [chat(Role.PATIENT, "ok"), chat(Role.ASSISTANT, "x"), chat(Role.PATIENT, "ok"), chat(Role.ASSISTANT, "y")]
+    window = HistoryWindow(max_messages=2, max_tokens=None, summary_tokens=0)
+
+    first = window.select("c", history)
+    second = window.select("c", list(history))  # next turn, before anything new is said
+
+    assert first[0] is history[2] and second[0] is history[2]
+
+
+def test_reloaded_transcript_matches_by_value():
+    history = [chat(Role.PATIENT, "a"), chat(Role.ASSISTANT, "x"), chat(Role.PATIENT, "b"), chat(Role.ASSISTANT, "y")]
+    window = HistoryWindow(max_messages=3, max_tokens=None, summary_tokens=0)
+    assert window.select("c", history)[0] is history[1]
+
+    reloaded = [Message.from_record(m.to_record()) for m in history]
+    assert window.select("c", reloaded)[0] is reloaded[1]
@@ -0,0 +1,110 @@
+'''What: RoutedClient / AsyncRoutedClient send a request to the fallback model only when the primary never
+started on it (model missing, connection refused), never after a timeout, for chat and streamed chat.'''
+
+import asyncio
+import socket
+
+import aiohttp
+import pytest
+import requests
+
+from app.adapters.model_router import AsyncRoutedClient, ModelRoute, RoutedClient, answered_by
+from app.adapters.ollama_http import OllamaClient
+from app.adapters.ollama_http_async import AsyncOllamaClient
+from benchmarks.fake_ollama import FakeOllama
+
+ROUTE = ModelRoute("primary", fallback="fallback", timeout_s=0.2)
+PAYLOAD = {"messages": [{"role": "user", "content": "hi"}]}
+
+
+def closed_port_url() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+class ByModel:
+    """Sends each model to its own client, so the primary can be down while the fallback is up."""
+
+    def __init__(self, clients):
+        self.clients = clients
+
+    def chat(self, payload, timeout=None):
+        return self.clients[payload["model"]].chat(payload, timeout)
+
+    def chat_stream(self, payload, timeout=None):
+        return self.clients[payload["model"]].chat_stream(payload, timeout)
+
+
+def sync_call(client, stream):
+    if stream:
+        return "".join(c["message"]["content"] for c in client.chat_stream(PAYLOAD))
+    return client.chat(PAYLOAD)["message"]["content"]
+
+
+def async_call(client, stream):
+    async def run():
+        try:
+            if stream:
+                return "".join([c["message"]["content"] async for c in client.chat_stream(PAYLOAD)])
+            return (await client.chat(PAYLOAD))["message"]["content"]
+        finally:
+            for inner in getattr(client.client, "clients", {"": client.client}).values():
+                await inner.aclose()
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_missing_model_falls_back(stream):
+    with FakeOllama(reply="ok", missing_models=["primary"]) as fake:
+        client = RoutedClient(OllamaClient(fake.base_url), ROUTE)
+        assert sync_call(client, stream) == "ok"
+        assert client.fallbacks == 1 and answered_by.get() == "fallback"
+        assert [r["model"] for r in fake.requests] == ["primary", "fallback"]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_refused_connection_falls_back(stream):
+    with FakeOllama(reply="ok") as fake:
+        client = RoutedClient(ByModel({"primary": OllamaClient(closed_port_url(), max_retries=0),
+                                       "fallback": OllamaClient(fake.base_url)}), ROUTE)
+        assert sync_call(client, stream) == "ok"
+        assert client.fallbacks == 1
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_timeout_does_not_fall_back(stream):
+    with FakeOllama(reply="ok", model_load_delays={"primary": 1.0}) as fake:
+        client = RoutedClient(OllamaClient(fake.base_url), ROUTE)
+        with pytest.raises(requests.Timeout):
+            sync_call(client, stream)
+        assert client.fallbacks == 0 and answered_by.get() == "primary"
+        assert [r["model"] for r in fake.requests] == ["primary"]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_async_missing_model_falls_back(stream):
+    with FakeOllama(reply="ok", missing_models=["primary"]) as fake:
+        client = AsyncRoutedClient(AsyncOllamaClient(fake.base_url), ROUTE)
+        assert async_call(client, stream) == "ok"
+        assert client.fallbacks == 1
+        assert [r["model"] for r in fake.requests] == ["primary", "fallback"]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_async_refused_connection_falls_back(stream):
+    with FakeOllama(reply="ok") as fake:
+        client = AsyncRoutedClient(ByModel({"primary": AsyncOllamaClient(closed_port_url(), max_retries=0),
+                                            "fallback": AsyncOllamaClient(fake.base_url)}), ROUTE)
+        assert async_call(client, stream) == "ok"
+        assert client.fallbacks == 1
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_async_timeout_does_not_fall_back(stream):
+    with FakeOllama(reply="ok", model_load_delays={"primary": 1.0}) as fake:
+        client = AsyncRoutedClient(AsyncOllamaClient(fake.base_url), ROUTE)
+        with pytest.raises((asyncio.TimeoutError, aiohttp.ServerTimeoutError)):
+            async_call(client, stream)
+        assert client.fallbacks == 0
+        assert [r["model"] for r in fake.requests] == ["primary"]
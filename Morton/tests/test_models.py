@@ -0,0 +1,22 @@
+'''What: Message.meta can be written to whether or not the message was created with meta.'''
+
+import pickle
+
+from app.domain.models import Message, Role
+
+
+def test_meta_is_created_on_first_write():
+    msg = Message(Role.PATIENT, "hi")
+    assert not msg.meta and msg.to_record() == {"role": "patient", "content": "hi", "ts": msg.ts}
+
+    msg.meta["mode"] = "chat"
+
+    assert msg.meta == {"mode": "chat"} and msg.to_record()["meta"] == {"mode": "chat"}
+    assert pickle.loads(pickle.dumps(msg)).meta == {"mode": "chat"}
+
+
+def test_messages_without_meta_do_not_share_it():
+    a, b = Message(Role.PATIENT, "hi", ts=1), Message(Role.PATIENT, "hi", ts=1)
+    assert a == b
+    a.meta["question_id"] = "q1"
+    assert not b.meta and a != b
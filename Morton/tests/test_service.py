@@ -0,0 +1,55 @@
+'''What: The HTTP service over a SQLite session store: unknown conversations get 404 (no extra lookup before
+the session is used), a finished questionnaire refuses chat with 409, and chat streams SSE events.'''
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.adapters.question_flow_json import JsonQuestionFlow
+from app.adapters.session_store_sqlite import SqliteSessionStore
+from app.adapters.store_async import AsyncTranscriptStore
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.api.service import create_app
+from app.application.async_orchestrator import AsyncConversationOrchestrator
+from app.application.sessions import SessionRegistry
+from app.interfaces.chatbot import IAsyncStreamingChatbot
+
+ANSWERS = ["Jane Doe", "54", "Penicillin", "yes", "Knee surgery", "no", "yes"]
+
+
+class EchoChatbot(IAsyncStreamingChatbot):
+    async def answer(self, user_text, transcript, context=None):
+        return f"About: {user_text}"
+
+    async def answer_stream(self, user_text, transcript, context=None):
+        for word in ("About: ", user_text):
+            yield word
+
+
+@pytest.fixture
+def client(tmp_path):
+    orch = AsyncConversationOrchestrator(JsonQuestionFlow("data/questions.json"),
+                                         AsyncTranscriptStore(MemoryTranscriptStore()), chatbot=EchoChatbot())
+    sessions = SessionRegistry(SqliteSessionStore(str(tmp_path / "sessions.sqlite3")), offload=True)
+    with TestClient(create_app(orchestrator=orch, sessions=sessions)) as c:
+        yield c
+
+
+@pytest.mark.parametrize("method,path", [("post", "/conversations/nope/answer"), ("post", "/conversations/nope/chat"),
+                                         ("post", "/conversations/nope/finalize"), ("delete", "/conversations/nope")])
+def test_unknown_conversation_is_404(client, method, path):
+    r = client.request(method, path, json={"text": "hi"})
+    assert r.status_code == 404
+
+
+def test_chat_streams_then_finished_questionnaire_is_409(client):
+    assert client.post("/conversations", json={"conversation_id": "c1"}).status_code == 200
+    r = client.post("/conversations/c1/chat", json={"text": "Why?"})
+    assert r.status_code == 200
+    assert 'event: token\ndata: {"text": "About: "}' in r.text and "event: done" in r.text
+    for answer in ANSWERS:
+        last = client.post("/conversations/c1/answer", json={"text": answer})
+    assert last.json()["done"]
+    assert client.post("/conversations/c1/chat", json={"text": "Why?"}).status_code == 409
+    assert client.post("/conversations/c1/answer", json={"text": "more"}).status_code == 409
+    assert client.delete("/conversations/c1").status_code == 204
+    assert client.post("/conversations/c1/answer", json={"text": "x"}).status_code == 404
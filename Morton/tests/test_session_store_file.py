@@ -0,0 +1,20 @@
+'''What: FileSessionStore saves of one conversation from many threads leave one whole snapshot and no temp files.'''
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from app.adapters.session_store_file import FileSessionStore
+from app.domain.models import Conversation
+
+
+def test_concurrent_saves_of_one_conversation(tmp_path):
+    store = FileSessionStore(str(tmp_path))
+    convs = [Conversation(conversation_id="c1") for _ in range(8)]
+    for i, conv in enumerate(convs):
+        conv.answers["q1"] = "x" * (i * 1000)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(store.save, convs * 20))
+
+    assert os.listdir(tmp_path) == ["c1.json"]
+    assert store.load("c1").answers["q1"] in {conv.answers["q1"] for conv in convs}
@@ -0,0 +1,38 @@
+'''What: extract_slot_deltas sends the asked slots and the still-empty ones, never the filled ones, in both the
+prompt and the format schema.'''
+
+import json
+
+import pytest
+
+from ToGood2Go import llm_helpers
+from benchmarks.fake_ollama import FakeOllama
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    with FakeOllama(reply_fn=lambda payload: json.dumps({"medications": "metformin", "filled": "x"})) as fake:
+        monkeypatch.setattr(llm_helpers, "OLLAMA_BASE_URL", fake.base_url)
+        yield fake
+
+
+def test_filled_slots_are_not_sent(fake):
+    slots = {"filled": "yes", "medications": None, "allergies": None, "other_filled": "no"}
+    question = {"id": "q", "slot": "medications", "text": "Which medications do you take?"}
+
+    patch = llm_helpers.extract_slot_deltas([(question, "Metformin.")], slots)
+
+    payload = fake.requests[-1]
+    assert set(payload["format"]["properties"]) == {"medications", "allergies"}
+    assert "filled" not in payload["messages"][0]["content"]
+    assert patch == {"medications": "metformin"}
+
+
+def test_a_refilled_slot_is_still_sent_when_asked(fake):
+    slots = {"filled": "yes", "medications": "aspirin"}
+    question = {"id": "q", "slot": "medications", "text": "Which medications do you take?"}
+
+    llm_helpers.extract_slot_deltas([(question, "Also metformin.")], slots)
+
+    assert set(fake.requests[-1]["format"]["properties"]) == {"medications"}
+    assert "aspirin" in fake.requests[-1]["messages"][1]["content"]
@@ -0,0 +1,51 @@
+'''What: SqliteTranscriptStore keeps one ordered transcript when two stores (two workers) append to the same
+conversation in the same file, with and without group commit, and its group-commit thread survives write errors.'''
+
+import sqlite3
+import time
+
+import pytest
+
+from app.adapters.store_sqlite import SqliteTranscriptStore
+from app.domain.models import Message, Role
+
+
+def _text(store, cid="c"):
+    return [m.content for m in store.get(cid)]
+
+
+@pytest.mark.parametrize("group_commit", [False, True])
+def test_two_stores_alternating_renumber_instead_of_failing(tmp_path, group_commit):
+    path = str(tmp_path / "t.sqlite3")
+    a = SqliteTranscriptStore(path, group_commit=group_commit)
+    b = SqliteTranscriptStore(path, group_commit=group_commit)
+    a.append("c", Message(role=Role.PATIENT, content="a1"))
+    a.flush()
+    b.append("c", Message(role=Role.ASSISTANT, content="b1"))  # b has not seen a1: starts from MAX(seq)
+    b.flush()
+    a.append("c", Message(role=Role.PATIENT, content="a2"))  # a's cached seq collides with b1
+    a.flush()
+    assert _text(a) == _text(b) == ["a1", "b1", "a2"]
+    a.close()
+    b.close()
+
+
+def test_group_commit_thread_survives_write_errors(tmp_path, monkeypatch):
+    store = SqliteTranscriptStore(str(tmp_path / "t.sqlite3"), group_commit=True, commit_interval_s=0.01)
+    write = store._write
+    failures = iter([sqlite3.OperationalError("database is locked")] * 3)
+
+    def flaky(rows):
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        write(rows)
+
+    monkeypatch.setattr(store, "_write", flaky)
+    store.append("c", Message(role=Role.PATIENT, content="kept"))
+    deadline = time.monotonic() + 5
+    while store.errors < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert store.errors == 3 and store._flusher.is_alive()
+    assert _text(store) == ["kept"]
+    store.close()
@@ -0,0 +1,178 @@
+'''What: Streaming replies reach the caller chunk by chunk, before Ollama has finished the reply, and a stream
+that breaks off still leaves a reply in the transcript.
+A stub HTTP server sends NDJSON chunks and holds back the rest of the stream until the test has seen the
+first token, so "first token before the stream ends" is checked without relying on timings.'''
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.adapters.ollama_chatbot import OllamaChatbot
+from app.adapters.ollama_http import OllamaClient
+from app.adapters.question_flow_json import JsonQuestionFlow
+from app.adapters.store_async import AsyncTranscriptStore
+from app.adapters.store_memory import MemoryTranscriptStore
+from app.application.async_orchestrator import AsyncConversationOrchestrator
+from app.application.orchestrator import ConversationOrchestrator
+from app.domain.models import Conversation, ConversationState, Mode, Role
+from app.interfaces.chatbot import IAsyncStreamingChatbot, IStreamingChatbot
+
+TOKENS = ["Fasting ", "means ", "no food ", "for six hours."]
+
+
+class StubOllama:
+    """/api/chat streams TOKENS as NDJSON; everything after the first chunk waits for `release`."""
+
+    def __init__(self, delay_s: float = 0.01):
+        self.release = threading.Event()
+        self.finished = threading.Event()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _chunk(self, obj):
+                data = (json.dumps(obj) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for i, token in enumerate(TOKENS):
+                    if i == 1:
+                        stub.release.wait(5)
+                    self._chunk({"message": {"role": "assistant", "content": token}, "done": False})
+                    threading.Event().wait(delay_s)
+                self._chunk({"message": {"role": "assistant", "content": ""}, "done": True})
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+                stub.finished.set()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+@pytest.fixture
+def stub():
+    s = StubOllama()
+    s.thread.start()
+    yield s
+    s.release.set()
+    s.server.shutdown()
+    s.server.server_close()
+
+
+def test_chatbot_yields_first_token_before_stream_ends(stub):
+    client = OllamaClient(base_url=stub.base_url)
+    chatbot = OllamaChatbot(client=client)
+    stream = chatbot.answer_stream("What does fasting mean?", [])
+    assert next(stream) == TOKENS[0]
+    assert not stub.finished.is_set()
+    stub.release.set()
+    assert "".join(stream) == "".join(TOKENS[1:])
+    assert stub.finished.is_set()
+    client.close()
+
+
+def test_orchestrator_streams_and_stores_the_full_reply(stub):
+    client = OllamaClient(base_url=stub.base_url)
+    store = MemoryTranscriptStore()
+    orch = ConversationOrchestrator(JsonQuestionFlow("data/questions.json"), store,
+                                    chatbot=OllamaChatbot(client=client))
+    conv = Conversation(conversation_id="stream")
+    orch.start(conv)
+    stream = orch.handle_user_message_stream(conv, "What does fasting mean?", mode=Mode.CHAT)
+    first = next(stream)
+    assert first and not stub.finished.is_set()
+    stub.release.set()
+    text = first + "".join(stream)
+    assert text.startswith("".join(TOKENS))  # followed by the way back to the questionnaire
+    replies = [m for m in store.get("stream") if m.role == Role.ASSISTANT and (m.meta or {}).get("mode") == "chat"]
+    assert replies[-1].content == "".join(TOKENS)
+    client.close()
+
+
+class BrokenChatbot(IStreamingChatbot):
+    """Streams two tokens, then fails like a dropped Ollama connection."""
+
+    def answer(self, user_text, transcript, context=None):
+        raise NotImplementedError
+
+    def answer_stream(self, user_text, transcript, context=None):
+        yield "Fasting "
+        yield "means "
+        raise ConnectionError("stream dropped")
+
+
+def _chat_messages(store, cid):
+    return [m for m in store.get(cid) if (m.meta or {}).get("mode") == "chat"]
+
+
+def test_closed_stream_keeps_the_partial_reply(stub):
+    client = OllamaClient(base_url=stub.base_url)
+    store = MemoryTranscriptStore()
+    orch = ConversationOrchestrator(JsonQuestionFlow("data/questions.json"), store,
+                                    chatbot=OllamaChatbot(client=client))
+    conv = Conversation(conversation_id="gone")
+    orch.start(conv)
+    stream = orch.handle_user_message_stream(conv, "What does fasting mean?", mode=Mode.CHAT)
+    next(stream)
+    stream.close()  # the client went away
+    patient, reply = _chat_messages(store, "gone")
+    assert patient.role == Role.PATIENT
+    assert reply.role == Role.ASSISTANT and reply.content == TOKENS[0] and reply.meta["incomplete"]
+    assert conv.state == ConversationState.FLOW_WAITING_ANSWER
+    client.close()
+
+
+def test_failed_stream_keeps_the_partial_reply():
+    store = MemoryTranscriptStore()
+    orch = ConversationOrchestrator(JsonQuestionFlow("data/questions.json"), store, chatbot=BrokenChatbot())
+    conv = Conversation(conversation_id="broken")
+    orch.start(conv)
+    with pytest.raises(ConnectionError):
+        list(orch.handle_user_message_stream(conv, "What does fasting mean?", mode=Mode.CHAT))
+    reply = _chat_messages(store, "broken")[-1]
+    assert reply.content == "Fasting means " and reply.meta["incomplete"]
+    assert store.get("broken")[-1].meta.get("reask")  # back to the current question
+
+
+class BrokenAsyncChatbot(IAsyncStreamingChatbot):
+    async def answer(self, user_text, transcript, context=None):
+        raise NotImplementedError
+
+    async def answer_stream(self, user_text, transcript, context=None):
+        yield "Fasting "
+        raise ConnectionError("stream dropped")
+
+
+def test_async_failed_stream_keeps_the_partial_reply():
+    store = MemoryTranscriptStore()
+    orch = AsyncConversationOrchestrator(JsonQuestionFlow("data/questions.json"), AsyncTranscriptStore(store),
+                                         chatbot=BrokenAsyncChatbot())
+    conv = Conversation(conversation_id="async")
+
+    async def run():
+        await orch.start(conv)
+        async for _ in orch.handle_user_message_stream(conv, "What does fasting mean?", mode=Mode.CHAT):
+            pass
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
+    reply = _chat_messages(store, "async")[-1]
+    assert reply.content == "Fasting " and reply.meta["incomplete"]